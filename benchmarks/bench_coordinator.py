@@ -0,0 +1,161 @@
+"""Coordinator refresh benchmark.
+
+Populates an in-memory store with a synthetic farm (up to 10k queued jobs plus
+history) and times ``PrintAssistCoordinator._async_update_data`` on a real
+Home Assistant core, in two situations:
+
+* ``cached``  - nothing changed since the last refresh (the 30 s poll)
+* ``changed`` - the store was saved, so the snapshot is rebuilt and the
+  schedule and forecast are recomputed
+
+Usage (from the repository root)::
+
+    python -m benchmarks.bench_coordinator
+    python -m benchmarks.bench_coordinator --jobs 1000 10000 50000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+import gc
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from benchmarks.simulate import SimulationStore  # noqa: E402
+from custom_components.printassist.const import (  # noqa: E402
+    JOB_STATUS_COMPLETED,
+    JOB_STATUS_FAILED,
+    JOB_STATUS_PRINTING,
+    JOB_STATUS_QUEUED,
+)
+from custom_components.printassist.coordinator import PrintAssistCoordinator  # noqa: E402
+from custom_components.printassist.store import (  # noqa: E402
+    Job,
+    Plate,
+    Project,
+    UnavailabilityWindow,
+)
+
+DEFAULT_JOBS = [1_000, 10_000]
+HISTORY_FRACTION = 0.5
+REPEATS = 5
+
+
+@dataclass
+class RefreshResult:
+    jobs: int
+    cached_ms: float
+    changed_ms: float
+
+
+def populate(store: SimulationStore, queued: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    created = now.isoformat()
+
+    projects = [
+        Project(id=f"proj-{i}", name=f"Project {i}", created_at=created)
+        for i in range(max(1, queued // 50))
+    ]
+    plates = [
+        Plate(
+            id=f"plate-{i}",
+            project_id=rng.choice(projects).id,
+            source_filename=f"file-{i}.3mf",
+            plate_number=1,
+            name=f"Plate {i}",
+            gcode_path=f"gcode-{i}",
+            estimated_duration_seconds=rng.randint(15 * 60, 8 * 3600),
+            priority=rng.choice([-10, 0, 0, 5, 10]),
+            quantity_needed=rng.randint(1, 5),
+        )
+        for i in range(max(1, queued // 5))
+    ]
+
+    jobs = [
+        Job(id=f"job-{i}", plate_id=rng.choice(plates).id, status=JOB_STATUS_QUEUED,
+            created_at=created)
+        for i in range(queued)
+    ]
+    for i in range(int(queued * HISTORY_FRACTION)):
+        status = JOB_STATUS_FAILED if rng.random() < 0.1 else JOB_STATUS_COMPLETED
+        jobs.append(Job(id=f"done-{i}", plate_id=rng.choice(plates).id, status=status,
+                        created_at=created, started_at=created, ended_at=created))
+    jobs.append(Job(id="active", plate_id=plates[0].id, status=JOB_STATUS_PRINTING,
+                    created_at=created, started_at=created))
+
+    windows = []
+    cursor = now
+    for i in range(50):
+        start = cursor + timedelta(hours=rng.uniform(4, 16))
+        cursor = start + timedelta(hours=rng.uniform(1, 9))
+        windows.append(UnavailabilityWindow(id=f"w-{i}", start=start.isoformat(),
+                                            end=cursor.isoformat()))
+
+    store._data.projects = [asdict(p) for p in projects]
+    store._data.plates = [asdict(p) for p in plates]
+    store._data.jobs = [asdict(j) for j in jobs]
+    store._data.unavailability_windows = [asdict(w) for w in windows]
+    store._revision += 1
+
+
+async def _best_of(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        gc.collect()
+        started = time.perf_counter()
+        await fn()
+        best = min(best, time.perf_counter() - started)
+    return round(best * 1000, 3)
+
+
+async def run_refresh(hass: HomeAssistant, queued: int, repeats: int = REPEATS) -> RefreshResult:
+    store = SimulationStore()
+    populate(store, queued)
+    coordinator = PrintAssistCoordinator(hass, store)
+    await coordinator._async_update_data()
+
+    async def changed() -> None:
+        await store._async_save()
+        await coordinator._async_update_data()
+
+    return RefreshResult(
+        jobs=queued,
+        cached_ms=await _best_of(coordinator._async_update_data, repeats),
+        changed_ms=await _best_of(changed, repeats),
+    )
+
+
+async def _async_main(job_counts: list[int], repeats: int) -> list[RefreshResult]:
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        try:
+            return [await run_refresh(hass, count, repeats) for count in job_counts]
+        finally:
+            await hass.async_stop(force=True)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, nargs="+", default=DEFAULT_JOBS)
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(_async_main(args.jobs, args.repeats))
+    print(f"{'queued jobs':>12}  {'cached ms':>10}  {'changed ms':>10}")
+    for r in results:
+        print(f"{r.jobs:>12}  {r.cached_ms:>10.1f}  {r.changed_ms:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
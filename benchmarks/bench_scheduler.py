@@ -0,0 +1,331 @@
+"""Scheduler benchmark suite with synthetic workloads.
+
+Generates deterministic queues from 10 to 50k jobs with 0 to 1k unavailability
+windows, mixed priorities and a blend of short and long plates, then reports
+wall time (best of several repeats) and peak traced memory of
+``PrintScheduler.calculate_schedule`` per scenario.
+
+Usage (from the repository root)::
+
+    python -m benchmarks.bench_scheduler                 # run and print
+    python -m benchmarks.bench_scheduler --check         # fail on regression
+    python -m benchmarks.bench_scheduler --update-baseline
+    python -m benchmarks.bench_scheduler --scenario medium large
+
+Raw timings are only comparable on the machine that recorded the baseline.
+Every run therefore also times a fixed reference workload that does not touch
+the scheduler, and ``--check`` scales the baseline wall times by how much
+faster or slower that reference ran here than when the baseline was recorded.
+What remains is a relative tolerance (``--tolerance``, default 1.5x) plus a
+small absolute slack; raise the tolerance on noisy machines, or re-record the
+baseline with ``--update-baseline`` after an intentional performance change.
+"""
+from __future__ import annotations
+
+import argparse
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.printassist.const import SCHEDULE_MODE_PRIORITY  # noqa: E402
+from custom_components.printassist.scheduler import PrintScheduler  # noqa: E402
+from custom_components.printassist.store import (  # noqa: E402
+    Job,
+    Plate,
+    Project,
+    UnavailabilityWindow,
+)
+
+BASELINE_PATH = Path(__file__).with_name("baseline_scheduler.json")
+BENCH_NOW = datetime(2024, 1, 15, 8, 0, tzinfo=timezone.utc)
+DEFAULT_TOLERANCE = 1.5
+ABSOLUTE_SLACK_MS = 5.0
+REFERENCE_REPEATS = 5
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    jobs: int
+    windows: int
+    long_fraction: float = 0.3
+    deadline_fraction: float = 0.0
+    window_gap_minutes: tuple[int, int] = (60, 960)
+    window_length_minutes: tuple[int, int] = (30, 600)
+    repeats: int = 5
+
+
+SCENARIOS = [
+    Scenario("tiny", jobs=10, windows=0),
+    Scenario("small", jobs=100, windows=10),
+    Scenario("medium", jobs=1_000, windows=100),
+    Scenario(
+        "medium_dense_windows", jobs=1_000, windows=1_000,
+        window_gap_minutes=(15, 120), window_length_minutes=(10, 60),
+    ),
+    Scenario("large", jobs=10_000, windows=100, repeats=3),
+    Scenario("large_deadlines", jobs=10_000, windows=100, deadline_fraction=0.5, repeats=3),
+    Scenario("xlarge_no_windows", jobs=50_000, windows=0, repeats=2),
+    Scenario("xlarge", jobs=50_000, windows=1_000, repeats=2),
+]
+
+
+@dataclass
+class Workload:
+    queued_jobs: list[Job]
+    plates_by_id: dict[str, Plate]
+    windows: list[UnavailabilityWindow]
+    projects_by_id: dict[str, Project]
+
+
+@dataclass
+class BenchResult:
+    scenario: str
+    mode: str
+    jobs: int
+    windows: int
+    scheduled: int
+    wall_ms: float
+    peak_kib: float
+
+
+def build_workload(scenario: Scenario, seed: int = 0) -> Workload:
+    rng = random.Random(f"{scenario.name}:{seed}")
+    created = BENCH_NOW.isoformat()
+
+    projects: dict[str, Project] = {}
+    for index in range(max(1, scenario.jobs // 50)):
+        due = None
+        if rng.random() < scenario.deadline_fraction:
+            due = (BENCH_NOW + timedelta(hours=rng.uniform(2, 24 * 14))).isoformat()
+        projects[f"proj-{index}"] = Project(
+            id=f"proj-{index}", name=f"Project {index}", created_at=created, due_date=due
+        )
+    project_ids = list(projects)
+
+    plates: dict[str, Plate] = {}
+    for index in range(max(1, scenario.jobs // 5)):
+        if rng.random() < scenario.long_fraction:
+            seconds = rng.randint(4 * 3600, 20 * 3600)
+        else:
+            seconds = rng.randint(15 * 60, 90 * 60)
+        plates[f"plate-{index}"] = Plate(
+            id=f"plate-{index}",
+            project_id=rng.choice(project_ids),
+            source_filename=f"file-{index}.3mf",
+            plate_number=1,
+            name=f"Plate {index}",
+            gcode_path=f"gcode-{index}",
+            estimated_duration_seconds=seconds,
+            priority=rng.choice([-10, 0, 0, 0, 5, 10]),
+        )
+    plate_ids = list(plates)
+
+    jobs = [
+        Job(id=f"job-{index}", plate_id=rng.choice(plate_ids), status="queued", created_at=created)
+        for index in range(scenario.jobs)
+    ]
+
+    windows = []
+    cursor = BENCH_NOW
+    for index in range(scenario.windows):
+        start = cursor + timedelta(minutes=rng.uniform(*scenario.window_gap_minutes))
+        cursor = start + timedelta(minutes=rng.uniform(*scenario.window_length_minutes))
+        windows.append(UnavailabilityWindow(
+            id=f"w-{index}", start=start.isoformat(), end=cursor.isoformat()
+        ))
+
+    return Workload(jobs, plates, windows, projects)
+
+
+def _make_scheduler(workload: Workload, mode: str) -> PrintScheduler:
+    return PrintScheduler(
+        queued_jobs=workload.queued_jobs,
+        plates_by_id=workload.plates_by_id,
+        unavailability_windows=workload.windows,
+        current_time=BENCH_NOW,
+        projects_by_id=workload.projects_by_id,
+        mode=mode,
+    )
+
+
+def run_scenario(scenario: Scenario, mode: str = SCHEDULE_MODE_PRIORITY) -> BenchResult:
+    workload = build_workload(scenario)
+
+    best = float("inf")
+    scheduled = 0
+    for _ in range(scenario.repeats):
+        gc.collect()
+        started = time.perf_counter()
+        result = _make_scheduler(workload, mode).calculate_schedule()
+        best = min(best, time.perf_counter() - started)
+        scheduled = len(result.jobs)
+
+    # Memory is traced in a separate run so tracing overhead never skews timing.
+    gc.collect()
+    tracemalloc.start()
+    _make_scheduler(workload, mode).calculate_schedule()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return BenchResult(
+        scenario=scenario.name,
+        mode=mode,
+        jobs=scenario.jobs,
+        windows=scenario.windows,
+        scheduled=scheduled,
+        wall_ms=round(best * 1000, 3),
+        peak_kib=round(peak / 1024, 1),
+    )
+
+
+def _reference_workload() -> None:
+    """Scheduler-independent mix of datetime math, sorting and dict lookups."""
+    rng = random.Random("reference")
+    starts = [BENCH_NOW + timedelta(minutes=rng.randint(0, 100_000)) for _ in range(20_000)]
+    by_key = {f"k-{index}": start for index, start in enumerate(starts)}
+    ordered = sorted(by_key.items(), key=lambda item: (item[1], item[0]))
+    cursor = BENCH_NOW
+    for key, _ in ordered:
+        cursor = max(cursor, by_key[key]) + timedelta(seconds=len(key))
+
+
+def measure_reference(repeats: int = REFERENCE_REPEATS) -> float:
+    """Best-of wall time of the reference workload in milliseconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        gc.collect()
+        started = time.perf_counter()
+        _reference_workload()
+        best = min(best, time.perf_counter() - started)
+    return round(best * 1000, 3)
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> tuple[dict[str, dict], float | None]:
+    """Baseline results keyed by ``scenario:mode`` and the reference time."""
+    if not path.exists():
+        return {}, None
+    data = json.loads(path.read_text())
+    results = {f"{r['scenario']}:{r['mode']}": r for r in data["results"]}
+    return results, data.get("reference_ms")
+
+
+def machine_factor(reference_ms: float | None, baseline_reference_ms: float | None) -> float:
+    """How much slower this run's machine is than the baseline's (1.0 if unknown)."""
+    if not reference_ms or not baseline_reference_ms:
+        return 1.0
+    return reference_ms / baseline_reference_ms
+
+
+def find_regressions(
+    results: list[BenchResult],
+    baseline: dict[str, dict],
+    tolerance: float,
+    factor: float = 1.0,
+) -> list[str]:
+    regressions = []
+    for result in results:
+        base = baseline.get(f"{result.scenario}:{result.mode}")
+        if not base:
+            continue
+        expected_ms = base["wall_ms"] * factor
+        time_limit = expected_ms * tolerance + ABSOLUTE_SLACK_MS
+        if result.wall_ms > time_limit:
+            regressions.append(
+                f"{result.scenario}/{result.mode}: {result.wall_ms:.1f} ms "
+                f"> {time_limit:.1f} ms (baseline {base['wall_ms']:.1f} ms, "
+                f"machine factor {factor:.2f})"
+            )
+        memory_limit = base["peak_kib"] * tolerance + 64
+        if result.peak_kib > memory_limit:
+            regressions.append(
+                f"{result.scenario}/{result.mode}: {result.peak_kib:.0f} KiB "
+                f"> {memory_limit:.0f} KiB (baseline {base['peak_kib']:.0f} KiB)"
+            )
+        if result.scheduled != base["scheduled"]:
+            regressions.append(
+                f"{result.scenario}/{result.mode}: scheduled {result.scheduled} jobs, "
+                f"baseline scheduled {base['scheduled']}"
+            )
+    return regressions
+
+
+def _format_table(
+    results: list[BenchResult], baseline: dict[str, dict], factor: float = 1.0
+) -> str:
+    rows = [["scenario", "mode", "jobs", "windows", "scheduled", "wall ms", "peak KiB", "vs base"]]
+    for r in results:
+        base = baseline.get(f"{r.scenario}:{r.mode}")
+        ratio = (
+            f"{r.wall_ms / (base['wall_ms'] * factor):.2f}x" if base and base["wall_ms"] else "-"
+        )
+        rows.append([
+            r.scenario, r.mode, str(r.jobs), str(r.windows), str(r.scheduled),
+            f"{r.wall_ms:.1f}", f"{r.peak_kib:.0f}", ratio,
+        ])
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return "\n".join(
+        "  ".join(cell.rjust(width) for cell, width in zip(row, widths)) for row in rows
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", nargs="+", help="only run these scenarios")
+    parser.add_argument("--mode", nargs="+", default=[SCHEDULE_MODE_PRIORITY])
+    parser.add_argument("--check", action="store_true", help="exit non-zero on regression")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument(
+        "--tolerance", type=float, default=DEFAULT_TOLERANCE,
+        help="allowed slowdown over the machine-adjusted baseline",
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    args = parser.parse_args(argv)
+
+    scenarios = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+    # Timing the reference on both sides of the scenarios keeps warm-up and
+    # frequency scaling early in the run from skewing the machine factor.
+    reference_ms = measure_reference()
+    results = [run_scenario(s, mode) for s in scenarios for mode in args.mode]
+    reference_ms = min(reference_ms, measure_reference())
+    baseline, baseline_reference_ms = load_baseline(args.baseline)
+    factor = machine_factor(reference_ms, baseline_reference_ms)
+    print(f"reference workload: {reference_ms:.1f} ms (machine factor {factor:.2f})")
+    print(_format_table(results, baseline, factor))
+
+    if args.update_baseline:
+        # Older entries were timed against the previous reference, so rescale
+        # them to keep every entry relative to the reference stored alongside.
+        rescaled = {
+            key: {**entry, "wall_ms": round(entry["wall_ms"] * factor, 3)}
+            for key, entry in baseline.items()
+        }
+        merged = {**rescaled, **{f"{r.scenario}:{r.mode}": asdict(r) for r in results}}
+        args.baseline.write_text(json.dumps(
+            {
+                "python": sys.version.split()[0],
+                "reference_ms": reference_ms,
+                "results": list(merged.values()),
+            },
+            indent=2,
+        ) + "\n")
+        print(f"Baseline written to {args.baseline}")
+
+    if args.check:
+        regressions = find_regressions(results, baseline, args.tolerance, factor)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
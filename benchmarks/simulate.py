@@ -0,0 +1,422 @@
+"""Discrete-event print farm simulator for evaluating scheduling policies.
+
+Drives ``PrintScheduler`` and an in-memory ``PrintAssistStore`` with a
+synthetic clock: projects arrive at random, prints take longer or shorter
+than estimated and sometimes fail, and the operator is away at night, during
+work hours and on random days off. Jobs can only be started or cleared from
+the bed while the operator is available.
+
+Usage (from the repository root)::
+
+    python -m benchmarks.simulate --days 28 --seed 1
+    python -m benchmarks.simulate --policies priority knapsack portfolio --json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+import heapq
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.printassist.const import (  # noqa: E402
+    JOB_STATUS_QUEUED,
+    SCHEDULE_HEURISTICS,
+    SCHEDULE_MODE_PORTFOLIO,
+)
+from custom_components.printassist.portfolio import (  # noqa: E402
+    ScheduleInputs,
+    evaluate_heuristic,
+)
+from custom_components.printassist.scheduler import PrintScheduler  # noqa: E402
+from custom_components.printassist.store import (  # noqa: E402
+    Plate,
+    PrintAssistStore,
+)
+from custom_components.printassist.timing import StageTimings  # noqa: E402
+
+SIM_START = datetime(2024, 1, 1, 7, 0, tzinfo=timezone.utc)
+
+EVENT_ARRIVAL = "arrival"
+EVENT_FINISH = "finish"
+EVENT_DECIDE = "decide"
+
+
+class NullStore:
+    """Stand-in for Home Assistant's ``Store`` that never touches disk."""
+
+    async def async_load(self) -> None:
+        return None
+
+    async def async_save(self, data: dict) -> None:
+        return None
+
+
+class SimulationStore(PrintAssistStore):
+    """PrintAssistStore that keeps everything in memory and never persists."""
+
+    def __init__(self) -> None:
+        super().__init__(None, StageTimings(), backend=NullStore())
+
+
+@dataclass
+class WorkloadConfig:
+    days: int = 28
+    projects_per_day: float = 1.5
+    plates_per_project: tuple[int, int] = (1, 6)
+    quantity: tuple[int, int] = (1, 3)
+    mean_duration_hours: float = 3.0
+    duration_sigma: float = 0.8
+    duration_noise: float = 0.1
+    failure_rate: float = 0.08
+    deadline_fraction: float = 0.4
+    deadline_days: tuple[float, float] = (1.0, 7.0)
+    sleep_hours: tuple[int, int] = (23, 7)
+    work_hours: tuple[int, int] = (9, 17)
+    day_off_probability: float = 0.1
+
+
+@dataclass
+class PolicyReport:
+    policy: str
+    completed_jobs: int = 0
+    failed_attempts: int = 0
+    queued_at_end: int = 0
+    throughput_per_day: float = 0.0
+    printing_hours: float = 0.0
+    idle_hours_with_work: float = 0.0
+    idle_hours_available: float = 0.0
+    latency_to_start_p50_hours: float = 0.0
+    latency_to_start_p90_hours: float = 0.0
+    late_projects: int = 0
+    projects_with_deadline: int = 0
+    mean_lateness_hours: float = 0.0
+    scheduler_calls: int = 0
+    scheduler_seconds: float = 0.0
+    _latencies: list[float] = field(default_factory=list, repr=False)
+
+
+def build_windows(config: WorkloadConfig, rng: random.Random) -> list[tuple[datetime, datetime]]:
+    """Nightly sleep, weekday work hours and random full days off."""
+    windows = []
+    day0 = SIM_START.replace(hour=0)
+    for day in range(config.days + 8):
+        base = day0 + timedelta(days=day)
+        sleep_start, sleep_end = config.sleep_hours
+        windows.append((
+            base + timedelta(hours=sleep_start),
+            base + timedelta(days=1, hours=sleep_end),
+        ))
+        if rng.random() < config.day_off_probability:
+            windows.append((base + timedelta(hours=sleep_end), base + timedelta(hours=sleep_start)))
+        elif base.weekday() < 5:
+            work_start, work_end = config.work_hours
+            windows.append((base + timedelta(hours=work_start), base + timedelta(hours=work_end)))
+    return sorted(windows)
+
+
+def build_arrivals(config: WorkloadConfig, rng: random.Random) -> list[dict]:
+    """Poisson project arrivals, each with a few plates and optional deadline."""
+    arrivals = []
+    t = SIM_START
+    end = SIM_START + timedelta(days=config.days)
+    while True:
+        t += timedelta(days=rng.expovariate(config.projects_per_day))
+        if t >= end:
+            break
+        plates = []
+        for number in range(1, rng.randint(*config.plates_per_project) + 1):
+            hours = rng.lognormvariate(0, config.duration_sigma) * config.mean_duration_hours
+            plates.append({
+                "number": number,
+                "seconds": int(min(max(hours, 0.25), 20.0) * 3600),
+                "quantity": rng.randint(*config.quantity),
+                "priority": rng.choice([0, 0, 0, 5, 10]),
+            })
+        due = None
+        if rng.random() < config.deadline_fraction:
+            due = t + timedelta(days=rng.uniform(*config.deadline_days))
+        arrivals.append({"at": t, "plates": plates, "due": due})
+    return arrivals
+
+
+class FarmSimulation:
+    def __init__(
+        self,
+        policy: str,
+        config: WorkloadConfig,
+        windows: list[tuple[datetime, datetime]],
+        arrivals: list[dict],
+        seed: int,
+    ) -> None:
+        self._policy = policy
+        self._config = config
+        self._windows = windows
+        self._arrivals = arrivals
+        self._rng = random.Random(seed)
+        self._store = SimulationStore()
+        self._events: list[tuple[datetime, int, str, dict]] = []
+        self._sequence = 0
+        self._now = SIM_START
+        self._end = SIM_START + timedelta(days=config.days)
+        self._active: str | None = None
+        self._busy_until: datetime | None = None
+        self._queued_since: dict[str, datetime] = {}
+        self._project_due: dict[str, datetime] = {}
+        self._project_done: dict[str, datetime] = {}
+        self._idle_since: datetime | None = None
+        self.report = PolicyReport(policy=policy)
+
+    def _push(self, at: datetime, kind: str, payload: dict | None = None) -> None:
+        self._sequence += 1
+        heapq.heappush(self._events, (at, self._sequence, kind, payload or {}))
+
+    def _operator_available_at(self, t: datetime) -> datetime:
+        for start, end in self._windows:
+            if start <= t < end:
+                return self._operator_available_at(end)
+            if start > t:
+                break
+        return t
+
+    def _record_idle(self, start: datetime, end: datetime) -> None:
+        """Add an idle stretch, splitting out the part the operator could have used."""
+        away = timedelta()
+        for window_start, window_end in self._windows:
+            if window_start >= end:
+                break
+            overlap = min(end, window_end) - max(start, window_start)
+            if overlap > timedelta():
+                away += overlap
+        self.report.idle_hours_with_work += (end - start).total_seconds() / 3600
+        self.report.idle_hours_available += max(end - start - away, timedelta()).total_seconds() / 3600
+
+    def _track_new_queued(self) -> None:
+        for job in self._store.get_queued_jobs():
+            self._queued_since.setdefault(job.id, self._now)
+
+    def _next_job_id(self) -> tuple[str | None, datetime | None]:
+        queued = self._store.get_queued_jobs()
+        if not queued:
+            return None, None
+        plates = {p.id: p for p in self._store.get_plates()}
+        projects = {p.id: p for p in self._store.get_projects()}
+        windows = self._store.get_unavailability_windows()
+
+        started = time.perf_counter()
+        if self._policy == SCHEDULE_MODE_PORTFOLIO:
+            inputs = ScheduleInputs(queued, plates, windows, self._now, None, projects)
+            outcomes = [evaluate_heuristic(inputs, mode) for mode in SCHEDULE_HEURISTICS]
+            result = min(outcomes, key=lambda o: o[0])[1]
+        else:
+            result = PrintScheduler(
+                queued, plates, windows, current_time=self._now,
+                projects_by_id=projects, mode=self._policy,
+            ).calculate_schedule()
+        self.report.scheduler_calls += 1
+        self.report.scheduler_seconds += time.perf_counter() - started
+
+        if not result.jobs:
+            return None, None
+        first = result.jobs[0]
+        return first.job_id, first.scheduled_start
+
+    async def _async_decide(self) -> None:
+        if self._active:
+            return
+        job_id, start_at = self._next_job_id()
+        if job_id is None:
+            return
+        if start_at > self._now:
+            self._push(start_at, EVENT_DECIDE)
+            return
+
+        await self._store.async_start_job(job_id)
+        self._active = job_id
+        if self._idle_since is not None:
+            self._record_idle(self._idle_since, self._now)
+            self._idle_since = None
+        self.report._latencies.append(
+            (self._now - self._queued_since.pop(job_id)).total_seconds() / 3600
+        )
+
+        job = self._store.get_job(job_id)
+        plate = self._store.get_plate(job.plate_id)
+        actual = plate.estimated_duration_seconds * self._rng.lognormvariate(0, self._config.duration_noise)
+        failed = self._rng.random() < self._config.failure_rate
+        if failed:
+            actual *= self._rng.random()
+        self.report.printing_hours += actual / 3600
+        self._busy_until = self._now + timedelta(seconds=actual)
+        self._push(self._busy_until, EVENT_FINISH, {"job_id": job_id, "failed": failed})
+
+    async def _async_finish(self, job_id: str, failed: bool) -> None:
+        cleared_at = self._operator_available_at(self._now)
+        if cleared_at > self._now:
+            self._push(cleared_at, EVENT_FINISH, {"job_id": job_id, "failed": failed})
+            return
+
+        if failed:
+            await self._store.async_fail_job(job_id, "simulated failure")
+            self.report.failed_attempts += 1
+            self._track_new_queued()
+        else:
+            await self._store.async_complete_job(job_id)
+            self.report.completed_jobs += 1
+            project_id = self._store.get_plate(self._store.get_job(job_id).plate_id).project_id
+            completed, total = self._store.get_project_progress(project_id)
+            if completed >= total:
+                self._project_done[project_id] = self._now
+
+        self._active = None
+        self._busy_until = None
+        if self._store.get_queued_jobs():
+            self._idle_since = self._now
+
+    async def _async_arrival(self, arrival: dict) -> None:
+        project = await self._store.async_create_project(
+            f"Project {len(self._project_due) + len(self._project_done)}",
+            due_date=arrival["due"],
+        )
+        if arrival["due"]:
+            self._project_due[project.id] = arrival["due"]
+        plates = []
+        for spec in arrival["plates"]:
+            plate = Plate.create(
+                project_id=project.id,
+                source_filename=f"{project.id}.3mf",
+                plate_number=spec["number"],
+                name=f"Plate {spec['number']}",
+                gcode_path=f"{project.id}_{spec['number']}",
+                estimated_duration_seconds=spec["seconds"],
+            )
+            plate.quantity_needed = spec["quantity"]
+            plate.priority = spec["priority"]
+            plates.append(plate)
+        await self._store.async_add_plates(plates)
+        self._track_new_queued()
+        if not self._active and self._idle_since is None:
+            self._idle_since = self._now
+
+    async def async_run(self) -> PolicyReport:
+        for start, end in self._windows:
+            await self._store.async_add_unavailability(start, end)
+        for arrival in self._arrivals:
+            self._push(arrival["at"], EVENT_ARRIVAL, {"arrival": arrival})
+
+        while self._events:
+            at, _, kind, payload = heapq.heappop(self._events)
+            if at > self._end:
+                break
+            self._now = at
+            if kind == EVENT_ARRIVAL:
+                await self._async_arrival(payload["arrival"])
+            elif kind == EVENT_FINISH:
+                await self._async_finish(payload["job_id"], payload["failed"])
+            await self._async_decide()
+
+        self._finalize()
+        return self.report
+
+    def _finalize(self) -> None:
+        self._now = self._end
+        report = self.report
+        if self._idle_since is not None:
+            self._record_idle(self._idle_since, self._end)
+        report.queued_at_end = len(self._store.get_jobs(status=JOB_STATUS_QUEUED))
+        report.throughput_per_day = report.completed_jobs / self._config.days
+
+        latencies = sorted(report._latencies)
+        if latencies:
+            report.latency_to_start_p50_hours = statistics.median(latencies)
+            report.latency_to_start_p90_hours = latencies[int(0.9 * (len(latencies) - 1))]
+
+        lateness = []
+        for project_id, due in self._project_due.items():
+            if project_id not in self._project_done and due > self._end:
+                continue
+            done = self._project_done.get(project_id, self._end)
+            lateness.append(max(0.0, (done - due).total_seconds() / 3600))
+        report.projects_with_deadline = len(lateness)
+        report.late_projects = sum(1 for value in lateness if value > 0)
+        report.mean_lateness_hours = statistics.mean(lateness) if lateness else 0.0
+
+
+def run(policies: list[str], config: WorkloadConfig, seed: int) -> list[PolicyReport]:
+    """Run every policy against the same arrivals, windows and random stream."""
+    rng = random.Random(seed)
+    windows = build_windows(config, rng)
+    arrivals = build_arrivals(config, rng)
+    return [
+        asyncio.run(FarmSimulation(policy, config, windows, arrivals, seed).async_run())
+        for policy in policies
+    ]
+
+
+def _format_table(reports: list[PolicyReport]) -> str:
+    columns = [
+        ("policy", "policy", "{}"),
+        ("done", "completed_jobs", "{}"),
+        ("failed", "failed_attempts", "{}"),
+        ("left", "queued_at_end", "{}"),
+        ("jobs/day", "throughput_per_day", "{:.2f}"),
+        ("idle h", "idle_hours_with_work", "{:.1f}"),
+        ("idle avail h", "idle_hours_available", "{:.1f}"),
+        ("start p50 h", "latency_to_start_p50_hours", "{:.1f}"),
+        ("start p90 h", "latency_to_start_p90_hours", "{:.1f}"),
+        ("late", "late_projects", "{}"),
+        ("lateness h", "mean_lateness_hours", "{:.1f}"),
+        ("sched ms", "scheduler_seconds", "{:.0f}"),
+    ]
+    rows = [[title for title, _, _ in columns]]
+    for report in reports:
+        row = []
+        for _, attr, fmt in columns:
+            value = getattr(report, attr)
+            if attr == "scheduler_seconds":
+                value *= 1000
+            row.append(fmt.format(value))
+        rows.append(row)
+    widths = [max(len(row[i]) for row in rows) for i in range(len(columns))]
+    return "\n".join(
+        "  ".join(cell.rjust(width) for cell, width in zip(row, widths)) for row in rows
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=28)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--projects-per-day", type=float, default=1.5)
+    parser.add_argument("--failure-rate", type=float, default=0.08)
+    parser.add_argument(
+        "--policies", nargs="+", default=[*SCHEDULE_HEURISTICS, SCHEDULE_MODE_PORTFOLIO],
+    )
+    parser.add_argument("--json", action="store_true", help="print reports as JSON")
+    args = parser.parse_args(argv)
+
+    config = WorkloadConfig(
+        days=args.days,
+        projects_per_day=args.projects_per_day,
+        failure_rate=args.failure_rate,
+    )
+    reports = run(args.policies, config, args.seed)
+    if args.json:
+        print(json.dumps([
+            {k: v for k, v in asdict(r).items() if not k.startswith("_")} for r in reports
+        ], indent=2))
+    else:
+        print(_format_table(reports))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,56 @@
 """PrintAssist - Home Assistant 3D Print Project Manager."""
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections.abc import AsyncIterator
 from dataclasses import asdict
+from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import voluptuous as vol
-from aiohttp import web
+from aiohttp import BodyPartReader, web
 from homeassistant.components import websocket_api
+from homeassistant.components.websocket_api.messages import construct_result_message
 from homeassistant.components.http import HomeAssistantView, StaticPathConfig
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_connect, async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.components.frontend import async_register_built_in_panel, async_remove_panel
 
-from .const import DOMAIN, CONF_BAMBU_DEVICE_ID
+from .const import (
+    DOMAIN,
+    BULK_PARSE_CONCURRENCY,
+    CONF_BAMBU_DEVICE_ID,
+    CONF_REFRESH_DEBOUNCE,
+    CONF_SCHEDULE_MODE,
+    DEFAULT_QUERY_LIMIT,
+    DEFAULT_REFRESH_DEBOUNCE,
+    GC_INTERVAL,
+    JOB_STATUSES,
+    MAX_QUERY_LIMIT,
+    QUERY_COLLECTIONS,
+    SCHEDULE_MODE_PRIORITY,
+    SIGNAL_UNLOAD,
+    UPLOAD_CHUNK_SIZE,
+)
 from .coordinator import PrintAssistCoordinator
-from .file_handler import FileHandler
+from .file_handler import FileHandler, StagedFile, UploadTooLarge
 from .printer_monitor import BambuPrinterMonitor
-from .services import async_setup_services, async_unload_services
-from .store import PrintAssistStore
+from .query import InvalidCursor, QueryError, query_payload
+from .services import async_collect_garbage, async_setup_services, async_unload_services
+from .store import Plate, PrintAssistStore
+from .timing import StageTimings
+from .uploads import (
+    OffsetMismatch,
+    UnknownSession,
+    UploadSessionError,
+    UploadSessionManager,
+)
 
 if TYPE_CHECKING:
     pass
@@ -30,46 +60,144 @@ _LOGGER = logging.getLogger(__name__)
 PLATFORMS = [Platform.SENSOR, Platform.BUTTON, Platform.IMAGE]
 
 
-@websocket_api.websocket_command({vol.Required("type"): "printassist/get_data"})
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "printassist/get_data",
+        vol.Optional("since_revision"): vol.Coerce(int),
+        vol.Optional("since_epoch"): cv.string,
+    }
+)
 @callback
 def ws_get_data(
     hass: HomeAssistant,
     connection: websocket_api.ActiveConnection,
     msg: dict,
 ) -> None:
-    store: PrintAssistStore = hass.data[DOMAIN]["store"]
+    """Full payload, or only what changed since the client's ``since_revision``.
+
+    A revision from another epoch, such as one held across a restart, always
+    gets the full payload.
+    """
+    coordinator: PrintAssistCoordinator = hass.data[DOMAIN]["coordinator"]
+    payload = coordinator.get_payload()
+    since = msg.get("since_revision")
+    if since is None or msg.get("since_epoch") != payload.epoch:
+        result = payload.json
+    elif since == payload.revision:
+        result = b'{"revision":%d,"unchanged":true}' % payload.revision
+    elif (delta := coordinator.get_delta_json(since, payload.epoch)) is not None:
+        result = b'{"revision":%d,"delta":%b}' % (payload.revision, delta)
+    else:
+        result = payload.json
+    connection.send_message(construct_result_message(msg["id"], result))
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "printassist/query",
+        vol.Required("collection"): vol.In(QUERY_COLLECTIONS),
+        vol.Optional("project_id"): cv.string,
+        vol.Optional("status"): vol.All(cv.ensure_list, [vol.In(JOB_STATUSES)]),
+        vol.Optional("start"): cv.datetime,
+        vol.Optional("end"): cv.datetime,
+        vol.Optional("cursor"): cv.string,
+        vol.Optional("limit", default=DEFAULT_QUERY_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_QUERY_LIMIT)
+        ),
+    }
+)
+@callback
+def ws_query(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict,
+) -> None:
+    """One page of projects, plates, jobs or schedule entries."""
+    coordinator: PrintAssistCoordinator = hass.data[DOMAIN]["coordinator"]
+    payload = coordinator.get_payload()
+    try:
+        page = query_payload(
+            payload.data,
+            msg["collection"],
+            project_id=msg.get("project_id"),
+            statuses=msg.get("status"),
+            start=msg.get("start"),
+            end=msg.get("end"),
+            cursor=msg.get("cursor"),
+            limit=msg["limit"],
+        )
+    except InvalidCursor as err:
+        connection.send_error(msg["id"], "invalid_cursor", str(err))
+        return
+    except QueryError as err:
+        connection.send_error(msg["id"], websocket_api.ERR_INVALID_FORMAT, str(err))
+        return
+    connection.send_result(msg["id"], {"revision": payload.revision, **page.to_dict()})
+
+
+def _event_message(iden: int, event: bytes) -> bytes:
+    return b'{"id":' + str(iden).encode() + b',"type":"event","event":' + event + b"}"
+
+
+def _snapshot_event(iden: int, payload_json: bytes) -> bytes:
+    return _event_message(iden, b'{"type":"snapshot","data":' + payload_json + b"}")
+
+
+@websocket_api.websocket_command({vol.Required("type"): "printassist/subscribe"})
+@callback
+def ws_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict,
+) -> None:
+    """Send the full payload once, then a delta event per new revision.
+
+    The listener is bound to one coordinator, so when the entry unloads (or
+    reloads after an options change) an ``end`` event tells the client to
+    subscribe again.
+    """
+    if DOMAIN not in hass.data:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "PrintAssist is not loaded")
+        return
     coordinator: PrintAssistCoordinator = hass.data[DOMAIN]["coordinator"]
+    iden = msg["id"]
+    payload = coordinator.get_payload()
+    sent_revision = payload.revision
+
+    @callback
+    def _async_push() -> None:
+        nonlocal sent_revision
+        payload = coordinator.get_payload()
+        if payload.revision == sent_revision:
+            return
+        delta = coordinator.get_delta_json(sent_revision, payload.epoch)
+        if delta is None:
+            connection.send_message(_snapshot_event(iden, payload.json))
+        else:
+            connection.send_message(
+                _event_message(iden, b'{"type":"delta","delta":' + delta + b"}")
+            )
+        sent_revision = payload.revision
+
+    unsub_listener = coordinator.async_add_listener(_async_push)
 
-    projects = []
-    for project in store.get_projects():
-        completed, total = store.get_project_progress(project.id)
-        projects.append({
-            **asdict(project),
-            "completed": completed,
-            "total": total,
-        })
-
-    plates = [asdict(p) for p in store.get_plates()]
-    jobs = [asdict(j) for j in store.get_jobs()]
-
-    schedule = []
-    computed_at = None
-    next_breakpoint = None
-    if coordinator.data:
-        schedule = coordinator.data.get("schedule", [])
-        computed_at = coordinator.data.get("computed_at")
-        next_breakpoint = coordinator.data.get("next_breakpoint")
-
-    connection.send_result(msg["id"], {
-        "projects": projects,
-        "plates": plates,
-        "jobs": jobs,
-        "schedule": schedule,
-        "computed_at": computed_at,
-        "next_breakpoint": next_breakpoint,
-        "unavailability_windows": [asdict(w) for w in store.get_unavailability_windows()],
-        "unknown_print": coordinator.get_unknown_print_info(),
-    })
+    @callback
+    def _async_end() -> None:
+        if connection.subscriptions.pop(iden, None) is None:
+            return
+        _async_unsubscribe()
+        connection.send_message(_event_message(iden, b'{"type":"end"}'))
+
+    unsub_unload = async_dispatcher_connect(hass, SIGNAL_UNLOAD, _async_end)
+
+    @callback
+    def _async_unsubscribe() -> None:
+        unsub_listener()
+        unsub_unload()
+
+    connection.subscriptions[iden] = _async_unsubscribe
+    connection.send_result(iden)
+    connection.send_message(_snapshot_event(iden, payload.json))
 
 
 class PrintAssistUploadView(HomeAssistantView):
@@ -87,83 +215,364 @@ class PrintAssistUploadView(HomeAssistantView):
         file_handler: FileHandler = hass.data[DOMAIN]["file_handler"]
         coordinator: PrintAssistCoordinator = hass.data[DOMAIN]["coordinator"]
 
+        staged: StagedFile | None = None
         try:
             reader = await request.multipart()
 
             project_id = None
-            filename = None
-            file_content = None
 
             async for field in reader:
                 if field.name == "project_id":
                     project_id = (await field.read()).decode()
-                elif field.name == "file":
-                    filename = field.filename
-                    file_content = await field.read()
+                elif field.name == "file" and field.filename and staged is None:
+                    staged = await file_handler.async_stage_upload(
+                        field.filename, _iter_chunks(field)
+                    )
 
-            if not all([project_id, filename, file_content]):
+            if not project_id or staged is None or not staged.size:
                 return web.json_response({"error": "Missing required fields"}, status=400)
 
             project = store.get_project(project_id)
             if not project:
                 return web.json_response({"error": "Project not found"}, status=404)
 
-            plates = await file_handler.process_file(file_content, project_id, filename)
+            _LOGGER.debug(
+                "Received %s (%d bytes, sha256 %s)", staged.filename, staged.size, staged.sha256
+            )
+            plates = await file_handler.process_file(
+                staged.path, project_id, staged.filename, staged.sha256
+            )
             if not plates:
                 return web.json_response({"error": "No plates found in file"}, status=400)
 
             await store.async_add_plates(plates)
-            coordinator.invalidate_schedule()
-            await coordinator.async_request_refresh()
+            await coordinator.async_request_schedule_refresh(wait=True)
 
             return web.json_response({
                 "success": True,
+                "sha256": staged.sha256,
                 "plates": [asdict(p) for p in plates],
             })
 
+        except UploadTooLarge as e:
+            return web.json_response({"error": str(e)}, status=413)
+        except Exception as e:
+            _LOGGER.exception("Upload failed")
+            return web.json_response({"error": str(e)}, status=500)
+        finally:
+            if staged is not None:
+                await file_handler.async_discard_staged(staged)
+
+
+class PrintAssistBulkUploadView(HomeAssistantView):
+    """Import many files into one project with a single save and refresh."""
+
+    url = "/api/printassist/upload/bulk"
+    name = "api:printassist:upload:bulk"
+    requires_auth = True
+
+    async def post(self, request: web.Request) -> web.Response:
+        hass = request.app["hass"]
+
+        if DOMAIN not in hass.data:
+            return web.json_response({"error": "PrintAssist not loaded"}, status=500)
+
+        store: PrintAssistStore = hass.data[DOMAIN]["store"]
+        file_handler: FileHandler = hass.data[DOMAIN]["file_handler"]
+        coordinator: PrintAssistCoordinator = hass.data[DOMAIN]["coordinator"]
+
+        staged_files: list[StagedFile] = []
+        try:
+            reader = await request.multipart()
+
+            project_id = None
+
+            async for field in reader:
+                if field.name == "project_id":
+                    project_id = (await field.read()).decode()
+                elif field.name == "file" and field.filename:
+                    staged_files.append(await file_handler.async_stage_upload(
+                        field.filename, _iter_chunks(field)
+                    ))
+
+            if not project_id or not staged_files:
+                return web.json_response({"error": "Missing required fields"}, status=400)
+
+            if not store.get_project(project_id):
+                return web.json_response({"error": "Project not found"}, status=404)
+
+            semaphore = asyncio.Semaphore(BULK_PARSE_CONCURRENCY)
+
+            async def _parse(staged: StagedFile) -> tuple[list[Plate], str | None]:
+                async with semaphore:
+                    try:
+                        plates = await file_handler.process_file(
+                            staged.path, project_id, staged.filename, staged.sha256
+                        )
+                    except Exception as err:
+                        _LOGGER.exception("Failed to process %s", staged.filename)
+                        return [], str(err)
+                return plates, None if plates else "No plates found in file"
+
+            outcomes = await asyncio.gather(*(_parse(staged) for staged in staged_files))
+
+            added = [plate for plates, _ in outcomes for plate in plates]
+            if added:
+                await store.async_add_plates(added)
+                await coordinator.async_request_schedule_refresh(wait=True)
+
+            return web.json_response({
+                "success": bool(added),
+                "files": [
+                    {
+                        "filename": staged.filename,
+                        "sha256": staged.sha256,
+                        "error": error,
+                        "plates": [asdict(p) for p in plates],
+                    }
+                    for staged, (plates, error) in zip(staged_files, outcomes)
+                ],
+            })
+
+        except UploadTooLarge as e:
+            return web.json_response({"error": str(e)}, status=413)
+        except Exception as e:
+            _LOGGER.exception("Bulk upload failed")
+            return web.json_response({"error": str(e)}, status=500)
+        finally:
+            for staged in staged_files:
+                await file_handler.async_discard_staged(staged)
+
+
+class PrintAssistUploadSessionsView(HomeAssistantView):
+    """Open a resumable upload session."""
+
+    url = "/api/printassist/upload_sessions"
+    name = "api:printassist:upload_sessions"
+    requires_auth = True
+
+    async def post(self, request: web.Request) -> web.Response:
+        hass = request.app["hass"]
+        if DOMAIN not in hass.data:
+            return web.json_response({"error": "PrintAssist not loaded"}, status=500)
+        sessions: UploadSessionManager = hass.data[DOMAIN]["upload_sessions"]
+
+        try:
+            body = await request.json()
+            filename = str(body["filename"])
+            size = int(body["size"]) if body.get("size") is not None else None
+        except (ValueError, KeyError, TypeError):
+            return web.json_response({"error": "filename is required"}, status=400)
+
+        try:
+            session = await sessions.async_create(filename, size)
+        except UploadTooLarge as e:
+            return web.json_response({"error": str(e)}, status=413)
+        return web.json_response(
+            {**session.to_dict(), "chunk_size": UPLOAD_CHUNK_SIZE}, status=201
+        )
+
+
+class PrintAssistUploadSessionView(HomeAssistantView):
+    """Query, append to, finalize or abort an upload session.
+
+    PUT appends the request body at the ``offset`` query parameter (or
+    ``Upload-Offset`` header). POST finalizes the session into a project.
+    """
+
+    url = "/api/printassist/upload_sessions/{session_id}"
+    name = "api:printassist:upload_session"
+    requires_auth = True
+
+    async def get(self, request: web.Request, session_id: str) -> web.Response:
+        hass = request.app["hass"]
+        if DOMAIN not in hass.data:
+            return web.json_response({"error": "PrintAssist not loaded"}, status=500)
+        sessions: UploadSessionManager = hass.data[DOMAIN]["upload_sessions"]
+        try:
+            return web.json_response(sessions.get(session_id).to_dict())
+        except UnknownSession:
+            return web.json_response({"error": "Unknown upload session"}, status=404)
+
+    async def put(self, request: web.Request, session_id: str) -> web.Response:
+        hass = request.app["hass"]
+        if DOMAIN not in hass.data:
+            return web.json_response({"error": "PrintAssist not loaded"}, status=500)
+        sessions: UploadSessionManager = hass.data[DOMAIN]["upload_sessions"]
+        try:
+            offset = int(request.query.get("offset", request.headers.get("Upload-Offset", "")))
+        except ValueError:
+            return web.json_response({"error": "offset is required"}, status=400)
+
+        try:
+            new_offset = await sessions.async_append(
+                session_id, offset, request.content.iter_chunked(UPLOAD_CHUNK_SIZE)
+            )
+        except UnknownSession:
+            return web.json_response({"error": "Unknown upload session"}, status=404)
+        except OffsetMismatch as e:
+            return web.json_response({"error": str(e), "offset": e.expected}, status=409)
+        except UploadTooLarge as e:
+            return web.json_response({"error": str(e)}, status=413)
+        return web.json_response({"session_id": session_id, "offset": new_offset})
+
+    async def post(self, request: web.Request, session_id: str) -> web.Response:
+        hass = request.app["hass"]
+        if DOMAIN not in hass.data:
+            return web.json_response({"error": "PrintAssist not loaded"}, status=500)
+        store: PrintAssistStore = hass.data[DOMAIN]["store"]
+        file_handler: FileHandler = hass.data[DOMAIN]["file_handler"]
+        coordinator: PrintAssistCoordinator = hass.data[DOMAIN]["coordinator"]
+        sessions: UploadSessionManager = hass.data[DOMAIN]["upload_sessions"]
+
+        try:
+            body = await request.json()
+            project_id = str(body["project_id"])
+        except (ValueError, KeyError, TypeError):
+            return web.json_response({"error": "project_id is required"}, status=400)
+        if not store.get_project(project_id):
+            return web.json_response({"error": "Project not found"}, status=404)
+
+        try:
+            staged = await sessions.async_finalize(session_id, body.get("sha256"))
+        except UnknownSession:
+            return web.json_response({"error": "Unknown upload session"}, status=404)
+        except UploadSessionError as e:
+            return web.json_response({"error": str(e)}, status=409)
+
+        try:
+            plates = await file_handler.process_file(
+                staged.path, project_id, staged.filename, staged.sha256
+            )
+            if not plates:
+                return web.json_response({"error": "No plates found in file"}, status=400)
+
+            await store.async_add_plates(plates)
+            await coordinator.async_request_schedule_refresh(wait=True)
+
+            return web.json_response({
+                "success": True,
+                "sha256": staged.sha256,
+                "plates": [asdict(p) for p in plates],
+            })
         except Exception as e:
             _LOGGER.exception("Upload failed")
             return web.json_response({"error": str(e)}, status=500)
+        finally:
+            await file_handler.async_discard_staged(staged)
+
+    async def delete(self, request: web.Request, session_id: str) -> web.Response:
+        hass = request.app["hass"]
+        if DOMAIN not in hass.data:
+            return web.json_response({"error": "PrintAssist not loaded"}, status=500)
+        sessions: UploadSessionManager = hass.data[DOMAIN]["upload_sessions"]
+        await sessions.async_abort(session_id)
+        return web.json_response({"success": True})
+
+
+async def _iter_chunks(field: BodyPartReader) -> AsyncIterator[bytes]:
+    while chunk := await field.read_chunk(UPLOAD_CHUNK_SIZE):
+        yield chunk
+
+
+async def _async_setup_printer_monitor(
+    hass: HomeAssistant,
+    coordinator: PrintAssistCoordinator,
+    store: PrintAssistStore,
+    bambu_device_id: str,
+) -> None:
+    """Attach the printer monitor once its entities report state.
+
+    This can wait up to a minute for the Bambu integration, so it runs in the
+    background instead of blocking setup.
+    """
+    printer_monitor = BambuPrinterMonitor(
+        hass,
+        bambu_device_id,
+        store,
+        on_schedule_change=coordinator.invalidate_schedule,
+    )
+    if not await printer_monitor.async_setup():
+        _LOGGER.warning("Failed to setup Bambu printer monitor")
+        return
+
+    if DOMAIN not in hass.data:
+        await printer_monitor.async_unload()
+        return
+
+    hass.data[DOMAIN]["printer_monitor"] = printer_monitor
+    coordinator.set_printer_monitor(printer_monitor)
+    _LOGGER.info("Bambu printer monitor active for device: %s", bambu_device_id)
+    await coordinator.async_request_schedule_refresh()
+
+
+def _entry_setting(entry: ConfigEntry, key: str, default: Any) -> Any:
+    """Setting from the options flow, falling back to the initial setup data."""
+    return entry.options.get(key, entry.data.get(key, default))
+
+
+async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await hass.config_entries.async_reload(entry.entry_id)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
 
-    store = PrintAssistStore(hass)
+    timings = StageTimings()
+    store = PrintAssistStore(hass, timings)
     await store.async_load()
 
-    file_handler = FileHandler(hass)
-    coordinator = PrintAssistCoordinator(hass, store)
-
-    printer_monitor = None
-    bambu_device_id = entry.data.get(CONF_BAMBU_DEVICE_ID)
-    if bambu_device_id:
-        printer_monitor = BambuPrinterMonitor(
-            hass,
-            bambu_device_id,
-            store,
-            on_schedule_change=coordinator.invalidate_schedule,
-        )
-        if await printer_monitor.async_setup():
-            coordinator.set_printer_monitor(printer_monitor)
-            _LOGGER.info("Bambu printer monitor active for device: %s", bambu_device_id)
-        else:
-            _LOGGER.warning("Failed to setup Bambu printer monitor")
-            printer_monitor = None
+    file_handler = FileHandler(hass, timings)
+    await file_handler.async_load()
+    coordinator = PrintAssistCoordinator(
+        hass,
+        store,
+        timings=timings,
+        schedule_mode=_entry_setting(entry, CONF_SCHEDULE_MODE, SCHEDULE_MODE_PRIORITY),
+        refresh_debounce=_entry_setting(entry, CONF_REFRESH_DEBOUNCE, DEFAULT_REFRESH_DEBOUNCE),
+    )
 
     hass.data[DOMAIN] = {
         "store": store,
         "file_handler": file_handler,
         "coordinator": coordinator,
-        "printer_monitor": printer_monitor,
+        "upload_sessions": UploadSessionManager(hass, file_handler.incoming_path),
+        "printer_monitor": None,
         "entry": entry,
     }
 
-    await coordinator.async_config_entry_first_refresh()
+    if await coordinator.async_restore_schedule():
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} initial schedule refresh"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
+
+    bambu_device_id = entry.data.get(CONF_BAMBU_DEVICE_ID)
+    if bambu_device_id:
+        entry.async_create_background_task(
+            hass,
+            _async_setup_printer_monitor(hass, coordinator, store, bambu_device_id),
+            f"{DOMAIN} printer monitor setup",
+        )
+
     await async_setup_services(hass)
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
+
+    async def _async_periodic_garbage_collection(_now: datetime) -> None:
+        await async_collect_garbage(hass)
+
+    entry.async_on_unload(
+        async_track_time_interval(hass, _async_periodic_garbage_collection, GC_INTERVAL)
+    )
 
     websocket_api.async_register_command(hass, ws_get_data)
+    websocket_api.async_register_command(hass, ws_subscribe)
+    websocket_api.async_register_command(hass, ws_query)
     hass.http.register_view(PrintAssistUploadView())
+    hass.http.register_view(PrintAssistBulkUploadView())
+    hass.http.register_view(PrintAssistUploadSessionsView())
+    hass.http.register_view(PrintAssistUploadSessionView())
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
@@ -200,6 +609,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     await async_unload_services(hass)
+    async_dispatcher_send(hass, SIGNAL_UNLOAD)
+
+    coordinator: PrintAssistCoordinator = hass.data[DOMAIN]["coordinator"]
+    await coordinator.async_shutdown()
+    await hass.data[DOMAIN]["upload_sessions"].async_shutdown()
 
     printer_monitor = hass.data[DOMAIN].get("printer_monitor")
     if printer_monitor:
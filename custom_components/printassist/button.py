@@ -70,8 +70,7 @@ class PrintAssistMarkSuccessButton(PrintAssistButtonBase):
             await self._store.async_complete_job(active_job.id)
             if self._printer_monitor:
                 await self._printer_monitor.async_recheck_printer_state()
-            self.coordinator.invalidate_schedule()
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_request_schedule_refresh(wait=True)
 
 
 class PrintAssistMarkFailedButton(PrintAssistButtonBase):
@@ -101,8 +100,7 @@ class PrintAssistMarkFailedButton(PrintAssistButtonBase):
             await self._store.async_fail_job(active_job.id)
             if self._printer_monitor:
                 await self._printer_monitor.async_recheck_printer_state()
-            self.coordinator.invalidate_schedule()
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_request_schedule_refresh(wait=True)
 
 
 class PrintAssistRescheduleButton(PrintAssistButtonBase):
@@ -111,5 +109,4 @@ class PrintAssistRescheduleButton(PrintAssistButtonBase):
         self._attr_icon = "mdi:calendar-refresh"
 
     async def async_press(self) -> None:
-        self.coordinator.invalidate_schedule()
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_request_schedule_refresh(wait=True)
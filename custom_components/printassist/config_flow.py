@@ -2,13 +2,55 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from typing import Any
 
 import voluptuous as vol
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.core import callback
 from homeassistant.helpers import selector
 
-from .const import DOMAIN, CONF_BAMBU_DEVICE_ID
+from .const import (
+    DOMAIN,
+    CONF_BAMBU_DEVICE_ID,
+    CONF_REFRESH_DEBOUNCE,
+    CONF_SCHEDULE_MODE,
+    DEFAULT_REFRESH_DEBOUNCE,
+    SCHEDULE_MODE_PRIORITY,
+    SCHEDULE_MODES,
+)
+
+
+def _settings_schema(defaults: Mapping[str, Any]) -> dict[vol.Marker, Any]:
+    """Fields that can be changed after setup through the options flow."""
+    return {
+        vol.Optional(
+            CONF_SCHEDULE_MODE,
+            default=defaults.get(CONF_SCHEDULE_MODE, SCHEDULE_MODE_PRIORITY),
+        ): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=SCHEDULE_MODES,
+                translation_key=CONF_SCHEDULE_MODE,
+            )
+        ),
+        vol.Optional(
+            CONF_REFRESH_DEBOUNCE,
+            default=defaults.get(CONF_REFRESH_DEBOUNCE, DEFAULT_REFRESH_DEBOUNCE),
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0,
+                max=10,
+                step=0.05,
+                unit_of_measurement="s",
+                mode=selector.NumberSelectorMode.BOX,
+            )
+        ),
+    }
 
 
 class PrintAssistConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -16,6 +58,11 @@ class PrintAssistConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        return PrintAssistOptionsFlow(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -38,5 +85,26 @@ class PrintAssistConfigFlow(ConfigFlow, domain=DOMAIN):
                         multiple=False,
                     )
                 ),
+                **_settings_schema({}),
             }),
         )
+
+
+class PrintAssistOptionsFlow(OptionsFlow):
+    """Change the scheduling settings of an existing entry."""
+
+    def __init__(self, config_entry: ConfigEntry) -> None:
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                _settings_schema({**self._entry.data, **self._entry.options})
+            ),
+        )
@@ -1,4 +1,5 @@
 """Constants for PrintAssist integration."""
+from datetime import timedelta
 from typing import Final
 
 DOMAIN: Final = "printassist"
@@ -6,8 +7,32 @@ NAME: Final = "PrintAssist"
 
 STORAGE_KEY: Final = f"{DOMAIN}.storage"
 STORAGE_VERSION: Final = 1
+SCHEDULE_STORAGE_KEY: Final = f"{DOMAIN}.schedule"
+SCHEDULE_STORAGE_VERSION: Final = 1
+PARSE_CACHE_STORAGE_KEY: Final = f"{DOMAIN}.parse_cache"
+PARSE_CACHE_STORAGE_VERSION: Final = 1
+PARSE_CACHE_SAVE_DELAY: Final = 10
 
 CONF_BAMBU_DEVICE_ID: Final = "bambu_device_id"
+CONF_SCHEDULE_MODE: Final = "schedule_mode"
+CONF_REFRESH_DEBOUNCE: Final = "refresh_debounce"
+
+DEFAULT_REFRESH_DEBOUNCE: Final = 0.25
+
+SCHEDULE_MODE_PRIORITY: Final = "priority"
+SCHEDULE_MODE_DEADLINE: Final = "deadline"
+SCHEDULE_MODE_LONGEST_FIRST: Final = "longest_first"
+SCHEDULE_MODE_SHORTEST_FIRST: Final = "shortest_first"
+SCHEDULE_MODE_KNAPSACK: Final = "knapsack"
+SCHEDULE_MODE_PORTFOLIO: Final = "portfolio"
+SCHEDULE_HEURISTICS: Final = [
+    SCHEDULE_MODE_PRIORITY,
+    SCHEDULE_MODE_DEADLINE,
+    SCHEDULE_MODE_LONGEST_FIRST,
+    SCHEDULE_MODE_SHORTEST_FIRST,
+    SCHEDULE_MODE_KNAPSACK,
+]
+SCHEDULE_MODES: Final = [*SCHEDULE_HEURISTICS, SCHEDULE_MODE_PORTFOLIO]
 
 ATTR_PROJECT_ID: Final = "project_id"
 ATTR_PROJECT_NAME: Final = "name"
@@ -19,18 +44,47 @@ ATTR_NOTES: Final = "notes"
 ATTR_FAILURE_REASON: Final = "failure_reason"
 ATTR_FILENAME: Final = "filename"
 ATTR_FILE_CONTENT: Final = "file_content"
+ATTR_SESSION_ID: Final = "session_id"
 ATTR_START: Final = "start"
 ATTR_END: Final = "end"
 ATTR_WINDOW_ID: Final = "window_id"
+ATTR_DUE_DATE: Final = "due_date"
+ATTR_WAIT_FOR_REFRESH: Final = "wait_for_refresh"
 
 JOB_STATUS_QUEUED: Final = "queued"
 JOB_STATUS_PRINTING: Final = "printing"
 JOB_STATUS_COMPLETED: Final = "completed"
 JOB_STATUS_FAILED: Final = "failed"
+JOB_STATUSES: Final = [
+    JOB_STATUS_QUEUED,
+    JOB_STATUS_PRINTING,
+    JOB_STATUS_COMPLETED,
+    JOB_STATUS_FAILED,
+]
+
+QUERY_COLLECTIONS: Final = ["projects", "plates", "jobs", "schedule"]
+DEFAULT_QUERY_LIMIT: Final = 100
+MAX_QUERY_LIMIT: Final = 500
 
 THUMBNAIL_DIR: Final = "www/printassist/thumbnails"
+THUMBNAIL_URL: Final = "/local/printassist/thumbnails"
 GCODE_DIR: Final = ".storage/printassist/gcode"
 
+UPLOAD_CHUNK_SIZE: Final = 1024 * 1024
+MAX_UPLOAD_SIZE: Final = 1024 * 1024 * 1024
+UPLOAD_SESSION_TIMEOUT: Final = timedelta(hours=1)
+BULK_PARSE_CONCURRENCY: Final = 4
+PLATE_EXTRACTION_WORKERS: Final = 4
+PORTFOLIO_IDLE_TIMEOUT: Final = 300
+GC_INTERVAL: Final = timedelta(hours=24)
+# Matches the upload session timeout: once idle sessions are expired, every
+# file still in use was written to within this window.
+GC_MIN_FILE_AGE: Final = UPLOAD_SESSION_TIMEOUT
+GC_BATCH_SIZE: Final = 200
+
+# Dispatched when the entry unloads, ending websocket subscriptions to its coordinator.
+SIGNAL_UNLOAD: Final = f"{DOMAIN}_unload"
+
 SERVICE_CREATE_PROJECT: Final = "create_project"
 SERVICE_DELETE_PROJECT: Final = "delete_project"
 SERVICE_UPLOAD_3MF: Final = "upload_3mf"
@@ -42,6 +96,8 @@ SERVICE_COMPLETE_JOB: Final = "complete_job"
 SERVICE_FAIL_JOB: Final = "fail_job"
 SERVICE_ADD_UNAVAILABILITY: Final = "add_unavailability"
 SERVICE_REMOVE_UNAVAILABILITY: Final = "remove_unavailability"
+SERVICE_SET_DUE_DATE: Final = "set_due_date"
+SERVICE_COLLECT_GARBAGE: Final = "collect_garbage"
 
 BAMBU_STATUS_PREPARE: Final = "prepare"
 BAMBU_STATUS_IDLE: Final = "idle"
@@ -1,26 +1,66 @@
 """Data coordinator for PrintAssist."""
 from __future__ import annotations
 
-from dataclasses import asdict
+from collections import Counter, deque
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta, timezone
+import asyncio
 import hashlib
 import json
 import logging
 from typing import TYPE_CHECKING, Any
+import uuid
 
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.json import json_bytes
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import DOMAIN
+from .const import (
+    DEFAULT_REFRESH_DEBOUNCE,
+    DOMAIN,
+    SCHEDULE_MODE_PORTFOLIO,
+    SCHEDULE_MODE_PRIORITY,
+    SCHEDULE_STORAGE_KEY,
+    SCHEDULE_STORAGE_VERSION,
+)
+from .delta import diff_payload, merge_deltas
+from .forecast import ForecastResult, failure_rates, forecast_schedule
+from .portfolio import SchedulePortfolio, ScheduleInputs
 from .scheduler import PrintScheduler, ScheduledJob, ScheduleResult
+from .timing import (
+    STAGE_BUILD_DATA,
+    STAGE_FORECAST,
+    STAGE_INPUT_HASH,
+    STAGE_SCHEDULER,
+    STAGE_UPDATE,
+    StageTimings,
+)
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
-    from .store import PrintAssistStore
+    from .store import Job, Plate, PrintAssistStore, Project, StoreSnapshot
     from .printer_monitor import BambuPrinterMonitor
 
 _LOGGER = logging.getLogger(__name__)
 
 UPDATE_INTERVAL = timedelta(seconds=30)
+SNAPSHOT_SAVE_DELAY = 10
+DELTA_HISTORY = 32
+
+
+@dataclass(frozen=True)
+class DataPayload:
+    """Panel payload for one data revision, with its JSON encoding.
+
+    Revisions restart with every coordinator, so they are only comparable
+    within one ``epoch``.
+    """
+
+    epoch: str
+    revision: int
+    data: dict[str, Any]
+    json: bytes
 
 
 class PrintAssistCoordinator(DataUpdateCoordinator[dict[str, Any]]):
@@ -29,6 +69,9 @@ class PrintAssistCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         hass: HomeAssistant,
         store: PrintAssistStore,
         printer_monitor: BambuPrinterMonitor | None = None,
+        schedule_mode: str = SCHEDULE_MODE_PRIORITY,
+        refresh_debounce: float = DEFAULT_REFRESH_DEBOUNCE,
+        timings: StageTimings | None = None,
     ) -> None:
         super().__init__(
             hass,
@@ -38,8 +81,32 @@ class PrintAssistCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         )
         self._store = store
         self._printer_monitor = printer_monitor
+        self._schedule_mode = schedule_mode
+        self.timings = timings or StageTimings()
+        self._portfolio: SchedulePortfolio | None = None
+        if schedule_mode == SCHEDULE_MODE_PORTFOLIO:
+            self._portfolio = SchedulePortfolio()
         self._schedule_result: ScheduleResult | None = None
         self._last_input_hash: str | None = None
+        self._schedule_fingerprint: str | None = None
+        self._forecast: dict[str, Any] | None = None
+        self._forecast_key: tuple | None = None
+        self._schedule_store: Store = Store(hass, SCHEDULE_STORAGE_VERSION, SCHEDULE_STORAGE_KEY)
+        self._schedule_dicts: tuple[ScheduleResult, list[dict[str, Any]]] | None = None
+        self.epoch = uuid.uuid4().hex
+        self._payload: DataPayload | None = None
+        self._payload_key: tuple | None = None
+        self._deltas: deque[dict[str, Any]] = deque(maxlen=DELTA_HISTORY)
+        self._delta_json: dict[int, bytes] = {}
+        self._schedule_refresh_requested = False
+        self._schedule_refresh_waiters: list[asyncio.Future[None]] = []
+        self._schedule_debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=refresh_debounce,
+            immediate=False,
+            function=self._async_debounced_refresh,
+        )
 
     def set_printer_monitor(self, monitor: BambuPrinterMonitor) -> None:
         self._printer_monitor = monitor
@@ -49,27 +116,137 @@ class PrintAssistCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             return self._printer_monitor.get_unknown_print_info()
         return None
 
-    def _compute_input_hash(self) -> str:
-        queued_jobs = self._store.get_queued_jobs()
-        plates = self._store.get_plates()
-        unavailability = self._store.get_unavailability_windows()
-        active_job = self._store.get_active_job()
+    def get_payload(self) -> DataPayload:
+        """Full panel payload, rebuilt and serialized only when the data changed.
+
+        The revision increases every time the content changes, so clients can
+        tell whether what they hold is current.
+        """
+        data = self.data or {}
+        unknown_print = self.get_unknown_print_info()
+        key = (
+            self._store.revision,
+            data.get("computed_at"),
+            data.get("stale", False),
+            tuple(sorted(unknown_print.items())) if unknown_print else None,
+        )
+        if self._payload is None or key != self._payload_key:
+            revision = self._payload.revision + 1 if self._payload else 1
+            content = self._build_payload(revision, data, unknown_print)
+            if self._payload is not None:
+                self._deltas.append(diff_payload(self._payload.data, content))
+                self._delta_json.clear()
+            self._payload = DataPayload(self.epoch, revision, content, json_bytes(content))
+            self._payload_key = key
+        return self._payload
+
+    def get_delta(self, since_revision: int, epoch: str | None) -> dict[str, Any] | None:
+        """Changes from ``since_revision`` to the current payload revision.
+
+        Returns None when that revision is from another epoch (a previous run
+        or coordinator) or no longer covered by the retained history, in which
+        case the client needs the full payload.
+        """
+        current = self.get_payload()
+        if epoch != self.epoch:
+            return None
+        if since_revision == current.revision:
+            return {
+                "base_revision": since_revision,
+                "revision": since_revision,
+                "collections": {},
+                "fields": {},
+            }
+        chain = [d for d in self._deltas if d["base_revision"] >= since_revision]
+        if not chain or chain[0]["base_revision"] != since_revision:
+            return None
+        delta = chain[0]
+        for following in chain[1:]:
+            delta = merge_deltas(delta, following)
+        return delta
+
+    def get_delta_json(self, since_revision: int, epoch: str | None) -> bytes | None:
+        """Serialized ``get_delta``, shared by all clients at the same revision."""
+        self.get_payload()
+        if epoch != self.epoch:
+            return None
+        if (cached := self._delta_json.get(since_revision)) is not None:
+            return cached
+        if (delta := self.get_delta(since_revision, epoch)) is None:
+            return None
+        encoded = self._delta_json[since_revision] = json_bytes(delta)
+        return encoded
+
+    def _build_payload(
+        self, revision: int, data: dict[str, Any], unknown_print: dict | None
+    ) -> dict[str, Any]:
+        snapshot = self._store.snapshot()
+        lateness_by_project = data.get("lateness_by_project", {})
+        projects = []
+        for project in snapshot.projects:
+            completed, total = snapshot.progress_by_project[project.id]
+            projects.append({
+                **asdict(project),
+                "completed": completed,
+                "total": total,
+                "projected_lateness_seconds": lateness_by_project.get(project.id),
+            })
+
+        return {
+            "epoch": self.epoch,
+            "revision": revision,
+            "projects": projects,
+            "plates": [asdict(p) for p in snapshot.plates],
+            "jobs": [asdict(j) for j in snapshot.jobs],
+            "schedule": data.get("schedule", []),
+            "computed_at": data.get("computed_at"),
+            "next_breakpoint": data.get("next_breakpoint"),
+            "forecast": data.get("forecast"),
+            "stale": data.get("stale", False),
+            "unavailability_windows": [asdict(w) for w in snapshot.unavailability_windows],
+            "unknown_print": unknown_print,
+        }
+
+    def _compute_input_hash(self, snapshot: StoreSnapshot | None = None) -> str:
+        with self.timings.measure(STAGE_INPUT_HASH):
+            return self._input_hash(snapshot or self._store.snapshot())
+
+    def _input_hash(self, snapshot: StoreSnapshot) -> str:
+        active_job = snapshot.active_job
 
         active_job_end = None
-        end = self._estimate_active_job_end()
+        end = self._estimate_active_job_end(snapshot)
         if end:
             active_job_end = end.isoformat()
 
+        # The store revision covers jobs, plates, projects and windows.
         data = {
-            "jobs": [(j.id, j.plate_id, j.status) for j in queued_jobs],
-            "plates": [(p.id, p.priority, p.estimated_duration_seconds) for p in plates],
-            "windows": [(w.id, w.start, w.end) for w in unavailability],
+            "revision": snapshot.revision,
+            "mode": self._schedule_mode,
             "active": active_job.id if active_job else None,
             "active_job_end": active_job_end,
         }
         return hashlib.md5(json.dumps(data, sort_keys=True).encode()).hexdigest()
 
-    def _needs_recompute(self) -> bool:
+    def _input_fingerprint(self, snapshot: StoreSnapshot) -> str:
+        """Content-derived hash of the scheduler inputs that survives a restart.
+
+        Unlike the store revision it identifies the same inputs across
+        processes, so a persisted schedule can be checked against them. It
+        serializes the whole snapshot, so it runs in the executor.
+        """
+        active_job = snapshot.active_job
+        data = {
+            "mode": self._schedule_mode,
+            "queued": [asdict(j) for j in snapshot.queued_jobs],
+            "plates": [asdict(p) for p in snapshot.plates],
+            "projects": [asdict(p) for p in snapshot.projects],
+            "windows": [asdict(w) for w in snapshot.unavailability_windows],
+            "active": asdict(active_job) if active_job else None,
+        }
+        return hashlib.md5(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _needs_recompute(self, input_hash: str) -> bool:
         if not self._schedule_result:
             return True
 
@@ -77,28 +254,56 @@ class PrintAssistCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         if self._schedule_result.next_breakpoint and now >= self._schedule_result.next_breakpoint:
             return True
 
-        current_hash = self._compute_input_hash()
-        if current_hash != self._last_input_hash:
-            return True
-
-        return False
+        return input_hash != self._last_input_hash
 
     def invalidate_schedule(self) -> None:
         """Force schedule recalculation on next update."""
         self._schedule_result = None
         self._last_input_hash = None
 
+    async def async_request_schedule_refresh(self, wait: bool = False) -> None:
+        """Invalidate the schedule and refresh once the debounce window closes.
+
+        Requests inside the window share a single recompute. With ``wait`` the
+        caller resumes once a refresh that started after its request is done.
+        """
+        self.invalidate_schedule()
+        self._schedule_refresh_requested = True
+        waiter: asyncio.Future[None] | None = None
+        if wait:
+            waiter = self.hass.loop.create_future()
+            self._schedule_refresh_waiters.append(waiter)
+        self._schedule_debouncer.async_schedule_call()
+        if waiter:
+            await waiter
+
+    async def _async_debounced_refresh(self) -> None:
+        # The debouncer drops calls made while this runs, so pick them up here.
+        while self._schedule_refresh_requested:
+            self._schedule_refresh_requested = False
+            waiters = self._schedule_refresh_waiters
+            self._schedule_refresh_waiters = []
+            try:
+                await self.async_refresh()
+            finally:
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_result(None)
+
     def get_active_job_end_time(self) -> datetime | None:
         """Public accessor for active job end time."""
         return self._estimate_active_job_end()
 
-    def _estimate_active_job_end(self) -> datetime | None:
+    def _estimate_active_job_end(
+        self, snapshot: StoreSnapshot | None = None
+    ) -> datetime | None:
         if self._printer_monitor:
             blocking_end = self._printer_monitor.get_blocking_end_time()
             if blocking_end:
                 return blocking_end
 
-        active_job = self._store.get_active_job()
+        snapshot = snapshot or self._store.snapshot()
+        active_job = snapshot.active_job
         if not active_job or not active_job.started_at:
             return None
 
@@ -107,7 +312,7 @@ class PrintAssistCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             if end_time:
                 return end_time
 
-        plate = self._store.get_plate(active_job.plate_id)
+        plate = snapshot.plates_by_id.get(active_job.plate_id)
         if not plate:
             return None
 
@@ -116,70 +321,236 @@ class PrintAssistCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             started = started.replace(tzinfo=timezone.utc)
         return started + timedelta(seconds=plate.estimated_duration_seconds)
 
-    def _run_scheduler(self) -> ScheduleResult:
-        if not self._needs_recompute() and self._schedule_result:
+    async def async_restore_schedule(self) -> bool:
+        """Serve the last persisted schedule until a refresh completes.
+
+        It is marked stale unless its input fingerprint matches the store.
+        """
+        saved = await self._schedule_store.async_load()
+        if not saved:
+            return False
+        try:
+            schedule_result = ScheduleResult.from_dict(saved["result"])
+        except (KeyError, TypeError, ValueError):
+            _LOGGER.warning("Ignoring unreadable schedule snapshot")
+            return False
+
+        snapshot = self._store.snapshot()
+        forecast = saved.get("forecast")
+        breakpoint = schedule_result.next_breakpoint
+        fingerprint = await self.hass.async_add_executor_job(self._input_fingerprint, snapshot)
+        current = (
+            saved.get("input_hash") == fingerprint
+            and (breakpoint is None or datetime.now(timezone.utc) < breakpoint)
+        )
+        if current:
+            # Same inputs as when it was computed: adopt it instead of recomputing.
+            self._schedule_result = schedule_result
+            self._schedule_fingerprint = fingerprint
+            self._last_input_hash = self._compute_input_hash(snapshot)
+            if forecast is not None:
+                self._forecast = forecast
+                self._forecast_key = (self._last_input_hash, schedule_result.computed_at)
+
+        self.data = self._build_data(snapshot, schedule_result, forecast, stale=not current)
+        _LOGGER.debug(
+            "Restored %s schedule snapshot computed at %s",
+            "current" if current else "stale", schedule_result.computed_at,
+        )
+        return True
+
+    def _save_schedule(self) -> None:
+        self._schedule_store.async_delay_save(self._schedule_store_data, SNAPSHOT_SAVE_DELAY)
+
+    def _schedule_store_data(self) -> dict[str, Any]:
+        return {
+            "input_hash": self._schedule_fingerprint,
+            "result": self._schedule_result.to_dict() if self._schedule_result else None,
+            "forecast": self._forecast,
+        }
+
+    async def async_shutdown(self) -> None:
+        self._schedule_debouncer.async_shutdown()
+        for waiter in self._schedule_refresh_waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._schedule_refresh_waiters = []
+        await super().async_shutdown()
+        if self._portfolio:
+            await self._portfolio.async_shutdown()
+
+    async def _async_run_scheduler(self, snapshot: StoreSnapshot) -> ScheduleResult:
+        input_hash = self._compute_input_hash(snapshot)
+        if not self._needs_recompute(input_hash) and self._schedule_result:
             return self._schedule_result
 
-        queued_jobs = self._store.get_queued_jobs()
-        plates = self._store.get_plates()
-        plates_by_id = {p.id: p for p in plates}
-        unavailability = self._store.get_unavailability_windows()
-        active_job_end = self._estimate_active_job_end()
+        queued_jobs = list(snapshot.queued_jobs)
+        projects_by_id = {p.id: p for p in snapshot.projects}
+        unavailability = list(snapshot.unavailability_windows)
+        active_job_end = self._estimate_active_job_end(snapshot)
 
         _LOGGER.debug(
-            "Running scheduler: %d queued jobs, active_job_end=%s",
-            len(queued_jobs), active_job_end
+            "Running scheduler: %d queued jobs, active_job_end=%s, mode=%s",
+            len(queued_jobs), active_job_end, self._schedule_mode
         )
 
-        scheduler = PrintScheduler(
-            queued_jobs=queued_jobs,
-            plates_by_id=plates_by_id,
-            unavailability_windows=unavailability,
-            active_job_end=active_job_end,
+        with self.timings.measure(STAGE_SCHEDULER):
+            if self._portfolio:
+                result = await self._portfolio.async_run(ScheduleInputs(
+                    queued_jobs=queued_jobs,
+                    plates_by_id=dict(snapshot.plates_by_id),
+                    unavailability_windows=unavailability,
+                    current_time=datetime.now(timezone.utc),
+                    active_job_end=active_job_end,
+                    projects_by_id=projects_by_id,
+                ))
+            else:
+                scheduler = PrintScheduler(
+                    queued_jobs=queued_jobs,
+                    plates_by_id=snapshot.plates_by_id,
+                    unavailability_windows=unavailability,
+                    active_job_end=active_job_end,
+                    projects_by_id=projects_by_id,
+                    mode=self._schedule_mode,
+                )
+                result = scheduler.calculate_schedule()
+
+        fingerprint = await self.hass.async_add_executor_job(self._input_fingerprint, snapshot)
+        self._schedule_result = result
+        self._schedule_fingerprint = fingerprint
+        self._last_input_hash = input_hash
+        self._save_schedule()
+        return self._schedule_result
+
+    async def _async_update_forecast(
+        self, snapshot: StoreSnapshot, schedule_result: ScheduleResult
+    ) -> dict[str, Any]:
+        """Run the Monte Carlo forecast in the executor when its inputs changed."""
+        key = (self._last_input_hash, schedule_result.computed_at)
+        if self._forecast is not None and key == self._forecast_key:
+            return self._forecast
+
+        project_by_plate = {p.id: p.project_id for p in snapshot.plates}
+        queued_by_project = Counter(
+            project_by_plate[job.plate_id]
+            for job in snapshot.queued_jobs
+            if job.plate_id in project_by_plate
         )
+        rates = failure_rates(snapshot.jobs)
+        with self.timings.measure(STAGE_FORECAST):
+            result: ForecastResult = await self.hass.async_add_executor_job(
+                forecast_schedule,
+                schedule_result,
+                project_by_plate,
+                rates,
+                list(snapshot.unavailability_windows),
+                dict(queued_by_project),
+            )
+
+        def _serialize(values: dict[str, tuple[datetime, datetime]]) -> dict[str, dict]:
+            return {
+                key: {"p50": p50.isoformat(), "p90": p90.isoformat()}
+                for key, (p50, p90) in values.items()
+            }
+
+        self._forecast = {
+            "samples": result.samples,
+            "jobs": _serialize(result.jobs),
+            "projects": _serialize(result.projects),
+        }
+        self._forecast_key = key
+        return self._forecast
 
-        self._schedule_result = scheduler.calculate_schedule()
-        self._last_input_hash = self._compute_input_hash()
-        return self._schedule_result
+    def _build_project_eta(
+        self,
+        projects: tuple[Project, ...],
+        queued: list[tuple[Job, Plate]],
+        schedule_result: ScheduleResult,
+    ) -> dict[str, dict[str, Any]]:
+        """Projected completion and remaining print time for every project.
+
+        Completion is only known when all of a project's queued jobs fall
+        inside the schedule horizon.
+        """
+        eta: dict[str, dict[str, Any]] = {
+            project.id: {
+                "name": project.name,
+                "completion": None,
+                "remaining_seconds": 0,
+                "queued": 0,
+                "scheduled": 0,
+            }
+            for project in projects
+        }
+        project_by_plate: dict[str, str] = {}
+        for _, plate in queued:
+            project_by_plate[plate.id] = plate.project_id
+            entry = eta.get(plate.project_id)
+            if entry:
+                entry["remaining_seconds"] += plate.estimated_duration_seconds
+                entry["queued"] += 1
+
+        for sj in schedule_result.jobs:
+            entry = eta.get(project_by_plate.get(sj.plate_id))
+            if not entry:
+                continue
+            entry["scheduled"] += 1
+            if entry["completion"] is None or sj.scheduled_end > entry["completion"]:
+                entry["completion"] = sj.scheduled_end
+
+        for entry in eta.values():
+            if entry["scheduled"] < entry["queued"]:
+                entry["completion"] = None
+        return eta
 
     async def _async_update_data(self) -> dict[str, Any]:
-        queued_jobs = self._store.get_queued_jobs()
+        with self.timings.measure(STAGE_UPDATE):
+            snapshot = self._store.snapshot()
+            schedule_result = await self._async_run_scheduler(snapshot)
+            forecast = await self._async_update_forecast(snapshot, schedule_result)
+            with self.timings.measure(STAGE_BUILD_DATA):
+                return self._build_data(snapshot, schedule_result, forecast)
+
+    def _serialize_schedule(self, schedule_result: ScheduleResult) -> list[dict[str, Any]]:
+        """Schedule as dicts, shared by the schedule sensor and the panel payload.
+
+        The same list is returned until the schedule is recomputed, so Home
+        Assistant sees unchanged sensor attributes without comparing them.
+        """
+        if self._schedule_dicts is None or self._schedule_dicts[0] is not schedule_result:
+            self._schedule_dicts = (schedule_result, [sj.to_dict() for sj in schedule_result.jobs])
+        return self._schedule_dicts[1]
+
+    def _build_data(
+        self,
+        snapshot: StoreSnapshot,
+        schedule_result: ScheduleResult,
+        forecast: dict[str, Any] | None,
+        stale: bool = False,
+    ) -> dict[str, Any]:
+        plates_by_id = snapshot.plates_by_id
+        queued_jobs = snapshot.queued_jobs
 
         sorted_jobs = []
         for job in queued_jobs:
-            plate = self._store.get_plate(job.plate_id)
+            plate = plates_by_id.get(job.plate_id)
             if plate:
                 sorted_jobs.append((job, plate))
         sorted_jobs.sort(key=lambda x: -x[1].priority)
 
-        active_job = self._store.get_active_job()
-        active_plate = None
-        if active_job:
-            active_plate = self._store.get_plate(active_job.plate_id)
-
-        schedule_result = self._run_scheduler()
-        schedule_data = []
-        for sj in schedule_result.jobs:
-            schedule_data.append({
-                "job_id": sj.job_id,
-                "plate_id": sj.plate_id,
-                "plate_name": sj.plate_name,
-                "plate_number": sj.plate_number,
-                "source_filename": sj.source_filename,
-                "scheduled_start": sj.scheduled_start.isoformat(),
-                "scheduled_end": sj.scheduled_end.isoformat(),
-                "estimated_duration_seconds": sj.estimated_duration_seconds,
-                "spans_unavailability": sj.spans_unavailability,
-                "thumbnail_path": sj.thumbnail_path,
-            })
+        active_job = snapshot.active_job
+        active_plate = plates_by_id.get(active_job.plate_id) if active_job else None
 
+        schedule_data = self._serialize_schedule(schedule_result)
         next_scheduled = schedule_result.jobs[0] if schedule_result.jobs else None
 
+        project_eta = self._build_project_eta(snapshot.projects, sorted_jobs, schedule_result)
+
         parts_printed = 0
         total_parts = 0
         progress_by_project = []
-        for project in self._store.get_projects():
-            completed, total = self._store.get_project_progress(project.id)
+        for project in snapshot.projects:
+            completed, total = snapshot.progress_by_project[project.id]
             if completed < total:
                 parts_printed += completed
                 total_parts += total
@@ -190,8 +561,8 @@ class PrintAssistCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 })
 
         return {
-            "projects": self._store.get_projects(),
-            "plates": self._store.get_plates(),
+            "projects": list(snapshot.projects),
+            "plates": list(snapshot.plates),
             "queued_jobs": [j for j, _ in sorted_jobs],
             "active_job": active_job,
             "active_plate": active_plate,
@@ -202,8 +573,13 @@ class PrintAssistCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             "schedule": schedule_data,
             "computed_at": schedule_result.computed_at.isoformat(),
             "next_breakpoint": schedule_result.next_breakpoint.isoformat() if schedule_result.next_breakpoint else None,
-            "unavailability_windows": self._store.get_unavailability_windows(),
+            "unavailability_windows": list(snapshot.unavailability_windows),
             "parts_printed": parts_printed,
             "total_parts": total_parts,
             "progress_by_project": progress_by_project,
+            "lateness_by_project": schedule_result.lateness_by_project,
+            "schedule_heuristic": schedule_result.mode,
+            "forecast": forecast,
+            "project_eta": project_eta,
+            "stale": stale,
         }
@@ -0,0 +1,115 @@
+"""Revision-to-revision deltas of the PrintAssist panel payload.
+
+A delta lists, per keyed collection, the records that were added or changed
+(in payload order) and the keys that were removed; the schedule also carries
+its new job order when that changed. Scalar payload fields that differ are
+listed under ``fields``. The panel applies deltas with the same rules as
+``apply_delta``.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+KEYED_COLLECTIONS: dict[str, str] = {
+    "projects": "id",
+    "plates": "id",
+    "jobs": "id",
+    "unavailability_windows": "id",
+    "schedule": "job_id",
+}
+ORDERED_COLLECTIONS = {"schedule"}
+
+
+def diff_payload(old: dict[str, Any], new: dict[str, Any]) -> dict[str, Any]:
+    collections: dict[str, dict[str, Any]] = {}
+    for name, key in KEYED_COLLECTIONS.items():
+        old_items = {item[key]: item for item in old.get(name, [])}
+        new_items = new.get(name, [])
+        new_keys = {item[key] for item in new_items}
+
+        changed = [item for item in new_items if old_items.get(item[key]) != item]
+        removed = [k for k in old_items if k not in new_keys]
+        entry: dict[str, Any] = {}
+        if changed or removed:
+            entry = {"changed": changed, "removed": removed}
+        if name in ORDERED_COLLECTIONS:
+            order = [item[key] for item in new_items]
+            if order != list(old_items):
+                entry = {"changed": changed, "removed": removed, "order": order}
+        if entry:
+            collections[name] = entry
+
+    fields = {
+        field: value
+        for field, value in new.items()
+        if field != "revision"
+        and field not in KEYED_COLLECTIONS
+        and old.get(field) != value
+    }
+    return {
+        "base_revision": old["revision"],
+        "revision": new["revision"],
+        "collections": collections,
+        "fields": fields,
+    }
+
+
+def merge_deltas(first: dict[str, Any], second: dict[str, Any]) -> dict[str, Any]:
+    """Combine two consecutive deltas into one spanning both."""
+    if second["base_revision"] != first["revision"]:
+        raise ValueError("Deltas are not consecutive")
+
+    collections: dict[str, dict[str, Any]] = {}
+    for name, key in KEYED_COLLECTIONS.items():
+        a = first["collections"].get(name)
+        b = second["collections"].get(name)
+        if not a or not b:
+            if a or b:
+                collections[name] = a or b
+            continue
+
+        changed = {item[key]: item for item in a["changed"]}
+        removed = dict.fromkeys(a["removed"])
+        for k in b["removed"]:
+            changed.pop(k, None)
+            removed[k] = None
+        for item in b["changed"]:
+            changed[item[key]] = item
+            removed.pop(item[key], None)
+
+        entry = {"changed": list(changed.values()), "removed": list(removed)}
+        if "order" in b or "order" in a:
+            entry["order"] = b.get("order", a.get("order"))
+        collections[name] = entry
+
+    return {
+        "base_revision": first["base_revision"],
+        "revision": second["revision"],
+        "collections": collections,
+        "fields": {**first["fields"], **second["fields"]},
+    }
+
+
+def apply_delta(payload: dict[str, Any], delta: dict[str, Any]) -> dict[str, Any]:
+    """Reference implementation of how clients apply a delta."""
+    if payload["revision"] != delta["base_revision"]:
+        raise ValueError("Delta does not apply to this revision")
+
+    result = {**payload, **delta["fields"], "revision": delta["revision"]}
+    for name, entry in delta["collections"].items():
+        key = KEYED_COLLECTIONS[name]
+        changed = {item[key]: item for item in entry["changed"]}
+        removed = set(entry["removed"])
+
+        items = []
+        for item in payload.get(name, []):
+            if item[key] in removed:
+                continue
+            items.append(changed.pop(item[key], item))
+        items.extend(changed.values())
+
+        if "order" in entry:
+            by_key = {item[key]: item for item in items}
+            items = [by_key[k] for k in entry["order"]]
+        result[name] = items
+    return result
@@ -0,0 +1,42 @@
+"""Diagnostics support for PrintAssist."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import PrintAssistCoordinator
+from .file_handler import FileHandler
+from .store import PrintAssistStore
+from .timing import STAGE_STORE_SAVE, STAGE_UPDATE
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    coordinator: PrintAssistCoordinator = hass.data[DOMAIN]["coordinator"]
+    store: PrintAssistStore = hass.data[DOMAIN]["store"]
+    file_handler: FileHandler = hass.data[DOMAIN]["file_handler"]
+
+    collections = store.get_statistics()
+    serialized_bytes = await hass.async_add_executor_job(store.serialized_size)
+    disk_usage = await hass.async_add_executor_job(file_handler.get_disk_usage)
+
+    last_save = coordinator.timings.last(STAGE_STORE_SAVE)
+    last_refresh = coordinator.timings.last(STAGE_UPDATE)
+
+    return {
+        "store": {
+            "revision": store.revision,
+            "collections": collections,
+            "serialized_bytes": serialized_bytes,
+            "approx_memory_bytes": sum(c["approx_bytes"] for c in collections.values()),
+        },
+        "disk_usage": disk_usage,
+        "last_save_ms": round(last_save * 1000, 3) if last_save is not None else None,
+        "last_refresh_ms": round(last_refresh * 1000, 3) if last_refresh is not None else None,
+        "last_update_success": coordinator.last_update_success,
+        "timings": coordinator.timings.summary(),
+    }
@@ -1,16 +1,38 @@
 """File handling for 3MF and gcode files with multi-plate support."""
 from __future__ import annotations
 
+import asyncio
+import gzip
+import hashlib
 import io
-import json
+import os
 import re
+import shutil
+import tempfile
+import time
 import zipfile
-from dataclasses import dataclass
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import IO, TYPE_CHECKING, Any
 import logging
 
-from .store import Plate
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    GC_BATCH_SIZE,
+    GC_MIN_FILE_AGE,
+    MAX_UPLOAD_SIZE,
+    PARSE_CACHE_SAVE_DELAY,
+    PARSE_CACHE_STORAGE_KEY,
+    PARSE_CACHE_STORAGE_VERSION,
+    PLATE_EXTRACTION_WORKERS,
+    THUMBNAIL_URL,
+    UPLOAD_CHUNK_SIZE,
+)
+from .metadata import PlateMetadata, read_3mf_metadata
+from .store import FileReferences, Plate
+from .timing import STAGE_FILE_PROCESSING, StageTimings
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
@@ -30,6 +52,127 @@ TIME_HMS_PATTERN = re.compile(
 )
 
 PLATE_GCODE_PATTERN = re.compile(r"plate_(\d+)\.gcode", re.IGNORECASE)
+GCODE_HEADER_LINES = 500
+GCODE_TAIL_BYTES = 64 * 1024
+GCODE_READ_SIZE = 64 * 1024
+GCODE_SUFFIX = ".gcode.gz"
+LEGACY_GCODE_SUFFIX = ".gcode"
+GCODE_COMPRESSLEVEL = 6
+
+
+def _match_time(line: str) -> int | None:
+    match = TIME_HMS_PATTERN.search(line)
+    if match:
+        days = int(match.group(1) or 0)
+        hours = int(match.group(2) or 0)
+        minutes = int(match.group(3) or 0)
+        seconds = int(match.group(4) or 0)
+        return days * 86400 + hours * 3600 + minutes * 60 + seconds
+
+    for pattern in GCODE_TIME_PATTERNS:
+        match = pattern.search(line)
+        if match:
+            return int(match.group(1))
+    return None
+
+
+class GcodeTimeScanner:
+    """Finds the slicer's print time estimate while gcode streams past.
+
+    Only the first ``GCODE_HEADER_LINES`` lines are scanned as they arrive.
+    Without a match there, the last ``GCODE_TAIL_BYTES`` are scanned when the
+    stream ends, since some slicers write the estimate into a trailing block.
+    """
+
+    def __init__(self) -> None:
+        self.seconds: int | None = None
+        self._lines = 0
+        self._partial = b""
+        self._tail = bytearray()
+        self._total = 0
+
+    @property
+    def head_scanned(self) -> bool:
+        return self.seconds is not None or self._lines >= GCODE_HEADER_LINES
+
+    def feed(self, chunk: bytes) -> None:
+        if self.seconds is not None:
+            return
+        if not self.head_scanned:
+            self._scan_head(chunk)
+        self._total += len(chunk)
+        self._tail += chunk
+        if len(self._tail) > GCODE_TAIL_BYTES:
+            del self._tail[:-GCODE_TAIL_BYTES]
+
+    def _scan_head(self, chunk: bytes) -> None:
+        lines = (self._partial + chunk).split(b"\n")
+        self._partial = lines.pop()[-GCODE_TAIL_BYTES:]
+        for line in lines:
+            self._lines += 1
+            self.seconds = _match_time(line.decode("utf-8", errors="ignore"))
+            if self.head_scanned:
+                return
+
+    def finish(self, tail: bytes | None = None, truncated: bool | None = None) -> int:
+        """Seconds found, scanning ``tail`` (default: the streamed tail) if needed."""
+        if not self.head_scanned and self._partial:
+            self._lines += 1
+            self.seconds = _match_time(self._partial.decode("utf-8", errors="ignore"))
+        if self.seconds is None:
+            if tail is None:
+                tail, truncated = bytes(self._tail), self._total > len(self._tail)
+            lines = tail.split(b"\n")
+            if truncated:
+                lines = lines[1:]
+            for line in lines:
+                self.seconds = _match_time(line.decode("utf-8", errors="ignore"))
+                if self.seconds is not None:
+                    break
+        return self.seconds or 0
+
+
+def read_gcode_time(stream: IO[bytes]) -> int:
+    """Print time estimate from a binary gcode stream, reading head and tail only."""
+    scanner = GcodeTimeScanner()
+    while not scanner.head_scanned:
+        chunk = stream.read(GCODE_READ_SIZE)
+        if not chunk:
+            return scanner.finish()
+        scanner.feed(chunk)
+    if scanner.seconds is not None:
+        return scanner.seconds
+    if not stream.seekable():
+        while chunk := stream.read(GCODE_READ_SIZE):
+            scanner.feed(chunk)
+        return scanner.finish()
+    start = max(stream.seek(0, os.SEEK_END) - GCODE_TAIL_BYTES, 0)
+    stream.seek(start)
+    return scanner.finish(stream.read(), truncated=start > 0)
+
+
+class UploadTooLarge(Exception):
+    """The upload exceeded the configured size limit."""
+
+
+@dataclass
+class StagedFile:
+    """An upload written to the incoming directory, not yet processed."""
+
+    path: Path
+    filename: str
+    size: int
+    sha256: str
+
+
+@dataclass
+class GarbageReport:
+    files_removed: int = 0
+    bytes_reclaimed: int = 0
+    cache_entries_pruned: int = 0
+
+    def to_dict(self) -> dict[str, int]:
+        return asdict(self)
 
 
 @dataclass
@@ -42,45 +185,61 @@ class PlateInfo:
 
 
 class FileHandler:
-    def __init__(self, hass: HomeAssistant) -> None:
+    def __init__(self, hass: HomeAssistant, timings: StageTimings | None = None) -> None:
         self._hass = hass
+        self._timings = timings or StageTimings()
         self._storage_path = Path(hass.config.path(".storage", "printassist", "files"))
         self._gcode_path = Path(hass.config.path(".storage", "printassist", "gcode"))
         self._thumbnail_path = Path(hass.config.path("www", "printassist", "thumbnails"))
+        self._incoming_path = Path(hass.config.path(".storage", "printassist", "incoming"))
         self._storage_path.mkdir(parents=True, exist_ok=True)
         self._gcode_path.mkdir(parents=True, exist_ok=True)
         self._thumbnail_path.mkdir(parents=True, exist_ok=True)
-
-    def _parse_time_from_gcode(self, content: str) -> int:
-        lines = content.split("\n")[:500]
-        for line in lines:
-            match = TIME_HMS_PATTERN.search(line)
-            if match:
-                days = int(match.group(1) or 0)
-                hours = int(match.group(2) or 0)
-                minutes = int(match.group(3) or 0)
-                seconds = int(match.group(4) or 0)
-                return days * 86400 + hours * 3600 + minutes * 60 + seconds
-
-            for pattern in GCODE_TIME_PATTERNS:
-                match = pattern.search(line)
-                if match:
-                    return int(match.group(1))
-        return 0
-
-    def _extract_plate_name(self, zf: zipfile.ZipFile, plate_num: int) -> str:
-        json_path = f"Metadata/plate_{plate_num}.json"
+        self._incoming_path.mkdir(parents=True, exist_ok=True)
+        self._parse_cache_store: Store = Store(
+            hass, PARSE_CACHE_STORAGE_VERSION, PARSE_CACHE_STORAGE_KEY
+        )
+        self._parse_cache: dict[str, list[dict[str, Any]]] = {}
+        self._gc_lock = asyncio.Lock()
+
+    @property
+    def incoming_path(self) -> Path:
+        return self._incoming_path
+
+    async def async_stage_upload(
+        self,
+        filename: str,
+        chunks: AsyncIterator[bytes],
+        max_size: int = MAX_UPLOAD_SIZE,
+    ) -> StagedFile:
+        """Write an upload to disk chunk by chunk, hashing it on the way.
+
+        Raises UploadTooLarge once more than ``max_size`` bytes arrived; the
+        partial file is removed.
+        """
+        fd, name = await self._hass.async_add_executor_job(
+            tempfile.mkstemp, ".part", "upload-", str(self._incoming_path)
+        )
+        path = Path(name)
+        handle = os.fdopen(fd, "wb")
+        hasher = hashlib.sha256()
+        size = 0
         try:
-            data = json.loads(zf.read(json_path).decode("utf-8"))
-            if "bbox_objects" in data and data["bbox_objects"]:
-                return data["bbox_objects"][0].get("name", f"Plate {plate_num}")
-        except (KeyError, json.JSONDecodeError, UnicodeDecodeError):
-            pass
-        return f"Plate {plate_num}"
-
-    def _extract_plate_thumbnail(
-        self, zf: zipfile.ZipFile, plate_num: int, plate_id: str
-    ) -> str | None:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLarge(f"{filename} exceeds {max_size} bytes")
+                await self._hass.async_add_executor_job(_write_chunk, handle, hasher, chunk)
+            await self._hass.async_add_executor_job(handle.close)
+        except BaseException:
+            await self._hass.async_add_executor_job(_discard, handle, path)
+            raise
+        return StagedFile(path, filename, size, hasher.hexdigest())
+
+    async def async_discard_staged(self, staged: StagedFile) -> None:
+        await self._hass.async_add_executor_job(staged.path.unlink, True)
+
+    def _extract_plate_thumbnail(self, zf: zipfile.ZipFile, plate_num: int) -> str | None:
         thumbnail_candidates = [
             f"Metadata/plate_{plate_num}.png",
             f".thumbnails/plate_{plate_num}.png",
@@ -88,17 +247,66 @@ class FileHandler:
         for thumbnail_path in thumbnail_candidates:
             try:
                 thumbnail_data = zf.read(thumbnail_path)
-                output_path = self._thumbnail_path / f"{plate_id}.png"
-                output_path.write_bytes(thumbnail_data)
-                return f"/local/printassist/thumbnails/{plate_id}.png"
             except KeyError:
                 continue
+            digest = hashlib.sha256(thumbnail_data).hexdigest()
+            output_path = self._thumbnail_path / f"{digest}.png"
+            if not _touch(output_path):
+                _write_atomic(output_path, thumbnail_data)
+            return f"{THUMBNAIL_URL}/{digest}.png"
         return None
 
-    def _save_gcode(self, content: bytes, gcode_id: str) -> str:
-        gcode_file = self._gcode_path / f"{gcode_id}.gcode"
-        gcode_file.write_bytes(content)
-        return gcode_id
+    def _thumbnail_file(self, url: str) -> Path:
+        return self._thumbnail_path / url.rsplit("/", 1)[-1]
+
+    def _source_file(self, sha256: str, filename: str) -> Path:
+        return self._storage_path / f"{sha256}{Path(filename).suffix.lower()}"
+
+    def _compress_gcode(self, src: IO[bytes], scanner: GcodeTimeScanner | None) -> str:
+        """Gzip a gcode stream into the store under the SHA-256 of its content.
+
+        Returns the digest; ``scanner``, if given, sees the uncompressed chunks.
+        """
+        hasher = hashlib.sha256()
+        fd, name = tempfile.mkstemp(".part", "gcode-", str(self._gcode_path))
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(
+                fileobj=raw, mode="wb", compresslevel=GCODE_COMPRESSLEVEL, mtime=0
+            ) as dst:
+                while chunk := src.read(UPLOAD_CHUNK_SIZE):
+                    _write_chunk(dst, hasher, chunk)
+                    if scanner is not None:
+                        scanner.feed(chunk)
+            digest = hasher.hexdigest()
+            _keep_unique(Path(name), self._gcode_file(digest))
+        except BaseException:
+            Path(name).unlink(missing_ok=True)
+            raise
+        return digest
+
+    def _extract_gcode(
+        self, zf: zipfile.ZipFile, member: str, scan: bool = True
+    ) -> tuple[str, int]:
+        """Stream a gcode member into the store; returns its digest and time estimate."""
+        scanner = GcodeTimeScanner() if scan else None
+        with zf.open(member) as src:
+            digest = self._compress_gcode(src, scanner)
+        return digest, scanner.finish() if scanner is not None else 0
+
+    def _store_gcode(self, source: bytes | Path, filename: str, sha256: str) -> None:
+        stored = self._stored_gcode(sha256)
+        if stored is None or not _touch(stored):
+            with _open_stream(source) as src:
+                self._compress_gcode(src, None)
+        if isinstance(source, Path):
+            source.unlink(missing_ok=True)
+
+    def _store_source(self, source: bytes | Path, filename: str, sha256: str) -> None:
+        source_path = self._source_file(sha256, filename)
+        if isinstance(source, Path):
+            _keep_unique(source, source_path)
+        elif not _touch(source_path):
+            _write_atomic(source_path, source)
 
     def _find_gcode_files(self, zf: zipfile.ZipFile) -> list[tuple[int, str]]:
         found: dict[int, str] = {}
@@ -117,101 +325,433 @@ class FileHandler:
 
         return sorted(found.items())
 
+    async def async_load(self) -> None:
+        self._parse_cache = await self._parse_cache_store.async_load() or {}
+
+    def _cached_templates(self, sha256: str) -> list[dict[str, Any]] | None:
+        """Cached parse result, if every file it points to is still stored."""
+        templates = self._parse_cache.get(sha256)
+        if templates is None:
+            return None
+        # Touching the files keeps the garbage collector off them until the
+        # new plates are stored.
+        for template in templates:
+            gcode = self._stored_gcode(template["gcode_path"])
+            if gcode is None or not _touch(gcode):
+                return None
+            thumbnail = template.get("thumbnail_path")
+            if thumbnail and not _touch(self._thumbnail_file(thumbnail)):
+                return None
+        return templates
+
+    def _cache_templates(self, sha256: str, templates: list[dict[str, Any]]) -> None:
+        self._parse_cache[sha256] = templates
+        self._schedule_cache_save()
+
+    def _schedule_cache_save(self) -> None:
+        self._parse_cache_store.async_delay_save(
+            lambda: self._parse_cache, PARSE_CACHE_SAVE_DELAY
+        )
+
+    async def _async_process(
+        self,
+        source: bytes | Path,
+        project_id: str,
+        filename: str,
+        sha256: str | None,
+        extract: Callable[[bytes | Path, str, str], Awaitable[list[dict[str, Any]]]],
+        store: Callable[[bytes | Path, str, str], None],
+    ) -> list[Plate]:
+        """Plates for a file, extracting it only if its hash was not seen before."""
+        if sha256 is None:
+            sha256 = await self._hass.async_add_executor_job(_hash_source, source)
+        templates = await self._hass.async_add_executor_job(self._cached_templates, sha256)
+        if templates is None:
+            templates = await extract(source, filename, sha256)
+            if templates:
+                self._cache_templates(sha256, templates)
+        else:
+            _LOGGER.debug("Reusing parsed plates of %s (%s)", filename, sha256)
+        await self._hass.async_add_executor_job(store, source, filename, sha256)
+        return [_plate_from_template(t, project_id, filename, sha256) for t in templates]
+
     async def process_3mf(
-        self, file_content: bytes, project_id: str, filename: str
+        self,
+        source: bytes | Path,
+        project_id: str,
+        filename: str,
+        sha256: str | None = None,
     ) -> list[Plate]:
-        def _process() -> list[Plate]:
-            plates: list[Plate] = []
+        return await self._async_process(
+            source, project_id, filename, sha256, self._extract_3mf, self._store_source
+        )
+
+    async def _extract_3mf(
+        self, source: bytes | Path, filename: str, sha256: str
+    ) -> list[dict[str, Any]]:
+        """Extract all plates, each plate in its own executor job.
+
+        Every job opens the archive independently, so plates are decompressed
+        in parallel (up to ``PLATE_EXTRACTION_WORKERS`` at a time); the result
+        keeps plate order.
+        """
+
+        def _index() -> tuple[list[tuple[int, str]], dict[int, PlateMetadata]]:
+            with zipfile.ZipFile(_open_source(source)) as zf:
+                return self._find_gcode_files(zf), read_3mf_metadata(zf)
+
+        def _extract(
+            plate_num: int, gcode_path: str, meta: PlateMetadata
+        ) -> dict[str, Any] | None:
             try:
-                with zipfile.ZipFile(io.BytesIO(file_content)) as zf:
-                    gcode_files = self._find_gcode_files(zf)
-
-                    for plate_num, gcode_path in gcode_files:
-                        gcode_id = f"{project_id}_{plate_num}"
-
-                        try:
-                            gcode_content = zf.read(gcode_path)
-                        except KeyError:
-                            _LOGGER.warning("Could not read gcode: %s", gcode_path)
-                            continue
-
-                        self._save_gcode(gcode_content, gcode_id)
-                        estimated_time = self._parse_time_from_gcode(
-                            gcode_content.decode("utf-8", errors="ignore")
-                        )
-                        plate_name = self._extract_plate_name(zf, plate_num)
-
-                        plate = Plate.create(
-                            project_id=project_id,
-                            source_filename=filename,
-                            plate_number=plate_num,
-                            name=plate_name,
-                            gcode_path=gcode_id,
-                            estimated_duration_seconds=estimated_time,
-                        )
-
-                        thumbnail_url = self._extract_plate_thumbnail(zf, plate_num, plate.id)
-                        if thumbnail_url:
-                            plate.thumbnail_path = thumbnail_url
-
-                        plates.append(plate)
-
+                with zipfile.ZipFile(_open_source(source)) as zf:
+                    gcode_id, scanned_time = self._extract_gcode(
+                        zf, gcode_path, scan=not meta.prediction_seconds
+                    )
+                    return {
+                        "plate_number": plate_num,
+                        "name": meta.name or f"Plate {plate_num}",
+                        "gcode_path": gcode_id,
+                        "estimated_duration_seconds": meta.prediction_seconds or scanned_time,
+                        "thumbnail_path": self._extract_plate_thumbnail(zf, plate_num),
+                        "filament_weight_grams": meta.weight_grams,
+                        "filament_types": meta.filament_types,
+                        "printer_model": meta.printer_model,
+                        "object_count": meta.object_count,
+                    }
+            except KeyError:
+                _LOGGER.warning("Could not read gcode: %s", gcode_path)
             except zipfile.BadZipFile:
-                _LOGGER.error("Invalid 3MF file: %s", filename)
+                _LOGGER.error("Invalid gcode %s in %s", gcode_path, filename)
+            return None
+
+        try:
+            gcode_files, metadata = await self._hass.async_add_executor_job(_index)
+        except zipfile.BadZipFile:
+            _LOGGER.error("Invalid 3MF file: %s", filename)
+            gcode_files, metadata = [], {}
 
-            source_path = self._storage_path / filename
-            source_path.write_bytes(file_content)
+        semaphore = asyncio.Semaphore(PLATE_EXTRACTION_WORKERS)
 
-            return plates
+        async def _bounded(plate_num: int, gcode_path: str) -> dict[str, Any] | None:
+            meta = metadata.get(plate_num) or PlateMetadata(plate_num)
+            async with semaphore:
+                return await self._hass.async_add_executor_job(
+                    _extract, plate_num, gcode_path, meta
+                )
 
-        return await self._hass.async_add_executor_job(_process)
+        results = await asyncio.gather(*(_bounded(*item) for item in gcode_files))
+        return [template for template in results if template is not None]
 
     async def process_gcode(
-        self, file_content: bytes, project_id: str, filename: str
+        self,
+        source: bytes | Path,
+        project_id: str,
+        filename: str,
+        sha256: str | None = None,
     ) -> list[Plate]:
-        def _process() -> list[Plate]:
-            gcode_id = f"{project_id}_1"
-            self._save_gcode(file_content, gcode_id)
-
-            content = file_content.decode("utf-8", errors="ignore")
-            estimated_time = self._parse_time_from_gcode(content)
-
-            name = Path(filename).stem
-            plate = Plate.create(
-                project_id=project_id,
-                source_filename=filename,
-                plate_number=1,
-                name=name,
-                gcode_path=gcode_id,
-                estimated_duration_seconds=estimated_time,
-            )
-            return [plate]
-
-        return await self._hass.async_add_executor_job(_process)
+        # A gcode upload is its own plate's gcode, so it is stored only once.
+        return await self._async_process(
+            source, project_id, filename, sha256, self._extract_gcode_file, self._store_gcode
+        )
+
+    async def _extract_gcode_file(
+        self, source: bytes | Path, filename: str, sha256: str
+    ) -> list[dict[str, Any]]:
+        def _read_time() -> int:
+            with _open_stream(source) as f:
+                return read_gcode_time(f)
+
+        return [{
+            "plate_number": 1,
+            "name": Path(filename).stem,
+            "gcode_path": sha256,
+            "estimated_duration_seconds": await self._hass.async_add_executor_job(_read_time),
+        }]
 
     async def process_file(
-        self, file_content: bytes, project_id: str, filename: str
+        self,
+        source: bytes | Path,
+        project_id: str,
+        filename: str,
+        sha256: str | None = None,
     ) -> list[Plate]:
+        """Extract plates from file content or a staged file, which is consumed.
+
+        ``sha256`` is the content digest if the caller already has it.
+        """
         lower_name = filename.lower()
-        if lower_name.endswith(".3mf"):
-            return await self.process_3mf(file_content, project_id, filename)
-        elif lower_name.endswith(".gcode"):
-            return await self.process_gcode(file_content, project_id, filename)
-        else:
-            _LOGGER.warning("Unsupported file type: %s", filename)
-            return []
-
-    async def delete_plate_files(self, plate: Plate) -> None:
-        def _delete() -> None:
-            gcode_file = self._gcode_path / f"{plate.gcode_path}.gcode"
-            if gcode_file.exists():
-                gcode_file.unlink()
-            if plate.thumbnail_path:
-                thumbnail_file = self._thumbnail_path / f"{plate.id}.png"
-                if thumbnail_file.exists():
-                    thumbnail_file.unlink()
-
-        await self._hass.async_add_executor_job(_delete)
-
-    def get_gcode_path(self, gcode_id: str) -> Path:
-        return self._gcode_path / f"{gcode_id}.gcode"
+        with self._timings.measure(STAGE_FILE_PROCESSING):
+            if lower_name.endswith(".3mf"):
+                return await self.process_3mf(source, project_id, filename, sha256)
+            elif lower_name.endswith(".gcode"):
+                return await self.process_gcode(source, project_id, filename, sha256)
+        _LOGGER.warning("Unsupported file type: %s", filename)
+        return []
+
+    async def async_release_files(
+        self, plates: Iterable[Plate], references: FileReferences
+    ) -> None:
+        """Delete the files of removed plates that no remaining plate uses.
+
+        ``references`` must be taken from the store after the plates were removed.
+        As in garbage collection, files written or reused within
+        ``GC_MIN_FILE_AGE`` are kept: an identical upload in flight may be about
+        to reference them. The periodic collection removes them later.
+        """
+        cutoff = time.time() - GC_MIN_FILE_AGE.total_seconds()
+
+        def _release() -> list[str]:
+            released = []
+            for plate in plates:
+                if plate.gcode_path not in references.gcode:
+                    _unlink_before(self._gcode_file(plate.gcode_path), cutoff)
+                    _unlink_before(self._legacy_gcode_file(plate.gcode_path), cutoff)
+                if plate.thumbnail_path and plate.thumbnail_path not in references.thumbnails:
+                    _unlink_before(self._thumbnail_file(plate.thumbnail_path), cutoff)
+                if (
+                    plate.source_hash
+                    and plate.source_hash not in references.sources
+                    and _unlink_before(
+                        self._source_file(plate.source_hash, plate.source_filename), cutoff
+                    )
+                ):
+                    released.append(plate.source_hash)
+            return released
+
+        async with self._gc_lock:
+            released = await self._hass.async_add_executor_job(_release)
+        for sha256 in released:
+            if self._parse_cache.pop(sha256, None) is not None:
+                self._schedule_cache_save()
+
+    def _find_orphans(self, references: FileReferences, cutoff: float) -> list[Path]:
+        """Stored files no plate references, last modified before ``cutoff``."""
+        gcode = set(references.gcode)
+        thumbnails = {url.rsplit("/", 1)[-1] for url in references.thumbnails}
+        sources = set(references.sources)
+        legacy_sources = set(references.legacy_sources)
+
+        def gcode_referenced(name: str) -> bool:
+            for suffix in (GCODE_SUFFIX, LEGACY_GCODE_SUFFIX):
+                if name.endswith(suffix):
+                    return name[: -len(suffix)] in gcode
+            return False
+
+        checks: list[tuple[Path, Callable[[str], bool]]] = [
+            (self._gcode_path, gcode_referenced),
+            (self._thumbnail_path, thumbnails.__contains__),
+            (
+                self._storage_path,
+                lambda name: name in legacy_sources or name.partition(".")[0] in sources,
+            ),
+            (self._incoming_path, lambda name: False),
+        ]
+        orphans = []
+        for directory, referenced in checks:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if (
+                        entry.is_file(follow_symlinks=False)
+                        and not referenced(entry.name)
+                        and entry.stat().st_mtime < cutoff
+                    ):
+                        orphans.append(Path(entry.path))
+        return orphans
+
+    async def async_collect_garbage(self, references: FileReferences) -> GarbageReport:
+        """Delete stored files that no plate references and prune the parse cache.
+
+        ``references`` must come from the current store snapshot. Files written
+        within ``GC_MIN_FILE_AGE`` are kept, since uploads store their files
+        before their plates reach the store.
+        """
+        report = GarbageReport()
+        async with self._gc_lock:
+            cutoff = time.time() - GC_MIN_FILE_AGE.total_seconds()
+            orphans = await self._hass.async_add_executor_job(
+                self._find_orphans, references, cutoff
+            )
+            for start in range(0, len(orphans), GC_BATCH_SIZE):
+                removed, reclaimed = await self._hass.async_add_executor_job(
+                    _delete_files, orphans[start:start + GC_BATCH_SIZE]
+                )
+                report.files_removed += removed
+                report.bytes_reclaimed += reclaimed
+
+            stale = [sha256 for sha256 in self._parse_cache if sha256 not in references.sources]
+            for sha256 in stale:
+                del self._parse_cache[sha256]
+            if stale:
+                self._schedule_cache_save()
+            report.cache_entries_pruned = len(stale)
+
+        if report.files_removed:
+            _LOGGER.info(
+                "Removed %d orphaned files (%d bytes)",
+                report.files_removed,
+                report.bytes_reclaimed,
+            )
+        return report
+
+    def get_disk_usage(self) -> dict[str, dict[str, int]]:
+        """File count and bytes per storage directory. Run in the executor."""
+        return {
+            "sources": _directory_usage(self._storage_path),
+            "gcode": _directory_usage(self._gcode_path),
+            "thumbnails": _directory_usage(self._thumbnail_path),
+        }
+
+    def _gcode_file(self, gcode_id: str) -> Path:
+        return self._gcode_path / f"{gcode_id}{GCODE_SUFFIX}"
+
+    def _legacy_gcode_file(self, gcode_id: str) -> Path:
+        # Gcode was stored uncompressed before compression was introduced.
+        return self._gcode_path / f"{gcode_id}{LEGACY_GCODE_SUFFIX}"
+
+    def _stored_gcode(self, gcode_id: str) -> Path | None:
+        for path in (self._gcode_file(gcode_id), self._legacy_gcode_file(gcode_id)):
+            if path.exists():
+                return path
+        return None
+
+    def has_gcode(self, gcode_id: str) -> bool:
+        return self._stored_gcode(gcode_id) is not None
+
+    def open_gcode(self, gcode_id: str) -> IO[bytes]:
+        """Open stored gcode for reading, decompressed. Run in the executor.
+
+        Raises FileNotFoundError if the gcode is not stored.
+        """
+        path = self._stored_gcode(gcode_id)
+        if path is None:
+            raise FileNotFoundError(f"No gcode stored for {gcode_id}")
+        if path.name.endswith(GCODE_SUFFIX):
+            return gzip.open(path, "rb")
+        return path.open("rb")
+
+    async def async_read_gcode(
+        self, gcode_id: str, chunk_size: int = UPLOAD_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """Yield stored gcode in decompressed chunks, reading off the event loop."""
+        handle = await self._hass.async_add_executor_job(self.open_gcode, gcode_id)
+        try:
+            while chunk := await self._hass.async_add_executor_job(handle.read, chunk_size):
+                yield chunk
+        finally:
+            await self._hass.async_add_executor_job(handle.close)
+
+
+def _plate_from_template(
+    template: dict[str, Any], project_id: str, filename: str, source_hash: str
+) -> Plate:
+    plate = Plate.create(
+        project_id=project_id,
+        source_filename=filename,
+        plate_number=template["plate_number"],
+        name=template["name"],
+        gcode_path=template["gcode_path"],
+        estimated_duration_seconds=template["estimated_duration_seconds"],
+        thumbnail_path=template.get("thumbnail_path"),
+    )
+    plate.filament_weight_grams = template.get("filament_weight_grams")
+    plate.filament_types = list(template.get("filament_types") or [])
+    plate.printer_model = template.get("printer_model")
+    plate.object_count = template.get("object_count")
+    plate.source_hash = source_hash
+    return plate
+
+
+def _hash_source(source: bytes | Path) -> str:
+    if not isinstance(source, Path):
+        return hashlib.sha256(source).hexdigest()
+    hasher = hashlib.sha256()
+    with source.open("rb") as f:
+        while chunk := f.read(UPLOAD_CHUNK_SIZE):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _keep_unique(path: Path, target: Path) -> None:
+    """Move ``path`` to ``target`` unless identical content is stored there."""
+    if _touch(target):
+        path.unlink()
+    else:
+        shutil.move(path, target)
+
+
+def _delete_files(paths: list[Path]) -> tuple[int, int]:
+    removed = reclaimed = 0
+    for path in paths:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            continue
+        removed += 1
+        reclaimed += size
+    return removed, reclaimed
+
+
+def _unlink_before(path: Path, cutoff: float) -> bool:
+    """Delete ``path`` if it was last modified before ``cutoff``."""
+    try:
+        if path.stat().st_mtime >= cutoff:
+            return False
+        path.unlink()
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _touch(path: Path) -> bool:
+    """Refresh the modification time of ``path``; False if it does not exist."""
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _write_atomic(target: Path, data: bytes) -> None:
+    fd, name = tempfile.mkstemp(".part", "write-", str(target.parent))
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(name, target)
+
+
+def _open_source(source: bytes | Path) -> Path | IO[bytes]:
+    return source if isinstance(source, Path) else io.BytesIO(source)
+
+
+def _open_stream(source: bytes | Path) -> IO[bytes]:
+    return source.open("rb") if isinstance(source, Path) else io.BytesIO(source)
+
+
+def _write_chunk(handle: IO[bytes], hasher: Any, chunk: bytes) -> None:
+    handle.write(chunk)
+    hasher.update(chunk)
+
+
+def _discard(handle: IO[bytes], path: Path) -> None:
+    handle.close()
+    path.unlink(missing_ok=True)
+
+
+def _directory_usage(path: Path) -> dict[str, int]:
+    files = 0
+    total = 0
+    pending = [path]
+    while pending:
+        try:
+            entries = os.scandir(pending.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(Path(entry.path))
+                elif entry.is_file(follow_symlinks=False):
+                    files += 1
+                    total += entry.stat(follow_symlinks=False).st_size
+    return {"files": files, "bytes": total}
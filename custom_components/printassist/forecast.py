@@ -0,0 +1,149 @@
+"""Monte Carlo completion forecasting for PrintAssist."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .const import JOB_STATUS_COMPLETED, JOB_STATUS_FAILED
+from .scheduler import _parse_datetime
+
+if TYPE_CHECKING:
+    from .scheduler import ScheduleResult
+    from .store import Job, UnavailabilityWindow
+
+FORECAST_SAMPLES = 2000
+FORECAST_SEED = 0
+DURATION_SIGMA = 0.1
+PRIOR_FAILURE_RATE = 0.05
+PRIOR_WEIGHT = 10
+MAX_ATTEMPTS = 5
+
+
+@dataclass
+class ForecastResult:
+    """P50/P90 completion times keyed by job id and project id."""
+
+    jobs: dict[str, tuple[datetime, datetime]]
+    projects: dict[str, tuple[datetime, datetime]]
+    samples: int
+
+
+def failure_rates(jobs: list[Job]) -> dict[str, float]:
+    """Per-plate failure probability from job history, smoothed towards a prior."""
+    attempts: dict[str, int] = {}
+    failures: dict[str, int] = {}
+    for job in jobs:
+        if job.status not in (JOB_STATUS_COMPLETED, JOB_STATUS_FAILED):
+            continue
+        attempts[job.plate_id] = attempts.get(job.plate_id, 0) + 1
+        if job.status == JOB_STATUS_FAILED:
+            failures[job.plate_id] = failures.get(job.plate_id, 0) + 1
+    return {
+        plate_id: (failures.get(plate_id, 0) + PRIOR_FAILURE_RATE * PRIOR_WEIGHT)
+        / (count + PRIOR_WEIGHT)
+        for plate_id, count in attempts.items()
+    }
+
+
+def _merge_windows(
+    windows: list[UnavailabilityWindow],
+) -> tuple[np.ndarray, np.ndarray]:
+    spans = sorted(
+        (_parse_datetime(w.start).timestamp(), _parse_datetime(w.end).timestamp())
+        for w in windows
+    )
+    merged: list[list[float]] = []
+    for start, end in spans:
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    starts = np.array([m[0] for m in merged], dtype=np.float64)
+    ends = np.array([m[1] for m in merged], dtype=np.float64)
+    return starts, ends
+
+
+def _push_out_of_windows(t: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Move start times that fall inside an unavailability window to its end."""
+    if not len(starts):
+        return t
+    idx = np.searchsorted(starts, t, side="right") - 1
+    safe_idx = np.maximum(idx, 0)
+    inside = (idx >= 0) & (t < ends[safe_idx])
+    return np.where(inside, ends[safe_idx], t)
+
+
+def _to_datetimes(values: np.ndarray) -> tuple[datetime, datetime]:
+    p50, p90 = np.percentile(values, [50, 90])
+    return (
+        datetime.fromtimestamp(float(p50), timezone.utc),
+        datetime.fromtimestamp(float(p90), timezone.utc),
+    )
+
+
+def forecast_schedule(
+    schedule: ScheduleResult,
+    project_by_plate: dict[str, str],
+    failure_rate_by_plate: dict[str, float],
+    unavailability_windows: list[UnavailabilityWindow],
+    queued_by_project: dict[str, int] | None = None,
+    samples: int = FORECAST_SAMPLES,
+    duration_sigma: float = DURATION_SIGMA,
+    seed: int = FORECAST_SEED,
+) -> ForecastResult:
+    """Simulate the scheduled job order under duration noise and failures.
+
+    Every sample walks the schedule in order. A job (or its retry after a
+    failure) can only start while the operator is available; actual durations
+    are log-normal around the estimate and a failed attempt burns a uniform
+    fraction of it. All samples advance together as numpy vectors, so cost is
+    linear in the number of jobs. Jobs beyond the schedule horizon are not
+    part of the schedule and therefore not forecast; a project with fewer
+    scheduled jobs than ``queued_by_project`` lists gets no forecast.
+    """
+    rng = np.random.default_rng(seed)
+    starts, ends = _merge_windows(unavailability_windows)
+    cursor = np.full(samples, schedule.cursor_at_computation.timestamp())
+
+    jobs: dict[str, tuple[datetime, datetime]] = {}
+    project_ends: dict[str, np.ndarray] = {}
+    scheduled: dict[str, int] = {}
+    for sj in schedule.jobs:
+        rate = failure_rate_by_plate.get(sj.plate_id, PRIOR_FAILURE_RATE)
+        duration = float(sj.estimated_duration_seconds)
+        pending = np.ones(samples, dtype=bool)
+        for attempt in range(MAX_ATTEMPTS):
+            start = _push_out_of_windows(cursor, starts, ends)
+            actual = duration * rng.lognormal(0.0, duration_sigma, samples)
+            failed = pending & (rng.random(samples) < rate)
+            if attempt == MAX_ATTEMPTS - 1:
+                failed[:] = False
+            spent = np.where(failed, actual * rng.random(samples), actual)
+            cursor = np.where(pending, start + spent, cursor)
+            pending = failed
+            if not pending.any():
+                break
+
+        jobs[sj.job_id] = _to_datetimes(cursor)
+        project_id = project_by_plate.get(sj.plate_id)
+        if project_id is not None:
+            scheduled[project_id] = scheduled.get(project_id, 0) + 1
+            previous = project_ends.get(project_id)
+            project_ends[project_id] = (
+                cursor if previous is None else np.maximum(previous, cursor)
+            )
+
+    if queued_by_project is not None:
+        project_ends = {
+            pid: values
+            for pid, values in project_ends.items()
+            if scheduled[pid] >= queued_by_project.get(pid, 0)
+        }
+    return ForecastResult(
+        jobs=jobs,
+        projects={pid: _to_datetimes(values) for pid, values in project_ends.items()},
+        samples=samples,
+    )
@@ -0,0 +1,102 @@
+"""Per-plate metadata from the small config entries of sliced 3MF files."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import json
+import logging
+import math
+import re
+import zipfile
+from xml.etree import ElementTree
+
+_LOGGER = logging.getLogger(__name__)
+
+SLICE_INFO_PATH = "Metadata/slice_info.config"
+PLATE_JSON_PATTERN = re.compile(r"^Metadata/plate_(\d+)\.json$", re.IGNORECASE)
+
+
+@dataclass
+class PlateMetadata:
+    plate_number: int
+    name: str | None = None
+    prediction_seconds: int | None = None
+    weight_grams: float | None = None
+    filament_types: list[str] = field(default_factory=list)
+    printer_model: str | None = None
+    object_count: int | None = None
+
+
+def _float(value: str | None) -> float | None:
+    try:
+        number = float(value) if value is not None else None
+    except ValueError:
+        return None
+    return number if number is not None and math.isfinite(number) else None
+
+
+def _int(value: str | None) -> int | None:
+    number = _float(value)
+    return int(number) if number is not None else None
+
+
+def _read_slice_info(zf: zipfile.ZipFile, plates: dict[int, PlateMetadata]) -> None:
+    try:
+        root = ElementTree.fromstring(zf.read(SLICE_INFO_PATH))
+    except KeyError:
+        return
+    except ElementTree.ParseError as err:
+        _LOGGER.debug("Unreadable %s: %s", SLICE_INFO_PATH, err)
+        return
+
+    for plate_el in root.iter("plate"):
+        values = {m.get("key"): m.get("value") for m in plate_el.iter("metadata")}
+        index = _int(values.get("index"))
+        if index is None:
+            continue
+        meta = plates.setdefault(index, PlateMetadata(index))
+        meta.prediction_seconds = _int(values.get("prediction")) or None
+        meta.weight_grams = _float(values.get("weight"))
+        meta.printer_model = values.get("printer_model_id") or None
+
+        objects = plate_el.findall("object")
+        if objects:
+            meta.object_count = len(objects)
+            meta.name = objects[0].get("name") or meta.name
+        types = (f.get("type") for f in plate_el.findall("filament"))
+        meta.filament_types = list(dict.fromkeys(t for t in types if t))
+
+
+def _read_plate_json(zf: zipfile.ZipFile, plates: dict[int, PlateMetadata]) -> None:
+    for name in zf.namelist():
+        match = PLATE_JSON_PATTERN.match(name)
+        if not match:
+            continue
+        index = int(match.group(1))
+        try:
+            data = json.loads(zf.read(name).decode("utf-8"))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+        if not isinstance(data, dict):
+            continue
+        objects = data.get("bbox_objects")
+        if not isinstance(objects, list):
+            continue
+        objects = [obj for obj in objects if isinstance(obj, dict)]
+        if not objects:
+            continue
+        meta = plates.setdefault(index, PlateMetadata(index))
+        meta.name = objects[0].get("name") or meta.name
+        meta.object_count = len(objects)
+
+
+def read_3mf_metadata(zf: zipfile.ZipFile) -> dict[int, PlateMetadata]:
+    """Metadata per plate number, read once per archive.
+
+    ``plate_N.json`` lists every object placed on the plate, so it decides
+    the name and object count; ``slice_info.config`` adds the slicer's
+    prediction, weight, filaments and printer model for sliced plates.
+    """
+    plates: dict[int, PlateMetadata] = {}
+    _read_slice_info(zf, plates)
+    _read_plate_json(zf, plates)
+    return plates
@@ -0,0 +1,166 @@
+"""Parallel heuristic portfolio for PrintAssist schedule search."""
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from functools import partial
+import importlib
+import logging
+import multiprocessing
+import os
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+from typing import TYPE_CHECKING, Any
+
+from .const import PORTFOLIO_IDLE_TIMEOUT, SCHEDULE_HEURISTICS
+from .schedule_worker import BOOTSTRAP, WORKER_PACKAGE
+from .scheduler import PrintScheduler, ScheduleResult
+
+if TYPE_CHECKING:
+    from .store import Job, Plate, Project, UnavailabilityWindow
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class ScheduleInputs:
+    """Picklable snapshot of everything PrintScheduler needs."""
+
+    queued_jobs: list[Job]
+    plates_by_id: dict[str, Plate]
+    unavailability_windows: list[UnavailabilityWindow]
+    current_time: datetime
+    active_job_end: datetime | None = None
+    projects_by_id: dict[str, Project] | None = None
+
+    def to_worker_kwargs(self) -> dict[str, Any]:
+        """PrintScheduler arguments holding only standard library types."""
+
+        def plain(record: Any) -> SimpleNamespace:
+            return SimpleNamespace(**asdict(record))
+
+        return {
+            "queued_jobs": [plain(j) for j in self.queued_jobs],
+            "plates_by_id": {k: plain(p) for k, p in self.plates_by_id.items()},
+            "unavailability_windows": [plain(w) for w in self.unavailability_windows],
+            "current_time": self.current_time,
+            "active_job_end": self.active_job_end,
+            "projects_by_id": {
+                k: plain(p) for k, p in (self.projects_by_id or {}).items()
+            },
+        }
+
+
+def _bootstrap_globals() -> dict[str, str]:
+    return {"name": WORKER_PACKAGE, "path": str(Path(__file__).parent)}
+
+
+def _worker_module() -> ModuleType:
+    exec(BOOTSTRAP, _bootstrap_globals())
+    return importlib.import_module(f"{WORKER_PACKAGE}.schedule_worker")
+
+
+# Resolved while the integration is imported, so runs never import on the loop.
+_worker_evaluate = _worker_module().evaluate
+
+
+def evaluate_heuristic(
+    inputs: ScheduleInputs, mode: str
+) -> tuple[tuple[int, int, float], ScheduleResult]:
+    """Build and score one schedule in this process."""
+    scheduler = PrintScheduler(
+        queued_jobs=inputs.queued_jobs,
+        plates_by_id=inputs.plates_by_id,
+        unavailability_windows=inputs.unavailability_windows,
+        current_time=inputs.current_time,
+        active_job_end=inputs.active_job_end,
+        projects_by_id=inputs.projects_by_id,
+        mode=mode,
+    )
+    result = scheduler.calculate_schedule()
+    return scheduler.score_schedule(result), result
+
+
+class SchedulePortfolio:
+    """Evaluates several scheduling heuristics concurrently and keeps the best.
+
+    Workers are started with the ``spawn`` method so they never inherit the
+    Home Assistant event loop or its threads. They import only the scheduler
+    (see ``schedule_worker``), are started on first use and are shut down
+    after ``PORTFOLIO_IDLE_TIMEOUT`` seconds without a run.
+    """
+
+    def __init__(
+        self,
+        heuristics: list[str] | None = None,
+        max_workers: int | None = None,
+    ) -> None:
+        self._heuristics = list(heuristics or SCHEDULE_HEURISTICS)
+        self._max_workers = max_workers or min(len(self._heuristics), os.cpu_count() or 1)
+        self._executor: ProcessPoolExecutor | None = None
+        self._running = 0
+        self._idle_handle: asyncio.TimerHandle | None = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=exec,
+                initargs=(BOOTSTRAP, _bootstrap_globals()),
+            )
+        return self._executor
+
+    async def async_run(self, inputs: ScheduleInputs) -> ScheduleResult:
+        loop = asyncio.get_running_loop()
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+        self._running += 1
+        try:
+            # Copying every record is proportional to the queue; keep it off the loop.
+            kwargs = await loop.run_in_executor(None, inputs.to_worker_kwargs)
+            executor = self._get_executor()
+            outcomes = await asyncio.gather(*(
+                loop.run_in_executor(executor, _worker_evaluate, kwargs, mode)
+                for mode in self._heuristics
+            ))
+        finally:
+            self._running -= 1
+            if not self._running:
+                self._idle_handle = loop.call_later(
+                    PORTFOLIO_IDLE_TIMEOUT, self._release_workers
+                )
+
+        # min() keeps the first of equal scores, so heuristic order breaks ties.
+        best_index = min(range(len(outcomes)), key=lambda i: outcomes[i][0])
+        score, result = outcomes[best_index]
+        _LOGGER.debug(
+            "Portfolio picked %s with score %s out of %s",
+            result["mode"], score, {o[1]["mode"]: o[0] for o in outcomes},
+        )
+        return ScheduleResult.from_dict(result)
+
+    def _release_workers(self) -> None:
+        self._idle_handle = None
+        if self._executor is not None and not self._running:
+            _LOGGER.debug("Stopping idle portfolio workers")
+            # Nothing is queued, so the workers exit without being waited on.
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    @property
+    def workers_running(self) -> bool:
+        return self._executor is not None
+
+    async def async_shutdown(self) -> None:
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.get_running_loop().run_in_executor(
+                None, partial(executor.shutdown, wait=True, cancel_futures=True)
+            )
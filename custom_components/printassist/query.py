@@ -0,0 +1,141 @@
+"""Filtered, paginated views over the PrintAssist panel payload."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import DEFAULT_QUERY_LIMIT
+from .delta import KEYED_COLLECTIONS
+
+
+class QueryError(ValueError):
+    """The query cannot be answered as asked."""
+
+
+class InvalidCursor(QueryError):
+    """The cursor item no longer matches the query; restart from the first page."""
+
+
+@dataclass(frozen=True)
+class QueryPage:
+    items: list[dict[str, Any]]
+    next_cursor: str | None
+    total: int
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"items": self.items, "next_cursor": self.next_cursor, "total": self.total}
+
+
+def _parse(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    parsed = dt_util.parse_datetime(value)
+    return dt_util.as_utc(parsed) if parsed else None
+
+
+def _in_range(value: str | None, start: datetime | None, end: datetime | None) -> bool:
+    moment = _parse(value)
+    if moment is None:
+        return False
+    return (start is None or moment >= start) and (end is None or moment < end)
+
+
+def _overlaps(
+    item_start: str | None, item_end: str | None, start: datetime | None, end: datetime | None
+) -> bool:
+    begins, ends = _parse(item_start), _parse(item_end)
+    if begins is None or ends is None:
+        return False
+    return (end is None or begins < end) and (start is None or ends > start)
+
+
+def _filter(
+    payload: dict[str, Any],
+    collection: str,
+    project_id: str | None,
+    statuses: Iterable[str] | None,
+    start: datetime | None,
+    end: datetime | None,
+) -> Iterator[dict[str, Any]]:
+    items: list[dict[str, Any]] = payload.get(collection, [])
+    timed = start is not None or end is not None
+
+    if statuses is not None and collection != "jobs":
+        raise QueryError("Status filters only apply to jobs")
+    if timed and collection == "plates":
+        raise QueryError("Plates have no time to filter on")
+
+    project_of_plate: dict[str, str] = {}
+    if project_id is not None and collection in ("jobs", "schedule"):
+        project_of_plate = {p["id"]: p["project_id"] for p in payload.get("plates", [])}
+    wanted = set(statuses) if statuses is not None else None
+
+    for item in items:
+        if project_id is not None:
+            if collection == "projects":
+                owner = item["id"]
+            elif collection == "plates":
+                owner = item["project_id"]
+            else:
+                owner = project_of_plate.get(item["plate_id"])
+            if owner != project_id:
+                continue
+        if wanted is not None and item["status"] not in wanted:
+            continue
+        if timed:
+            if collection == "schedule":
+                if not _overlaps(item["scheduled_start"], item["scheduled_end"], start, end):
+                    continue
+            elif collection == "jobs":
+                activity = item["ended_at"] or item["started_at"] or item["created_at"]
+                if not _in_range(activity, start, end):
+                    continue
+            elif not _in_range(item["created_at"], start, end):
+                continue
+        yield item
+
+
+def query_payload(
+    payload: dict[str, Any],
+    collection: str,
+    *,
+    project_id: str | None = None,
+    statuses: Iterable[str] | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = DEFAULT_QUERY_LIMIT,
+) -> QueryPage:
+    """One page of ``collection`` matching the filters, in payload order.
+
+    Jobs match the time range by their latest timestamp (ended, started or
+    created); schedule entries by overlap; projects by creation. The cursor is
+    the key of the last item of the previous page.
+    """
+    if collection not in KEYED_COLLECTIONS:
+        raise QueryError(f"Unknown collection: {collection}")
+    key = KEYED_COLLECTIONS[collection]
+    start = dt_util.as_utc(start) if start else None
+    end = dt_util.as_utc(end) if end else None
+
+    matches = list(_filter(payload, collection, project_id, statuses, start, end))
+    offset = 0
+    if cursor is not None:
+        for index, item in enumerate(matches):
+            if item[key] == cursor:
+                offset = index + 1
+                break
+        else:
+            raise InvalidCursor(f"Cursor {cursor} is not part of this result")
+
+    page = matches[offset:offset + limit]
+    has_more = offset + limit < len(matches)
+    return QueryPage(
+        items=page,
+        next_cursor=page[-1][key] if page and has_more else None,
+        total=len(matches),
+    )
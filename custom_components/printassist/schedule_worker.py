@@ -0,0 +1,40 @@
+"""Schedule evaluation inside portfolio worker processes.
+
+Workers never import the integration package: its ``__init__`` pulls in Home
+Assistant's HTTP, frontend and websocket stack. This module and the scheduler
+are loaded through ``WORKER_PACKAGE`` instead, a bare package over this
+directory whose ``__init__`` is never run, and only plain data crosses the
+process boundary.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from .scheduler import PrintScheduler
+
+WORKER_PACKAGE = "_printassist_worker"
+
+# Executed by every worker before its first task is unpickled, and by the
+# parent before it submits one, with ``name`` and ``path`` in its globals.
+BOOTSTRAP = """
+import sys
+import types
+
+if name not in sys.modules:
+    package = types.ModuleType(name)
+    package.__path__ = [path]
+    sys.modules[name] = package
+"""
+
+
+def evaluate(
+    inputs: dict[str, Any], mode: str
+) -> tuple[tuple[int, int, float], dict[str, Any]]:
+    """Build and score one schedule; returns the score and the serialized result.
+
+    ``inputs`` holds PrintScheduler's keyword arguments, with store records
+    passed as ``SimpleNamespace`` objects.
+    """
+    scheduler = PrintScheduler(mode=mode, **inputs)
+    result = scheduler.calculate_schedule()
+    return scheduler.score_schedule(result), result.to_dict()
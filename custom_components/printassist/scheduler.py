@@ -2,17 +2,28 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING
 
+from .const import (
+    SCHEDULE_MODE_DEADLINE,
+    SCHEDULE_MODE_KNAPSACK,
+    SCHEDULE_MODE_LONGEST_FIRST,
+    SCHEDULE_MODE_PRIORITY,
+    SCHEDULE_MODE_SHORTEST_FIRST,
+)
+
 if TYPE_CHECKING:
-    from .store import Plate, Job, UnavailabilityWindow
+    from .store import Plate, Job, Project, UnavailabilityWindow
 
 _LOGGER = logging.getLogger(__name__)
 
 LONG_UNAVAILABILITY_THRESHOLD = 3 * 3600
 SCHEDULE_HORIZON_DAYS = 7
+NO_DEADLINE = datetime.max.replace(tzinfo=timezone.utc)
+KNAPSACK_MAX_CANDIDATES = 64
+KNAPSACK_RESOLUTION_SECONDS = 60
 
 
 @dataclass
@@ -21,6 +32,33 @@ class ScheduleResult:
     computed_at: datetime
     cursor_at_computation: datetime
     next_breakpoint: datetime | None
+    lateness_by_project: dict[str, int] = field(default_factory=dict)
+    mode: str = SCHEDULE_MODE_PRIORITY
+
+    def to_dict(self) -> dict:
+        return {
+            "jobs": [sj.to_dict() for sj in self.jobs],
+            "computed_at": self.computed_at.isoformat(),
+            "cursor_at_computation": self.cursor_at_computation.isoformat(),
+            "next_breakpoint": (
+                self.next_breakpoint.isoformat() if self.next_breakpoint else None
+            ),
+            "lateness_by_project": self.lateness_by_project,
+            "mode": self.mode,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> ScheduleResult:
+        return cls(
+            jobs=[ScheduledJob.from_dict(sj) for sj in data["jobs"]],
+            computed_at=_parse_datetime(data["computed_at"]),
+            cursor_at_computation=_parse_datetime(data["cursor_at_computation"]),
+            next_breakpoint=(
+                _parse_datetime(data["next_breakpoint"]) if data.get("next_breakpoint") else None
+            ),
+            lateness_by_project=data.get("lateness_by_project", {}),
+            mode=data.get("mode", SCHEDULE_MODE_PRIORITY),
+        )
 
 
 def _make_aware(dt: datetime) -> datetime:
@@ -48,6 +86,24 @@ class ScheduledJob:
     estimated_duration_seconds: int
     spans_unavailability: bool
     thumbnail_path: str | None = None
+    due_date: datetime | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            **asdict(self),
+            "scheduled_start": self.scheduled_start.isoformat(),
+            "scheduled_end": self.scheduled_end.isoformat(),
+            "due_date": self.due_date.isoformat() if self.due_date else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> ScheduledJob:
+        return cls(**{
+            **data,
+            "scheduled_start": _parse_datetime(data["scheduled_start"]),
+            "scheduled_end": _parse_datetime(data["scheduled_end"]),
+            "due_date": _parse_datetime(data["due_date"]) if data.get("due_date") else None,
+        })
 
 
 class PrintScheduler:
@@ -60,13 +116,32 @@ class PrintScheduler:
         unavailability_windows: list[UnavailabilityWindow],
         current_time: datetime | None = None,
         active_job_end: datetime | None = None,
+        projects_by_id: dict[str, Project] | None = None,
+        mode: str = SCHEDULE_MODE_PRIORITY,
     ) -> None:
         self._queued_jobs = queued_jobs
         self._plates = plates_by_id
+        self._mode = mode
         self._now = _make_aware(current_time) if current_time else datetime.now(timezone.utc)
         self._cursor = _make_aware(active_job_end) if active_job_end else self._now
         self._windows = self._parse_windows(unavailability_windows)
         self._horizon = self._now + timedelta(days=SCHEDULE_HORIZON_DAYS)
+        self._deadlines = self._parse_deadlines(projects_by_id or {})
+
+    def _parse_deadlines(self, projects_by_id: dict[str, Project]) -> dict[str, datetime]:
+        """Map plate id to its effective deadline (plate due date overrides project)."""
+        project_deadlines = {
+            project_id: _parse_datetime(project.due_date)
+            for project_id, project in projects_by_id.items()
+            if project.due_date
+        }
+        deadlines = {}
+        for plate_id, plate in self._plates.items():
+            if plate.due_date:
+                deadlines[plate_id] = _parse_datetime(plate.due_date)
+            elif plate.project_id in project_deadlines:
+                deadlines[plate_id] = project_deadlines[plate.project_id]
+        return deadlines
 
     def _parse_windows(
         self, windows: list[UnavailabilityWindow]
@@ -105,9 +180,92 @@ class PrintScheduler:
             plate = self._plates.get(job.plate_id)
             if plate:
                 remaining.append((job, plate, plate.estimated_duration_seconds))
-        remaining.sort(key=lambda x: (-x[1].priority, -x[2]))
+        remaining.sort(key=self._sort_key)
         return remaining
 
+    def _sort_key(self, item: tuple[Job, Plate, int]) -> tuple:
+        _, plate, duration = item
+        if self._mode == SCHEDULE_MODE_DEADLINE:
+            # Earliest deadline first; equal deadlines go longest (least slack) first.
+            return (self._deadlines.get(plate.id, NO_DEADLINE), -plate.priority, -duration)
+        if self._mode == SCHEDULE_MODE_LONGEST_FIRST:
+            return (-duration, -plate.priority)
+        if self._mode == SCHEDULE_MODE_SHORTEST_FIRST:
+            return (duration, -plate.priority)
+        return (-plate.priority, -duration)
+
+    def _pick_fill(
+        self, fitting: list[tuple[Job, Plate, int]], available_time: float
+    ) -> tuple[Job, Plate, int]:
+        """Pick the job that starts the subset filling the gap most completely.
+
+        Subset-sum over minute-rounded durations using an integer as a bitset of
+        reachable totals; the earliest candidate of the best subset is returned
+        so queue order still decides between equally good fills.
+        """
+        candidates = fitting[:KNAPSACK_MAX_CANDIDATES]
+        capacity = int(available_time // KNAPSACK_RESOLUTION_SECONDS)
+        mask = (1 << (capacity + 1)) - 1
+        weights = [d // KNAPSACK_RESOLUTION_SECONDS for _, _, d in candidates]
+
+        reachable = 1
+        history = []
+        for weight in weights:
+            history.append(reachable)
+            reachable = (reachable | (reachable << weight)) & mask
+
+        target = reachable.bit_length() - 1
+        chosen = 0
+        for index in range(len(candidates) - 1, -1, -1):
+            if target and not (history[index] >> target) & 1:
+                chosen = index
+                target -= weights[index]
+        return candidates[chosen]
+
+    def _make_scheduled_job(
+        self, job: Job, plate: Plate, start: datetime, duration: int, spans: bool
+    ) -> ScheduledJob:
+        return ScheduledJob(
+            job_id=job.id,
+            plate_id=plate.id,
+            plate_name=plate.name,
+            plate_number=plate.plate_number,
+            source_filename=plate.source_filename,
+            scheduled_start=start,
+            scheduled_end=start + timedelta(seconds=duration),
+            estimated_duration_seconds=duration,
+            spans_unavailability=spans,
+            thumbnail_path=plate.thumbnail_path,
+            due_date=self._deadlines.get(plate.id),
+        )
+
+    def _calculate_lateness(
+        self,
+        schedule: list[ScheduledJob],
+        unscheduled: list[tuple[Job, Plate, int]],
+        cursor: datetime,
+    ) -> dict[str, int]:
+        """Projected lateness in seconds per project with a deadline.
+
+        Jobs pushed past the horizon are assumed to run back to back from the
+        final cursor in queue order, ignoring unavailability.
+        """
+        lateness: dict[str, int] = {}
+        for sj in schedule:
+            if sj.due_date is None:
+                continue
+            project_id = self._plates[sj.plate_id].project_id
+            late = max(0, int((sj.scheduled_end - sj.due_date).total_seconds()))
+            lateness[project_id] = max(lateness.get(project_id, 0), late)
+        for _, plate, duration in unscheduled:
+            cursor += timedelta(seconds=duration)
+            deadline = self._deadlines.get(plate.id)
+            if deadline is None:
+                continue
+            late = max(0, int((cursor - deadline).total_seconds()))
+            lateness[plate.project_id] = max(lateness.get(plate.project_id, 0), late)
+        return lateness
+
     def _calculate_breakpoint(
         self, first_job: ScheduledJob | None, cursor: datetime
     ) -> datetime | None:
@@ -164,96 +322,48 @@ class PrintScheduler:
                     available_time, len(fitting)
                 )
                 if fitting:
-                    job, plate, duration = fitting[0]
-                    end_time = cursor + timedelta(seconds=duration)
-                    schedule.append(ScheduledJob(
-                        job_id=job.id,
-                        plate_id=plate.id,
-                        plate_name=plate.name,
-                        plate_number=plate.plate_number,
-                        source_filename=plate.source_filename,
-                        scheduled_start=cursor,
-                        scheduled_end=end_time,
-                        estimated_duration_seconds=duration,
-                        spans_unavailability=False,
-                        thumbnail_path=plate.thumbnail_path,
-                    ))
-                    cursor = end_time
+                    if self._mode == SCHEDULE_MODE_KNAPSACK:
+                        job, plate, duration = self._pick_fill(fitting, available_time)
+                    else:
+                        job, plate, duration = fitting[0]
+                    scheduled = self._make_scheduled_job(job, plate, cursor, duration, False)
+                    schedule.append(scheduled)
+                    cursor = scheduled.scheduled_end
                     remaining.remove((job, plate, duration))
                 else:
                     long_jobs = [(j, p, d) for j, p, d in remaining if d > available_time]
                     if long_jobs:
                         job, plate, duration = long_jobs[0]
-                        end_time = cursor + timedelta(seconds=duration)
-                        schedule.append(ScheduledJob(
-                            job_id=job.id,
-                            plate_id=plate.id,
-                            plate_name=plate.name,
-                            plate_number=plate.plate_number,
-                            source_filename=plate.source_filename,
-                            scheduled_start=cursor,
-                            scheduled_end=end_time,
-                            estimated_duration_seconds=duration,
-                            spans_unavailability=True,
-                            thumbnail_path=plate.thumbnail_path,
-                        ))
-                        cursor = end_time
+                        scheduled = self._make_scheduled_job(job, plate, cursor, duration, True)
+                        schedule.append(scheduled)
+                        cursor = scheduled.scheduled_end
                         remaining.remove((job, plate, duration))
                     else:
                         cursor = next_unavail[1]
             elif next_unavail:
                 fitting = [(j, p, d) for j, p, d in remaining if d <= available_time]
                 if fitting:
-                    fitting.sort(key=lambda x: -x[2])
-                    job, plate, duration = fitting[0]
-                    end_time = cursor + timedelta(seconds=duration)
-                    schedule.append(ScheduledJob(
-                        job_id=job.id,
-                        plate_id=plate.id,
-                        plate_name=plate.name,
-                        plate_number=plate.plate_number,
-                        source_filename=plate.source_filename,
-                        scheduled_start=cursor,
-                        scheduled_end=end_time,
-                        estimated_duration_seconds=duration,
-                        spans_unavailability=False,
-                        thumbnail_path=plate.thumbnail_path,
-                    ))
-                    cursor = end_time
+                    if self._mode == SCHEDULE_MODE_KNAPSACK:
+                        job, plate, duration = self._pick_fill(fitting, available_time)
+                    else:
+                        if self._mode != SCHEDULE_MODE_DEADLINE:
+                            fitting.sort(key=lambda x: -x[2])
+                        job, plate, duration = fitting[0]
+                    scheduled = self._make_scheduled_job(job, plate, cursor, duration, False)
+                    schedule.append(scheduled)
+                    cursor = scheduled.scheduled_end
                     remaining.remove((job, plate, duration))
                 else:
                     job, plate, duration = remaining[0]
-                    end_time = cursor + timedelta(seconds=duration)
-                    schedule.append(ScheduledJob(
-                        job_id=job.id,
-                        plate_id=plate.id,
-                        plate_name=plate.name,
-                        plate_number=plate.plate_number,
-                        source_filename=plate.source_filename,
-                        scheduled_start=cursor,
-                        scheduled_end=end_time,
-                        estimated_duration_seconds=duration,
-                        spans_unavailability=True,
-                        thumbnail_path=plate.thumbnail_path,
-                    ))
-                    cursor = end_time
+                    scheduled = self._make_scheduled_job(job, plate, cursor, duration, True)
+                    schedule.append(scheduled)
+                    cursor = scheduled.scheduled_end
                     remaining.remove((job, plate, duration))
             else:
                 for job, plate, duration in remaining:
-                    end_time = cursor + timedelta(seconds=duration)
-                    schedule.append(ScheduledJob(
-                        job_id=job.id,
-                        plate_id=plate.id,
-                        plate_name=plate.name,
-                        plate_number=plate.plate_number,
-                        source_filename=plate.source_filename,
-                        scheduled_start=cursor,
-                        scheduled_end=end_time,
-                        estimated_duration_seconds=duration,
-                        spans_unavailability=False,
-                        thumbnail_path=plate.thumbnail_path,
-                    ))
-                    cursor = end_time
+                    scheduled = self._make_scheduled_job(job, plate, cursor, duration, False)
+                    schedule.append(scheduled)
+                    cursor = scheduled.scheduled_end
                 remaining = []
 
         first_job = schedule[0] if schedule else None
@@ -264,8 +374,44 @@ class PrintScheduler:
             computed_at=self._now,
             cursor_at_computation=self._cursor,
             next_breakpoint=breakpoint,
+            lateness_by_project=self._calculate_lateness(schedule, remaining, cursor),
+            mode=self._mode,
         )
 
+    def _unavailable_seconds(self, start: datetime, end: datetime) -> float:
+        total = 0.0
+        for w_start, w_end in self._windows:
+            if w_start >= end:
+                break
+            overlap = (min(end, w_end) - max(start, w_start)).total_seconds()
+            if overlap > 0:
+                total += overlap
+        return total
+
+    def score_schedule(self, result: ScheduleResult) -> tuple[int, int, float]:
+        """Quality of a schedule computed from this scheduler's inputs; lower is better.
+
+        Compared lexicographically: total projected lateness, then seconds the
+        printer sits idle while the operator is available, then the
+        priority-weighted mean start offset.
+        """
+        idle = 0.0
+        cursor = result.cursor_at_computation
+        weighted_start = 0.0
+        total_weight = 0.0
+        for sj in result.jobs:
+            if sj.scheduled_start > cursor:
+                gap = (sj.scheduled_start - cursor).total_seconds()
+                idle += gap - self._unavailable_seconds(cursor, sj.scheduled_start)
+            cursor = max(cursor, sj.scheduled_end)
+
+            weight = 2 ** (self._plates[sj.plate_id].priority / 10)
+            weighted_start += weight * (sj.scheduled_start - self._now).total_seconds()
+            total_weight += weight
+
+        mean_start = weighted_start / total_weight if total_weight else 0.0
+        return sum(result.lateness_by_project.values()), int(idle), mean_start
+
     def get_next_recommended(self) -> ScheduledJob | None:
         result = self.calculate_schedule()
         return result.jobs[0] if result.jobs else None
@@ -4,15 +4,20 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import Any
 
-from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTime
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import PrintAssistCoordinator
+from .timing import STAGE_UPDATE
+
+PROJECT_COMPLETION_SUFFIX = "completion"
+PROJECT_REMAINING_SUFFIX = "remaining"
 
 
 async def async_setup_entry(
@@ -30,8 +35,41 @@ async def async_setup_entry(
         PrintAssistScheduleSensor(coordinator),
         PrintAssistPartsPrintedSensor(coordinator),
         PrintAssistTotalPartsSensor(coordinator),
+        PrintAssistRefreshTimeSensor(coordinator),
     ])
 
+    known_projects: set[str] = set()
+
+    @callback
+    def _async_sync_project_sensors() -> None:
+        if not coordinator.data:
+            return
+        project_eta = coordinator.data.get("project_eta", {})
+
+        added = project_eta.keys() - known_projects
+        if added:
+            known_projects.update(added)
+            new_entities: list[SensorEntity] = []
+            for project_id in added:
+                name = project_eta[project_id]["name"]
+                new_entities.append(PrintAssistProjectCompletionSensor(coordinator, project_id, name))
+                new_entities.append(PrintAssistProjectRemainingSensor(coordinator, project_id, name))
+            async_add_entities(new_entities)
+
+        removed = known_projects - project_eta.keys()
+        if removed:
+            ent_reg = er.async_get(hass)
+            for project_id in removed:
+                known_projects.discard(project_id)
+                for suffix in (PROJECT_COMPLETION_SUFFIX, PROJECT_REMAINING_SUFFIX):
+                    unique_id = f"printassist_project_{project_id}_{suffix}"
+                    entity_id = ent_reg.async_get_entity_id("sensor", DOMAIN, unique_id)
+                    if entity_id:
+                        ent_reg.async_remove(entity_id)
+
+    _async_sync_project_sensors()
+    entry.async_on_unload(coordinator.async_add_listener(_async_sync_project_sensors))
+
 
 class PrintAssistSensorBase(CoordinatorEntity[PrintAssistCoordinator], SensorEntity):
     _attr_has_entity_name = True
@@ -42,6 +80,30 @@ class PrintAssistSensorBase(CoordinatorEntity[PrintAssistCoordinator], SensorEnt
         self._attr_name = name
 
 
+class PrintAssistRefreshTimeSensor(PrintAssistSensorBase):
+    """Duration of the last coordinator refresh, with per-stage timings."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coordinator: PrintAssistCoordinator) -> None:
+        super().__init__(coordinator, "refresh_time", "Refresh Time")
+        self._attr_icon = "mdi:timer-cog-outline"
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+        self._attr_suggested_display_precision = 1
+
+    @property
+    def native_value(self) -> float | None:
+        last = self.coordinator.timings.last(STAGE_UPDATE)
+        return round(last * 1000, 3) if last is not None else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return self.coordinator.timings.summary()
+
+
 class PrintAssistQueueCountSensor(PrintAssistSensorBase):
     def __init__(self, coordinator: PrintAssistCoordinator) -> None:
         super().__init__(coordinator, "queue_count", "Queue Count")
@@ -215,3 +277,103 @@ class PrintAssistTotalPartsSensor(PrintAssistSensorBase):
         if not self.coordinator.data:
             return {}
         return {"by_project": self.coordinator.data.get("progress_by_project", [])}
+
+
+class PrintAssistProjectSensorBase(PrintAssistSensorBase):
+    """Per-project sensor that only writes state when its value changes."""
+
+    def __init__(
+        self,
+        coordinator: PrintAssistCoordinator,
+        project_id: str,
+        project_name: str,
+        suffix: str,
+        name: str,
+    ) -> None:
+        super().__init__(coordinator, f"project_{project_id}_{suffix}", f"{project_name} {name}")
+        self._project_id = project_id
+        self._last_written: tuple | None = None
+
+    def _project_eta(self) -> dict[str, Any] | None:
+        if not self.coordinator.data:
+            return None
+        return self.coordinator.data.get("project_eta", {}).get(self._project_id)
+
+    def _state_key(self) -> tuple:
+        return (self.native_value, self.available)
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._last_written = self._state_key()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        key = self._state_key()
+        if key == self._last_written:
+            return
+        self._last_written = key
+        self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        return super().available and self._project_eta() is not None
+
+
+class PrintAssistProjectCompletionSensor(PrintAssistProjectSensorBase):
+    def __init__(
+        self, coordinator: PrintAssistCoordinator, project_id: str, project_name: str
+    ) -> None:
+        super().__init__(
+            coordinator, project_id, project_name, PROJECT_COMPLETION_SUFFIX, "Projected Completion"
+        )
+        self._attr_icon = "mdi:calendar-check"
+        self._attr_device_class = SensorDeviceClass.TIMESTAMP
+
+    @property
+    def native_value(self) -> datetime | None:
+        eta = self._project_eta()
+        return eta["completion"] if eta else None
+
+    def _state_key(self) -> tuple:
+        return (*super()._state_key(), self._forecast_key())
+
+    def _forecast_key(self) -> tuple | None:
+        forecast = (self.coordinator.data or {}).get("forecast") or {}
+        project = forecast.get("projects", {}).get(self._project_id)
+        return (project["p50"], project["p90"]) if project else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        forecast = self._forecast_key()
+        if not forecast or self.native_value is None:
+            return {}
+        return {"p50": forecast[0], "p90": forecast[1]}
+
+
+class PrintAssistProjectRemainingSensor(PrintAssistProjectSensorBase):
+    def __init__(
+        self, coordinator: PrintAssistCoordinator, project_id: str, project_name: str
+    ) -> None:
+        super().__init__(
+            coordinator, project_id, project_name, PROJECT_REMAINING_SUFFIX, "Remaining Print Time"
+        )
+        self._attr_icon = "mdi:timer-sand"
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_native_unit_of_measurement = UnitOfTime.HOURS
+        self._attr_suggested_display_precision = 1
+
+    @property
+    def native_value(self) -> float | None:
+        eta = self._project_eta()
+        return round(eta["remaining_seconds"] / 3600, 2) if eta else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        eta = self._project_eta()
+        if not eta:
+            return {}
+        return {"queued_jobs": eta["queued"]}
+
+    def _state_key(self) -> tuple:
+        eta = self._project_eta()
+        return (*super()._state_key(), eta["queued"] if eta else None)
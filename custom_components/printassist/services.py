@@ -6,7 +6,7 @@ import logging
 from typing import TYPE_CHECKING
 
 import voluptuous as vol
-from homeassistant.core import ServiceCall
+from homeassistant.core import ServiceCall, ServiceResponse, SupportsResponse
 from homeassistant.helpers import config_validation as cv
 
 from .const import (
@@ -20,9 +20,12 @@ from .const import (
     ATTR_FAILURE_REASON,
     ATTR_FILENAME,
     ATTR_FILE_CONTENT,
+    ATTR_SESSION_ID,
     ATTR_START,
     ATTR_END,
     ATTR_WINDOW_ID,
+    ATTR_DUE_DATE,
+    ATTR_WAIT_FOR_REFRESH,
     SERVICE_CREATE_PROJECT,
     SERVICE_DELETE_PROJECT,
     SERVICE_UPLOAD_3MF,
@@ -34,67 +37,110 @@ from .const import (
     SERVICE_FAIL_JOB,
     SERVICE_ADD_UNAVAILABILITY,
     SERVICE_REMOVE_UNAVAILABILITY,
+    SERVICE_SET_DUE_DATE,
+    SERVICE_COLLECT_GARBAGE,
 )
+from .uploads import UploadSessionError, UploadSessionManager
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
     from .store import PrintAssistStore
-    from .file_handler import FileHandler
+    from .file_handler import FileHandler, GarbageReport
     from .coordinator import PrintAssistCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
+# Services that change the schedule return once it is recalculated when asked,
+# so automations can read the new state straight after the call.
+WAIT_FOR_REFRESH_FIELDS = {
+    vol.Optional(ATTR_WAIT_FOR_REFRESH, default=False): cv.boolean,
+}
+
 SERVICE_CREATE_PROJECT_SCHEMA = vol.Schema({
     vol.Required(ATTR_PROJECT_NAME): cv.string,
     vol.Optional("notes", default=""): cv.string,
+    vol.Optional(ATTR_DUE_DATE): cv.datetime,
+    **WAIT_FOR_REFRESH_FIELDS,
 })
 
 SERVICE_DELETE_PROJECT_SCHEMA = vol.Schema({
     vol.Required(ATTR_PROJECT_ID): cv.string,
+    **WAIT_FOR_REFRESH_FIELDS,
 })
 
-SERVICE_UPLOAD_3MF_SCHEMA = vol.Schema({
-    vol.Required(ATTR_PROJECT_ID): cv.string,
-    vol.Required(ATTR_FILENAME): cv.string,
-    vol.Required(ATTR_FILE_CONTENT): cv.string,
-})
+SERVICE_UPLOAD_3MF_SCHEMA = vol.All(
+    vol.Schema({
+        vol.Required(ATTR_PROJECT_ID): cv.string,
+        vol.Optional(ATTR_FILENAME): cv.string,
+        vol.Exclusive(ATTR_FILE_CONTENT, "source"): cv.string,
+        vol.Exclusive(ATTR_SESSION_ID, "source"): cv.string,
+        **WAIT_FOR_REFRESH_FIELDS,
+    }),
+    cv.has_at_least_one_key(ATTR_FILE_CONTENT, ATTR_SESSION_ID),
+)
 
 SERVICE_DELETE_PLATE_SCHEMA = vol.Schema({
     vol.Required(ATTR_PLATE_ID): cv.string,
+    **WAIT_FOR_REFRESH_FIELDS,
 })
 
 SERVICE_SET_PRIORITY_SCHEMA = vol.Schema({
     vol.Required(ATTR_PLATE_ID): cv.string,
     vol.Required(ATTR_PRIORITY): vol.Coerce(int),
+    **WAIT_FOR_REFRESH_FIELDS,
 })
 
 SERVICE_SET_QUANTITY_SCHEMA = vol.Schema({
     vol.Required(ATTR_PLATE_ID): cv.string,
     vol.Required(ATTR_QUANTITY): vol.Coerce(int),
+    **WAIT_FOR_REFRESH_FIELDS,
 })
 
 SERVICE_START_JOB_SCHEMA = vol.Schema({
     vol.Required(ATTR_JOB_ID): cv.string,
+    **WAIT_FOR_REFRESH_FIELDS,
 })
 
 SERVICE_COMPLETE_JOB_SCHEMA = vol.Schema({
     vol.Required(ATTR_JOB_ID): cv.string,
+    **WAIT_FOR_REFRESH_FIELDS,
 })
 
 SERVICE_FAIL_JOB_SCHEMA = vol.Schema({
     vol.Required(ATTR_JOB_ID): cv.string,
     vol.Optional(ATTR_FAILURE_REASON): cv.string,
+    **WAIT_FOR_REFRESH_FIELDS,
 })
 
 SERVICE_ADD_UNAVAILABILITY_SCHEMA = vol.Schema({
     vol.Required(ATTR_START): cv.datetime,
     vol.Required(ATTR_END): cv.datetime,
+    **WAIT_FOR_REFRESH_FIELDS,
 })
 
 SERVICE_REMOVE_UNAVAILABILITY_SCHEMA = vol.Schema({
     vol.Required(ATTR_WINDOW_ID): cv.string,
+    **WAIT_FOR_REFRESH_FIELDS,
+})
+
+SERVICE_SET_DUE_DATE_SCHEMA = vol.Schema({
+    vol.Exclusive(ATTR_PROJECT_ID, "target"): cv.string,
+    vol.Exclusive(ATTR_PLATE_ID, "target"): cv.string,
+    vol.Optional(ATTR_DUE_DATE): vol.Any(None, cv.datetime),
+    **WAIT_FOR_REFRESH_FIELDS,
 })
 
+SERVICE_COLLECT_GARBAGE_SCHEMA = vol.Schema({})
+
+
+async def async_collect_garbage(hass: HomeAssistant) -> GarbageReport:
+    """Remove stored files that no plate references any more."""
+    store: PrintAssistStore = hass.data[DOMAIN]["store"]
+    file_handler: FileHandler = hass.data[DOMAIN]["file_handler"]
+    sessions: UploadSessionManager = hass.data[DOMAIN]["upload_sessions"]
+    await sessions.async_expire()
+    return await file_handler.async_collect_garbage(store.snapshot().file_references)
+
 
 async def async_setup_services(hass: HomeAssistant) -> None:
     async def handle_create_project(call: ServiceCall) -> None:
@@ -102,19 +148,22 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         coordinator: PrintAssistCoordinator = hass.data[DOMAIN]["coordinator"]
         name = call.data[ATTR_PROJECT_NAME]
         notes = call.data.get("notes", "")
-        project = await store.async_create_project(name, notes)
+        due_date = call.data.get(ATTR_DUE_DATE)
+        project = await store.async_create_project(name, notes, due_date)
         _LOGGER.info("Created project: %s (%s)", project.name, project.id)
-        await coordinator.async_request_refresh()
+        await coordinator.async_request_schedule_refresh(wait=call.data[ATTR_WAIT_FOR_REFRESH])
 
     async def handle_delete_project(call: ServiceCall) -> None:
         store: PrintAssistStore = hass.data[DOMAIN]["store"]
+        file_handler: FileHandler = hass.data[DOMAIN]["file_handler"]
         coordinator: PrintAssistCoordinator = hass.data[DOMAIN]["coordinator"]
         project_id = call.data[ATTR_PROJECT_ID]
+        plates = store.get_plates(project_id)
         deleted = await store.async_delete_project(project_id)
         if deleted:
+            await file_handler.async_release_files(plates, store.snapshot().file_references)
             _LOGGER.info("Deleted project: %s", project_id)
-        coordinator.invalidate_schedule()
-        await coordinator.async_request_refresh()
+        await coordinator.async_request_schedule_refresh(wait=call.data[ATTR_WAIT_FOR_REFRESH])
 
     async def handle_upload_3mf(call: ServiceCall) -> None:
         store: PrintAssistStore = hass.data[DOMAIN]["store"]
@@ -122,26 +171,42 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         coordinator: PrintAssistCoordinator = hass.data[DOMAIN]["coordinator"]
 
         project_id = call.data[ATTR_PROJECT_ID]
-        filename = call.data[ATTR_FILENAME]
-        file_b64 = call.data[ATTR_FILE_CONTENT]
 
         project = store.get_project(project_id)
         if not project:
             _LOGGER.error("Project not found: %s", project_id)
             return
 
-        try:
-            file_content = base64.b64decode(file_b64)
-        except Exception as e:
-            _LOGGER.error("Failed to decode file content: %s", e)
-            return
+        if ATTR_SESSION_ID in call.data:
+            sessions: UploadSessionManager = hass.data[DOMAIN]["upload_sessions"]
+            try:
+                staged = await sessions.async_finalize(call.data[ATTR_SESSION_ID])
+            except UploadSessionError as e:
+                _LOGGER.error("Upload session %s: %s", call.data[ATTR_SESSION_ID], e)
+                return
+            filename = call.data.get(ATTR_FILENAME, staged.filename)
+            try:
+                plates = await file_handler.process_file(
+                    staged.path, project_id, filename, staged.sha256
+                )
+            finally:
+                await file_handler.async_discard_staged(staged)
+        else:
+            filename = call.data.get(ATTR_FILENAME)
+            if not filename:
+                _LOGGER.error("A filename is required with file_content")
+                return
+            try:
+                file_content = base64.b64decode(call.data[ATTR_FILE_CONTENT])
+            except Exception as e:
+                _LOGGER.error("Failed to decode file content: %s", e)
+                return
+            plates = await file_handler.process_file(file_content, project_id, filename)
 
-        plates = await file_handler.process_file(file_content, project_id, filename)
         if plates:
             await store.async_add_plates(plates)
             _LOGGER.info("Uploaded %d plates from %s", len(plates), filename)
-        coordinator.invalidate_schedule()
-        await coordinator.async_request_refresh()
+        await coordinator.async_request_schedule_refresh(wait=call.data[ATTR_WAIT_FOR_REFRESH])
 
     async def handle_delete_plate(call: ServiceCall) -> None:
         store: PrintAssistStore = hass.data[DOMAIN]["store"]
@@ -151,11 +216,10 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         plate_id = call.data[ATTR_PLATE_ID]
         plate = store.get_plate(plate_id)
         if plate:
-            await file_handler.delete_plate_files(plate)
             await store.async_delete_plate(plate_id)
+            await file_handler.async_release_files([plate], store.snapshot().file_references)
             _LOGGER.info("Deleted plate: %s", plate_id)
-        coordinator.invalidate_schedule()
-        await coordinator.async_request_refresh()
+        await coordinator.async_request_schedule_refresh(wait=call.data[ATTR_WAIT_FOR_REFRESH])
 
     async def handle_set_priority(call: ServiceCall) -> None:
         store: PrintAssistStore = hass.data[DOMAIN]["store"]
@@ -165,8 +229,7 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         priority = call.data[ATTR_PRIORITY]
         await store.async_set_plate_priority(plate_id, priority)
         _LOGGER.info("Set priority for %s to %d", plate_id, priority)
-        coordinator.invalidate_schedule()
-        await coordinator.async_request_refresh()
+        await coordinator.async_request_schedule_refresh(wait=call.data[ATTR_WAIT_FOR_REFRESH])
 
     async def handle_set_quantity(call: ServiceCall) -> None:
         store: PrintAssistStore = hass.data[DOMAIN]["store"]
@@ -176,8 +239,7 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         quantity = call.data[ATTR_QUANTITY]
         await store.async_set_plate_quantity(plate_id, quantity)
         _LOGGER.info("Set quantity for %s to %d", plate_id, quantity)
-        coordinator.invalidate_schedule()
-        await coordinator.async_request_refresh()
+        await coordinator.async_request_schedule_refresh(wait=call.data[ATTR_WAIT_FOR_REFRESH])
 
     async def handle_start_job(call: ServiceCall) -> None:
         store: PrintAssistStore = hass.data[DOMAIN]["store"]
@@ -191,8 +253,7 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         success = await store.async_start_job(job_id)
         if success:
             _LOGGER.info("Started job: %s", job_id)
-        coordinator.invalidate_schedule()
-        await coordinator.async_request_refresh()
+        await coordinator.async_request_schedule_refresh(wait=call.data[ATTR_WAIT_FOR_REFRESH])
 
     async def handle_complete_job(call: ServiceCall) -> None:
         store: PrintAssistStore = hass.data[DOMAIN]["store"]
@@ -205,8 +266,7 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             _LOGGER.info("Completed job: %s", job_id)
             if printer_monitor:
                 await printer_monitor.async_recheck_printer_state()
-        coordinator.invalidate_schedule()
-        await coordinator.async_request_refresh()
+        await coordinator.async_request_schedule_refresh(wait=call.data[ATTR_WAIT_FOR_REFRESH])
 
     async def handle_fail_job(call: ServiceCall) -> None:
         store: PrintAssistStore = hass.data[DOMAIN]["store"]
@@ -220,8 +280,7 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             _LOGGER.info("Failed job: %s (reason: %s), created replacement: %s", job_id, reason, new_job.id)
             if printer_monitor:
                 await printer_monitor.async_recheck_printer_state()
-        coordinator.invalidate_schedule()
-        await coordinator.async_request_refresh()
+        await coordinator.async_request_schedule_refresh(wait=call.data[ATTR_WAIT_FOR_REFRESH])
 
     async def handle_add_unavailability(call: ServiceCall) -> None:
         store: PrintAssistStore = hass.data[DOMAIN]["store"]
@@ -231,8 +290,7 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         end = call.data[ATTR_END]
         await store.async_add_unavailability(start, end)
         _LOGGER.info("Added unavailability: %s to %s", start, end)
-        coordinator.invalidate_schedule()
-        await coordinator.async_request_refresh()
+        await coordinator.async_request_schedule_refresh(wait=call.data[ATTR_WAIT_FOR_REFRESH])
 
     async def handle_remove_unavailability(call: ServiceCall) -> None:
         store: PrintAssistStore = hass.data[DOMAIN]["store"]
@@ -241,8 +299,32 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         window_id = call.data[ATTR_WINDOW_ID]
         await store.async_remove_unavailability(window_id)
         _LOGGER.info("Removed unavailability: %s", window_id)
-        coordinator.invalidate_schedule()
-        await coordinator.async_request_refresh()
+        await coordinator.async_request_schedule_refresh(wait=call.data[ATTR_WAIT_FOR_REFRESH])
+
+    async def handle_set_due_date(call: ServiceCall) -> None:
+        store: PrintAssistStore = hass.data[DOMAIN]["store"]
+        coordinator: PrintAssistCoordinator = hass.data[DOMAIN]["coordinator"]
+
+        due_date = call.data.get(ATTR_DUE_DATE)
+        if ATTR_PROJECT_ID in call.data:
+            target = call.data[ATTR_PROJECT_ID]
+            updated = await store.async_set_project_due_date(target, due_date)
+        elif ATTR_PLATE_ID in call.data:
+            target = call.data[ATTR_PLATE_ID]
+            updated = await store.async_set_plate_due_date(target, due_date)
+        else:
+            _LOGGER.error("set_due_date requires a project_id or plate_id")
+            return
+
+        if not updated:
+            _LOGGER.error("Due date target not found: %s", target)
+            return
+        _LOGGER.info("Set due date for %s to %s", target, due_date)
+        await coordinator.async_request_schedule_refresh(wait=call.data[ATTR_WAIT_FOR_REFRESH])
+
+    async def handle_collect_garbage(call: ServiceCall) -> ServiceResponse:
+        report = await async_collect_garbage(hass)
+        return report.to_dict()
 
     hass.services.async_register(
         DOMAIN, SERVICE_CREATE_PROJECT, handle_create_project, SERVICE_CREATE_PROJECT_SCHEMA
@@ -277,6 +359,16 @@ async def async_setup_services(hass: HomeAssistant) -> None:
     hass.services.async_register(
         DOMAIN, SERVICE_REMOVE_UNAVAILABILITY, handle_remove_unavailability, SERVICE_REMOVE_UNAVAILABILITY_SCHEMA
     )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_DUE_DATE, handle_set_due_date, SERVICE_SET_DUE_DATE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_COLLECT_GARBAGE,
+        handle_collect_garbage,
+        SERVICE_COLLECT_GARBAGE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
 
 
 async def async_unload_services(hass: HomeAssistant) -> None:
@@ -292,5 +384,7 @@ async def async_unload_services(hass: HomeAssistant) -> None:
         SERVICE_FAIL_JOB,
         SERVICE_ADD_UNAVAILABILITY,
         SERVICE_REMOVE_UNAVAILABILITY,
+        SERVICE_SET_DUE_DATE,
+        SERVICE_COLLECT_GARBAGE,
     ]:
         hass.services.async_remove(DOMAIN, service)
@@ -1,12 +1,19 @@
 """Persistent storage for PrintAssist."""
 from __future__ import annotations
 
+import sys
 import uuid
+from collections import Counter
+from collections.abc import Mapping
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
-from typing import TYPE_CHECKING
+from functools import cached_property
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
 
+from homeassistant.helpers.json import json_bytes
 from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
 
 from .const import (
     STORAGE_KEY,
@@ -16,10 +23,18 @@ from .const import (
     JOB_STATUS_COMPLETED,
     JOB_STATUS_FAILED,
 )
+from .timing import STAGE_STORE_SAVE, STAGE_STORE_SNAPSHOT, StageTimings
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
 
+MEMORY_SAMPLE_SIZE = 200
+
+
+def _due_date_iso(due_date: datetime | None) -> str | None:
+    """Stored deadlines are UTC; naive input (the datetime selector) is local time."""
+    return dt_util.as_utc(due_date).isoformat() if due_date else None
+
 
 @dataclass
 class Project:
@@ -27,14 +42,18 @@ class Project:
     name: str
     created_at: str
     notes: str = ""
+    due_date: str | None = None
 
     @classmethod
-    def create(cls, name: str, notes: str = "") -> Project:
+    def create(
+        cls, name: str, notes: str = "", due_date: datetime | None = None
+    ) -> Project:
         return cls(
             id=str(uuid.uuid4()),
             name=name,
             created_at=datetime.now().isoformat(),
             notes=notes,
+            due_date=_due_date_iso(due_date),
         )
 
 
@@ -50,6 +69,12 @@ class Plate:
     thumbnail_path: str | None = None
     quantity_needed: int = 1
     priority: int = 0
+    due_date: str | None = None
+    filament_weight_grams: float | None = None
+    filament_types: list[str] = field(default_factory=list)
+    printer_model: str | None = None
+    object_count: int | None = None
+    source_hash: str | None = None
 
     @classmethod
     def create(
@@ -117,11 +142,64 @@ class StoreData:
     unavailability_windows: list[dict] = field(default_factory=list)
 
 
+@dataclass(frozen=True)
+class FileReferences:
+    """How many plates use each stored gcode, thumbnail and source file."""
+
+    gcode: Counter[str]
+    thumbnails: Counter[str]
+    sources: Counter[str]
+    # Sources stored under their upload filename, before content addressing.
+    legacy_sources: Counter[str] = field(default_factory=Counter)
+
+
+@dataclass(frozen=True)
+class StoreSnapshot:
+    """Read-only view of the store at one revision, built in a single pass."""
+
+    revision: int
+    projects: tuple[Project, ...]
+    plates: tuple[Plate, ...]
+    plates_by_id: Mapping[str, Plate]
+    jobs: tuple[Job, ...]
+    jobs_by_status: Mapping[str, tuple[Job, ...]]
+    progress_by_project: Mapping[str, tuple[int, int]]
+    unavailability_windows: tuple[UnavailabilityWindow, ...]
+
+    @property
+    def queued_jobs(self) -> tuple[Job, ...]:
+        return self.jobs_by_status.get(JOB_STATUS_QUEUED, ())
+
+    @property
+    def active_job(self) -> Job | None:
+        printing = self.jobs_by_status.get(JOB_STATUS_PRINTING, ())
+        return printing[0] if printing else None
+
+    @cached_property
+    def file_references(self) -> FileReferences:
+        return FileReferences(
+            gcode=Counter(p.gcode_path for p in self.plates),
+            thumbnails=Counter(p.thumbnail_path for p in self.plates if p.thumbnail_path),
+            sources=Counter(p.source_hash for p in self.plates if p.source_hash),
+            legacy_sources=Counter(
+                p.source_filename for p in self.plates if not p.source_hash
+            ),
+        )
+
+
 class PrintAssistStore:
-    def __init__(self, hass: HomeAssistant) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        timings: StageTimings | None = None,
+        backend: Store | None = None,
+    ) -> None:
         self._hass = hass
-        self._store: Store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._store: Store = backend or Store(hass, STORAGE_VERSION, STORAGE_KEY)
         self._data: StoreData = StoreData()
+        self._revision = 0
+        self._snapshot: StoreSnapshot | None = None
+        self._timings = timings or StageTimings()
 
     async def async_load(self) -> None:
         stored = await self._store.async_load()
@@ -132,9 +210,59 @@ class PrintAssistStore:
                 jobs=stored.get("jobs", []),
                 unavailability_windows=stored.get("unavailability_windows", []),
             )
+            self._revision += 1
 
     async def _async_save(self) -> None:
-        await self._store.async_save(asdict(self._data))
+        self._revision += 1
+        with self._timings.measure(STAGE_STORE_SAVE):
+            await self._store.async_save(asdict(self._data))
+
+    @property
+    def revision(self) -> int:
+        """Counter bumped on every change, used to key derived caches."""
+        return self._revision
+
+    def snapshot(self) -> StoreSnapshot:
+        """Return the snapshot for the current revision, building it once."""
+        if self._snapshot is None or self._snapshot.revision != self._revision:
+            with self._timings.measure(STAGE_STORE_SNAPSHOT):
+                self._snapshot = self._build_snapshot()
+        return self._snapshot
+
+    def _build_snapshot(self) -> StoreSnapshot:
+        plates = tuple(Plate(**p) for p in self._data.plates)
+        jobs = tuple(Job(**j) for j in self._data.jobs)
+
+        by_status: dict[str, list[Job]] = {}
+        completed_by_plate: dict[str, int] = {}
+        for job in jobs:
+            by_status.setdefault(job.status, []).append(job)
+            if job.status == JOB_STATUS_COMPLETED:
+                completed_by_plate[job.plate_id] = completed_by_plate.get(job.plate_id, 0) + 1
+
+        projects = tuple(Project(**p) for p in self._data.projects)
+        progress = {project.id: [0, 0] for project in projects}
+        for plate in plates:
+            counts = progress.get(plate.project_id)
+            if counts is None:
+                continue
+            counts[0] += completed_by_plate.get(plate.id, 0)
+            counts[1] += plate.quantity_needed
+
+        return StoreSnapshot(
+            revision=self._revision,
+            projects=projects,
+            plates=plates,
+            plates_by_id=MappingProxyType({p.id: p for p in plates}),
+            jobs=jobs,
+            jobs_by_status=MappingProxyType({k: tuple(v) for k, v in by_status.items()}),
+            progress_by_project=MappingProxyType(
+                {pid: (completed, total) for pid, (completed, total) in progress.items()}
+            ),
+            unavailability_windows=tuple(
+                UnavailabilityWindow(**w) for w in self._data.unavailability_windows
+            ),
+        )
 
     def get_projects(self) -> list[Project]:
         return [Project(**p) for p in self._data.projects]
@@ -145,8 +273,10 @@ class PrintAssistStore:
                 return Project(**p)
         return None
 
-    async def async_create_project(self, name: str, notes: str = "") -> Project:
-        project = Project.create(name, notes)
+    async def async_create_project(
+        self, name: str, notes: str = "", due_date: datetime | None = None
+    ) -> Project:
+        project = Project.create(name, notes, due_date)
         self._data.projects.append(asdict(project))
         await self._async_save()
         return project
@@ -162,6 +292,16 @@ class PrintAssistStore:
             return True
         return False
 
+    async def async_set_project_due_date(
+        self, project_id: str, due_date: datetime | None
+    ) -> bool:
+        for p in self._data.projects:
+            if p["id"] == project_id:
+                p["due_date"] = _due_date_iso(due_date)
+                await self._async_save()
+                return True
+        return False
+
     def get_plates(self, project_id: str | None = None) -> list[Plate]:
         plates = self._data.plates
         if project_id:
@@ -199,6 +339,16 @@ class PrintAssistStore:
                 return True
         return False
 
+    async def async_set_plate_due_date(
+        self, plate_id: str, due_date: datetime | None
+    ) -> bool:
+        for p in self._data.plates:
+            if p["id"] == plate_id:
+                p["due_date"] = _due_date_iso(due_date)
+                await self._async_save()
+                return True
+        return False
+
     async def async_set_plate_quantity(self, plate_id: str, quantity: int) -> bool:
         plate = self.get_plate(plate_id)
         if not plate:
@@ -317,6 +467,30 @@ class PrintAssistStore:
             return True
         return False
 
+    def get_statistics(self) -> dict[str, dict[str, int]]:
+        """Record count and approximate in-memory size per collection.
+
+        Sizes are extrapolated from the first ``MEMORY_SAMPLE_SIZE`` records,
+        so this is cheap enough for the event loop.
+        """
+        stats = {}
+        for name, records in self.to_dict().items():
+            sample = records[:MEMORY_SAMPLE_SIZE]
+            per_record = sum(_deep_sizeof(r) for r in sample) / len(sample) if sample else 0
+            stats[name] = {
+                "count": len(records),
+                "approx_bytes": int(sys.getsizeof(records) + per_record * len(records)),
+            }
+        return stats
+
+    def serialized_size(self) -> int:
+        """Size of the store as JSON, in bytes. Run in the executor.
+
+        orjson serializes without releasing the GIL, so concurrent changes on
+        the event loop cannot interleave with it.
+        """
+        return len(json_bytes(self.to_dict()))
+
     def to_dict(self) -> dict:
         return {
             "projects": self._data.projects,
@@ -324,3 +498,12 @@ class PrintAssistStore:
             "jobs": self._data.jobs,
             "unavailability_windows": self._data.unavailability_windows,
         }
+
+
+def _deep_sizeof(value: Any) -> int:
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_deep_sizeof(k) + _deep_sizeof(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(_deep_sizeof(v) for v in value)
+    return size
@@ -0,0 +1,86 @@
+"""Lightweight per-stage timing for PrintAssist hot paths."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import time
+from typing import Any
+
+TIMING_WINDOW = 256
+
+STAGE_UPDATE = "update"
+STAGE_INPUT_HASH = "input_hash"
+STAGE_SCHEDULER = "scheduler"
+STAGE_FORECAST = "forecast"
+STAGE_BUILD_DATA = "build_data"
+STAGE_STORE_SAVE = "store_save"
+STAGE_STORE_SNAPSHOT = "store_snapshot"
+STAGE_FILE_PROCESSING = "file_processing"
+
+
+@dataclass
+class _Stage:
+    samples: deque[float] = field(default_factory=lambda: deque(maxlen=TIMING_WINDOW))
+    count: int = 0
+    max: float = 0.0
+    last: float = 0.0
+
+
+class StageTimings:
+    """Rolling duration samples per stage.
+
+    Recording is an append to a bounded deque; percentiles are only computed
+    when a summary is requested, over the most recent ``TIMING_WINDOW``
+    samples. Count and max cover the whole lifetime.
+    """
+
+    def __init__(self) -> None:
+        self._stages: dict[str, _Stage] = {}
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started)
+
+    def record(self, stage: str, seconds: float) -> None:
+        entry = self._stages.get(stage)
+        if entry is None:
+            entry = self._stages[stage] = _Stage()
+        entry.samples.append(seconds)
+        entry.count += 1
+        entry.last = seconds
+        if seconds > entry.max:
+            entry.max = seconds
+
+    def last(self, stage: str) -> float | None:
+        entry = self._stages.get(stage)
+        return entry.last if entry else None
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """Count, p50, p95, max and last duration per stage, in milliseconds."""
+        result = {}
+        for stage, entry in sorted(self._stages.items()):
+            ordered = sorted(entry.samples)
+            result[stage] = {
+                "count": entry.count,
+                "p50_ms": _ms(_percentile(ordered, 0.50)),
+                "p95_ms": _ms(_percentile(ordered, 0.95)),
+                "max_ms": _ms(entry.max),
+                "last_ms": _ms(entry.last),
+            }
+        return result
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
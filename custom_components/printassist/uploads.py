@@ -0,0 +1,165 @@
+"""Resumable, chunked upload sessions for large print files."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+import hashlib
+import logging
+from pathlib import Path
+import time
+from typing import TYPE_CHECKING, Any
+import uuid
+
+from .const import MAX_UPLOAD_SIZE, UPLOAD_SESSION_TIMEOUT
+from .file_handler import StagedFile, UploadTooLarge, _write_chunk
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class UploadSessionError(Exception):
+    """The upload session cannot accept the request."""
+
+
+class UnknownSession(UploadSessionError):
+    """No open session has this id."""
+
+
+class OffsetMismatch(UploadSessionError):
+    """A chunk did not start where the session currently ends."""
+
+    def __init__(self, expected: int) -> None:
+        super().__init__(f"Expected offset {expected}")
+        self.expected = expected
+
+
+@dataclass
+class UploadSession:
+    id: str
+    filename: str
+    size: int | None
+    path: Path
+    offset: int = 0
+    last_activity: float = field(default_factory=time.monotonic)
+    hasher: Any = field(default_factory=hashlib.sha256, repr=False)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "session_id": self.id,
+            "filename": self.filename,
+            "size": self.size,
+            "offset": self.offset,
+        }
+
+
+class UploadSessionManager:
+    """Open upload sessions, each backed by a partial file on disk.
+
+    Chunks must arrive in order; after a dropped connection the client asks
+    for the session's offset and continues from there. The running SHA-256 is
+    kept in memory, so sessions do not survive a restart.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, directory: Path, max_size: int = MAX_UPLOAD_SIZE
+    ) -> None:
+        self._hass = hass
+        self._directory = directory
+        self._max_size = max_size
+        self._sessions: dict[str, UploadSession] = {}
+
+    async def async_create(self, filename: str, size: int | None = None) -> UploadSession:
+        await self.async_expire()
+        if size is not None and size > self._max_size:
+            raise UploadTooLarge(f"{filename} exceeds {self._max_size} bytes")
+        session_id = uuid.uuid4().hex
+        path = self._directory / f"session-{session_id}.part"
+        await self._hass.async_add_executor_job(path.touch)
+        session = self._sessions[session_id] = UploadSession(session_id, filename, size, path)
+        return session
+
+    def get(self, session_id: str) -> UploadSession:
+        try:
+            return self._sessions[session_id]
+        except KeyError:
+            raise UnknownSession(session_id) from None
+
+    async def async_append(
+        self, session_id: str, offset: int, chunks: AsyncIterator[bytes]
+    ) -> int:
+        """Append chunks written at ``offset``; returns the new session offset.
+
+        Bytes received before an interrupted request stay appended, so the
+        client can resume from the returned (or later queried) offset.
+        """
+        session = self.get(session_id)
+        async with session.lock:
+            self._check_open(session)
+            if offset != session.offset:
+                raise OffsetMismatch(session.offset)
+            limit = session.size if session.size is not None else self._max_size
+            handle = await self._hass.async_add_executor_job(session.path.open, "ab")
+            try:
+                async for chunk in chunks:
+                    if session.offset + len(chunk) > limit:
+                        raise UploadTooLarge(f"{session.filename} exceeds {limit} bytes")
+                    await self._hass.async_add_executor_job(
+                        _write_chunk, handle, session.hasher, chunk
+                    )
+                    session.offset += len(chunk)
+                    session.last_activity = time.monotonic()
+            finally:
+                await self._hass.async_add_executor_job(handle.close)
+            return session.offset
+
+    async def async_finalize(self, session_id: str, sha256: str | None = None) -> StagedFile:
+        """Close the session and hand its file over as a staged upload."""
+        session = self.get(session_id)
+        async with session.lock:
+            self._check_open(session)
+            if session.size is not None and session.offset != session.size:
+                raise UploadSessionError(
+                    f"Upload incomplete: {session.offset} of {session.size} bytes"
+                )
+            digest = session.hasher.hexdigest()
+            if sha256 is not None and sha256.lower() != digest:
+                raise UploadSessionError("Checksum mismatch")
+            del self._sessions[session_id]
+        return StagedFile(session.path, session.filename, session.offset, digest)
+
+    def _check_open(self, session: UploadSession) -> None:
+        """Raise if the session was finalized or aborted while waiting for its lock."""
+        if self._sessions.get(session.id) is not session:
+            raise UnknownSession(session.id)
+
+    async def async_abort(self, session_id: str) -> None:
+        session = self._sessions.get(session_id)
+        if session is None:
+            return
+        # Waits for a running append, and never removes a file finalize handed off.
+        async with session.lock:
+            if self._sessions.get(session_id) is not session:
+                return
+            del self._sessions[session_id]
+            await self._async_discard(session)
+
+    async def _async_discard(self, session: UploadSession) -> None:
+        await self._hass.async_add_executor_job(session.path.unlink, True)
+
+    async def async_expire(self) -> None:
+        cutoff = time.monotonic() - UPLOAD_SESSION_TIMEOUT.total_seconds()
+        for session in list(self._sessions.values()):
+            if session.last_activity < cutoff and not session.lock.locked():
+                _LOGGER.debug("Expiring idle upload session %s", session.id)
+                await self.async_abort(session.id)
+
+    async def async_shutdown(self) -> None:
+        # Without the lock: a stalled client must not hold up the unload.
+        sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            await self._async_discard(session)
+
@@ -18,6 +18,7 @@ class PrintAssistPanel extends LitElement {
       _schedule: { type: Array },
       _unavailability: { type: Array },
       _uploading: { type: Boolean },
+      _uploadProgress: { type: Number },
       _ganttView: { type: String },
       _ganttOffset: { type: Number },
       _unavailDateOffset: { type: Number },
@@ -655,6 +656,7 @@ class PrintAssistPanel extends LitElement {
     this._schedule = [];
     this._unavailability = [];
     this._uploading = false;
+    this._uploadProgress = 0;
     this._ganttView = "day";
     this._ganttOffset = 0;
     this._unavailDateOffset = 0;
@@ -663,16 +665,26 @@ class PrintAssistPanel extends LitElement {
     this._nowLinePosition = 0;
     this._animationFrame = null;
     this._unknownPrint = null;
+    this._data = null;
+    this._subscription = null;
   }
 
   connectedCallback() {
     super.connectedCallback();
-    this._loadData();
+    this._subscribe();
     this._startNowLineAnimation();
   }
 
+  updated(changedProps) {
+    super.updated(changedProps);
+    if (changedProps.has("hass") && !this._subscription) {
+      this._subscribe();
+    }
+  }
+
   disconnectedCallback() {
     super.disconnectedCallback();
+    this._unsubscribe();
     if (this._animationFrame) {
       cancelAnimationFrame(this._animationFrame);
       this._animationFrame = null;
@@ -687,31 +699,115 @@ class PrintAssistPanel extends LitElement {
     updateNowLine();
   }
 
+  _subscribe() {
+    if (!this.hass || this._subscription) return;
+
+    this._subscription = this.hass.connection.subscribeMessage(
+      (message) => this._handleUpdate(message),
+      { type: "printassist/subscribe" },
+    );
+    this._subscription.catch((err) => {
+      console.error("Failed to subscribe to PrintAssist updates:", err);
+      this._subscription = null;
+      this._loadData();
+    });
+  }
+
+  _unsubscribe() {
+    if (!this._subscription) return;
+    this._subscription.then((unsub) => unsub()).catch(() => {});
+    this._subscription = null;
+  }
+
+  _handleUpdate(message) {
+    if (message.type === "end") {
+      // The integration reloaded; the next hass update subscribes again.
+      this._unsubscribe();
+      return;
+    }
+    if (message.type === "snapshot") {
+      this._setData(message.data);
+    } else if (message.type === "delta") {
+      if (!this._data || this._data.revision !== message.delta.base_revision) {
+        this._loadData();
+        return;
+      }
+      this._setData(this._applyDelta(this._data, message.delta));
+    }
+  }
+
+  _applyDelta(data, delta) {
+    const keys = {
+      projects: "id",
+      plates: "id",
+      jobs: "id",
+      unavailability_windows: "id",
+      schedule: "job_id",
+    };
+    const result = { ...data, ...delta.fields, revision: delta.revision };
+    for (const [name, entry] of Object.entries(delta.collections)) {
+      const key = keys[name];
+      const changed = new Map(entry.changed.map((item) => [item[key], item]));
+      const removed = new Set(entry.removed);
+      const items = [];
+      for (const item of data[name] || []) {
+        if (removed.has(item[key])) continue;
+        if (changed.has(item[key])) {
+          items.push(changed.get(item[key]));
+          changed.delete(item[key]);
+        } else {
+          items.push(item);
+        }
+      }
+      items.push(...changed.values());
+      if (entry.order) {
+        const byKey = new Map(items.map((item) => [item[key], item]));
+        result[name] = entry.order.map((k) => byKey.get(k));
+      } else {
+        result[name] = items;
+      }
+    }
+    return result;
+  }
+
+  _setData(result) {
+    this._data = result;
+    this._projects = result?.projects || [];
+    this._plates = result?.plates || [];
+    this._jobs = result?.jobs || [];
+    this._schedule = result?.schedule || [];
+    this._unavailability = result?.unavailability_windows || [];
+    this._computedAt = result?.computed_at || null;
+    this._nextBreakpoint = result?.next_breakpoint || null;
+    this._unknownPrint = result?.unknown_print || null;
+    if (this._selectedProject) {
+      this._selectedProject =
+        this._projects.find((p) => p.id === this._selectedProject.id) || this._selectedProject;
+    }
+  }
+
   async _loadData() {
     if (!this.hass) return;
 
     try {
-      const result = await this.hass.connection.sendMessagePromise({
-        type: "printassist/get_data",
-      });
-      this._projects = result.projects || [];
-      this._plates = result.plates || [];
-      this._jobs = result.jobs || [];
-      this._schedule = result.schedule || [];
-      this._unavailability = result.unavailability_windows || [];
-      this._computedAt = result.computed_at || null;
-      this._nextBreakpoint = result.next_breakpoint || null;
-      this._unknownPrint = result.unknown_print || null;
+      const message = { type: "printassist/get_data" };
+      if (this._data) {
+        message.since_revision = this._data.revision;
+        message.since_epoch = this._data.epoch;
+      }
+      const result = await this.hass.connection.sendMessagePromise(message);
+      if (result.unchanged) return;
+      if (result.delta && this._data?.revision === result.delta.base_revision) {
+        this._setData(this._applyDelta(this._data, result.delta));
+      } else if (result.delta) {
+        this._data = null;
+        await this._loadData();
+      } else {
+        this._setData(result);
+      }
     } catch (err) {
       console.error("Failed to load PrintAssist data:", err);
-      this._projects = [];
-      this._plates = [];
-      this._jobs = [];
-      this._schedule = [];
-      this._unavailability = [];
-      this._computedAt = null;
-      this._nextBreakpoint = null;
-      this._unknownPrint = null;
+      this._setData(null);
     }
   }
 
@@ -755,7 +851,6 @@ class PrintAssistPanel extends LitElement {
     if (!name) return;
 
     await this.hass.callService("printassist", "create_project", { name });
-    await this._loadData();
   }
 
   async _deleteProject(projectId, e) {
@@ -764,7 +859,6 @@ class PrintAssistPanel extends LitElement {
 
     await this.hass.callService("printassist", "delete_project", { project_id: projectId });
     this._goBack();
-    setTimeout(() => this._loadData(), 500);
   }
 
   async _handleFileUpload(e) {
@@ -772,54 +866,120 @@ class PrintAssistPanel extends LitElement {
     if (!files?.length || !this._selectedProject) return;
 
     this._uploading = true;
+    this._uploadProgress = 0;
 
+    try {
+      if (files.length > 1) {
+        await this._uploadFiles(files, this._selectedProject.id);
+      } else {
+        await this._uploadFile(files[0], this._selectedProject.id);
+      }
+    } catch (err) {
+      console.error("Upload failed:", err);
+      alert("Upload failed: " + err.message);
+    }
+
+    this._uploading = false;
+  }
+
+  async _uploadFiles(files, projectId) {
+    const formData = new FormData();
+    formData.append("project_id", projectId);
     for (const file of files) {
-      const formData = new FormData();
-      formData.append("project_id", this._selectedProject.id);
       formData.append("file", file);
+    }
 
-      try {
-        const response = await fetch("/api/printassist/upload", {
-          method: "POST",
-          body: formData,
-          headers: { Authorization: `Bearer ${this.hass.auth.data.access_token}` },
-        });
+    const response = await fetch("/api/printassist/upload/bulk", {
+      method: "POST",
+      body: formData,
+      headers: { Authorization: `Bearer ${this.hass.auth.data.access_token}` },
+    });
+    const result = await response.json();
+    if (!response.ok) {
+      throw new Error(result.error || "Upload failed");
+    }
 
-        if (!response.ok) {
-          const error = await response.json();
-          throw new Error(error.error || "Upload failed");
-        }
+    const failed = result.files.filter((f) => f.error);
+    if (failed.length) {
+      alert(
+        "Some files could not be imported:\n" +
+          failed.map((f) => `${f.filename}: ${f.error}`).join("\n"),
+      );
+    }
+  }
 
-        await this._loadData();
-      } catch (err) {
-        console.error("Upload failed:", err);
-        alert("Upload failed: " + err.message);
-      }
+  async _uploadRequest(path, options = {}) {
+    const response = await fetch(`/api/printassist/upload_sessions${path}`, {
+      ...options,
+      headers: {
+        Authorization: `Bearer ${this.hass.auth.data.access_token}`,
+        ...(options.headers || {}),
+      },
+    });
+    const result = await response.json();
+    if (!response.ok && response.status !== 409) {
+      throw new Error(result.error || "Upload failed");
     }
+    return { status: response.status, result };
+  }
 
-    this._uploading = false;
+  async _uploadFile(file, projectId) {
+    const json = { "Content-Type": "application/json" };
+    const { result: session } = await this._uploadRequest("", {
+      method: "POST",
+      headers: json,
+      body: JSON.stringify({ filename: file.name, size: file.size }),
+    });
+    const id = session.session_id;
+
+    try {
+      let offset = 0;
+      let retries = 0;
+      while (offset < file.size) {
+        const chunk = file.slice(offset, offset + session.chunk_size);
+        try {
+          const { result } = await this._uploadRequest(`/${id}?offset=${offset}`, {
+            method: "PUT",
+            body: chunk,
+          });
+          offset = result.offset;
+          retries = 0;
+        } catch (err) {
+          if (++retries > 3) throw err;
+          // Resume from wherever the server got to before the failure.
+          offset = (await this._uploadRequest(`/${id}`)).result.offset;
+        }
+        this._uploadProgress = Math.round((offset / file.size) * 100);
+      }
+
+      const { status, result } = await this._uploadRequest(`/${id}`, {
+        method: "POST",
+        headers: json,
+        body: JSON.stringify({ project_id: projectId }),
+      });
+      if (status !== 200) throw new Error(result.error || "Upload failed");
+    } catch (err) {
+      this._uploadRequest(`/${id}`, { method: "DELETE" }).catch(() => {});
+      throw err;
+    }
   }
 
   async _setQuantity(plateId, quantity) {
     if (quantity < 0) return;
     await this.hass.callService("printassist", "set_quantity", { plate_id: plateId, quantity });
-    setTimeout(() => this._loadData(), 300);
   }
 
   async _deletePlate(plateId) {
     if (!confirm("Delete this plate?")) return;
     await this.hass.callService("printassist", "delete_plate", { plate_id: plateId });
-    setTimeout(() => this._loadData(), 500);
   }
 
   async _startJob(jobId) {
     await this.hass.callService("printassist", "start_job", { job_id: jobId });
-    setTimeout(() => this._loadData(), 500);
   }
 
   async _completeJob(jobId) {
     await this.hass.callService("printassist", "complete_job", { job_id: jobId });
-    setTimeout(() => this._loadData(), 500);
   }
 
   async _failJob(jobId) {
@@ -828,17 +988,14 @@ class PrintAssistPanel extends LitElement {
       job_id: jobId,
       failure_reason: reason || undefined,
     });
-    setTimeout(() => this._loadData(), 500);
   }
 
   async _addUnavailability(start, end) {
     await this.hass.callService("printassist", "add_unavailability", { start, end });
-    setTimeout(() => this._loadData(), 500);
   }
 
   async _removeUnavailability(windowId) {
     await this.hass.callService("printassist", "remove_unavailability", { window_id: windowId });
-    setTimeout(() => this._loadData(), 500);
   }
 
   _addPresetUnavailability(preset) {
@@ -1011,7 +1168,7 @@ class PrintAssistPanel extends LitElement {
         @drop=${this._handleDrop}
       >
         <input type="file" id="file-input" accept=".3mf,.gcode" multiple @change=${this._handleFileUpload} />
-        ${this._uploading ? "Uploading..." : "Drop 3MF or gcode files here, or click to browse"}
+        ${this._uploading ? `Uploading... ${this._uploadProgress}%` : "Drop 3MF or gcode files here, or click to browse"}
       </div>
 
       <div class="plate-list">
@@ -1038,7 +1195,12 @@ class PrintAssistPanel extends LitElement {
                       ${queuedJobs.length} queued
                       ${printingJob ? html`<span class="status-badge status-printing">Printing</span>` : ""}
                     </div>
-                    <div class="plate-meta">${plate.source_filename}</div>
+                    <div class="plate-meta">
+                      ${plate.source_filename}
+                      ${plate.filament_weight_grams != null
+                        ? html` · ${plate.filament_weight_grams.toFixed(1)} g` : ""}
+                      ${plate.filament_types?.length ? html` · ${plate.filament_types.join(", ")}` : ""}
+                    </div>
                   </div>
                   <div class="plate-actions">
                     <div class="quantity-control">
@@ -0,0 +1,56 @@
+"""Tests for the scheduler benchmark runner."""
+
+from dataclasses import replace
+
+import sys
+sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
+
+from benchmarks.bench_scheduler import (
+    SCENARIOS,
+    find_regressions,
+    load_baseline,
+    machine_factor,
+    run_scenario,
+)
+
+
+class TestBenchScheduler:
+    def test_tiny_scenario_runs(self):
+        result = run_scenario(SCENARIOS[0])
+        assert result.scheduled == SCENARIOS[0].jobs
+        assert result.wall_ms > 0
+        assert result.peak_kib > 0
+
+    def test_regressions_detected(self):
+        result = run_scenario(SCENARIOS[0])
+        baseline = {
+            f"{result.scenario}:{result.mode}": {
+                "wall_ms": result.wall_ms, "peak_kib": result.peak_kib, "scheduled": result.scheduled,
+            }
+        }
+        assert find_regressions([result], baseline, tolerance=1.5) == []
+
+        slower = replace(result, wall_ms=result.wall_ms * 2 + 10, scheduled=0)
+        assert len(find_regressions([slower], baseline, tolerance=1.5)) == 2
+
+    def test_slower_machine_scales_limits(self):
+        result = run_scenario(SCENARIOS[0])
+        baseline = {
+            f"{result.scenario}:{result.mode}": {
+                "wall_ms": 10.0, "peak_kib": result.peak_kib, "scheduled": result.scheduled,
+            }
+        }
+        slower = replace(result, wall_ms=30.0)
+        assert len(find_regressions([slower], baseline, tolerance=1.5)) == 1
+
+        factor = machine_factor(reference_ms=200.0, baseline_reference_ms=100.0)
+        assert factor == 2.0
+        assert find_regressions([slower], baseline, tolerance=1.5, factor=factor) == []
+
+    def test_machine_factor_without_reference(self):
+        assert machine_factor(100.0, None) == 1.0
+
+    def test_baseline_records_reference(self):
+        baseline, reference_ms = load_baseline()
+        assert baseline
+        assert reference_ms > 0
@@ -0,0 +1,59 @@
+"""Tests for the PrintAssist config and options flows."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+import sys
+sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
+
+from custom_components.printassist import _entry_setting
+from custom_components.printassist.config_flow import PrintAssistOptionsFlow
+from custom_components.printassist.const import (
+    CONF_REFRESH_DEBOUNCE,
+    CONF_SCHEDULE_MODE,
+    DEFAULT_REFRESH_DEBOUNCE,
+    SCHEDULE_MODE_DEADLINE,
+    SCHEDULE_MODE_PORTFOLIO,
+    SCHEDULE_MODE_PRIORITY,
+)
+
+
+def make_entry(data, options=None):
+    entry = MagicMock()
+    entry.data = data
+    entry.options = options or {}
+    return entry
+
+
+@pytest.mark.asyncio
+async def test_options_default_to_setup_data():
+    flow = PrintAssistOptionsFlow(make_entry({CONF_SCHEDULE_MODE: SCHEDULE_MODE_DEADLINE}))
+
+    result = await flow.async_step_init()
+
+    assert result["step_id"] == "init"
+    assert result["data_schema"]({}) == {
+        CONF_SCHEDULE_MODE: SCHEDULE_MODE_DEADLINE,
+        CONF_REFRESH_DEBOUNCE: DEFAULT_REFRESH_DEBOUNCE,
+    }
+
+
+@pytest.mark.asyncio
+async def test_options_are_saved():
+    flow = PrintAssistOptionsFlow(make_entry({}))
+    user_input = {CONF_SCHEDULE_MODE: SCHEDULE_MODE_PORTFOLIO, CONF_REFRESH_DEBOUNCE: 1.0}
+
+    result = await flow.async_step_init(user_input)
+
+    assert result["data"] == user_input
+
+
+def test_entry_setting_prefers_options():
+    entry = make_entry(
+        {CONF_SCHEDULE_MODE: SCHEDULE_MODE_DEADLINE, CONF_REFRESH_DEBOUNCE: 2.0},
+        {CONF_SCHEDULE_MODE: SCHEDULE_MODE_PORTFOLIO},
+    )
+    assert _entry_setting(entry, CONF_SCHEDULE_MODE, SCHEDULE_MODE_PRIORITY) == SCHEDULE_MODE_PORTFOLIO
+    assert _entry_setting(entry, CONF_REFRESH_DEBOUNCE, DEFAULT_REFRESH_DEBOUNCE) == 2.0
+    assert _entry_setting(make_entry({}), CONF_SCHEDULE_MODE, SCHEDULE_MODE_PRIORITY) == SCHEDULE_MODE_PRIORITY
@@ -1,24 +1,41 @@
 """Tests for PrintAssist coordinator."""
 
+import asyncio
+from collections import deque
+import uuid
 import pytest
+import pytest_asyncio
 from datetime import datetime, timezone
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import sys
 sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
 
 with patch("homeassistant.helpers.update_coordinator.DataUpdateCoordinator.__init__", return_value=None):
-    from custom_components.printassist.coordinator import PrintAssistCoordinator
+    from custom_components.printassist.coordinator import DELTA_HISTORY, PrintAssistCoordinator
+from custom_components.printassist.const import JOB_STATUS_PRINTING, SCHEDULE_MODE_PRIORITY
+from custom_components.printassist.store import StoreSnapshot
+from custom_components.printassist.timing import StageTimings
+
+
+def make_snapshot(active_job=None, plates_by_id=None, projects=(), revision=0):
+    plates_by_id = plates_by_id or {}
+    return StoreSnapshot(
+        revision=revision,
+        projects=tuple(projects),
+        plates=tuple(plates_by_id.values()),
+        plates_by_id=plates_by_id,
+        jobs=(active_job,) if active_job else (),
+        jobs_by_status={JOB_STATUS_PRINTING: (active_job,)} if active_job else {},
+        progress_by_project={p.id: (0, 0) for p in projects},
+        unavailability_windows=(),
+    )
 
 
 @pytest.fixture
 def mock_store():
     store = MagicMock()
-    store.get_queued_jobs = MagicMock(return_value=[])
-    store.get_plates = MagicMock(return_value=[])
-    store.get_unavailability_windows = MagicMock(return_value=[])
-    store.get_active_job = MagicMock(return_value=None)
-    store.get_plate = MagicMock(return_value=None)
+    store.snapshot = MagicMock(return_value=make_snapshot())
     return store
 
 
@@ -34,8 +51,23 @@ def make_coordinator(mock_store, mock_printer_monitor=None):
     coordinator = object.__new__(PrintAssistCoordinator)
     coordinator._store = mock_store
     coordinator._printer_monitor = mock_printer_monitor
+    coordinator._schedule_mode = SCHEDULE_MODE_PRIORITY
     coordinator._schedule_result = None
     coordinator._last_input_hash = None
+    coordinator._schedule_fingerprint = None
+    coordinator.hass = MagicMock()
+    coordinator.hass.async_add_executor_job = AsyncMock(side_effect=lambda fn, *args: fn(*args))
+    coordinator._forecast = None
+    coordinator._forecast_key = None
+    coordinator._schedule_store = MagicMock()
+    coordinator._schedule_dicts = None
+    coordinator.timings = StageTimings()
+    coordinator.data = None
+    coordinator.epoch = uuid.uuid4().hex
+    coordinator._payload = None
+    coordinator._payload_key = None
+    coordinator._deltas = deque(maxlen=DELTA_HISTORY)
+    coordinator._delta_json = {}
     return coordinator
 
 
@@ -58,7 +90,7 @@ class TestInputHashWithActiveJobEnd:
         active_job.id = "job-1"
         active_job.plate_id = "plate-1"
         active_job.started_at = "2024-01-15T16:00:00+00:00"
-        mock_store.get_active_job.return_value = active_job
+        mock_store.snapshot.return_value = make_snapshot(active_job)
 
         mock_printer_monitor.get_blocking_end_time.return_value = None
         end_time = datetime(2024, 1, 15, 18, 0, 0, tzinfo=timezone.utc)
@@ -95,11 +127,10 @@ class TestInputHashWithActiveJobEnd:
         active_job.id = "job-1"
         active_job.plate_id = "plate-1"
         active_job.started_at = "2024-01-15T16:00:00"
-        mock_store.get_active_job.return_value = active_job
 
         plate = MagicMock()
         plate.estimated_duration_seconds = 3600
-        mock_store.get_plate.return_value = plate
+        mock_store.snapshot.return_value = make_snapshot(active_job, {"plate-1": plate})
 
         mock_printer_monitor.get_blocking_end_time.return_value = None
         mock_printer_monitor.get_end_time.return_value = None
@@ -111,3 +142,327 @@ class TestInputHashWithActiveJobEnd:
         hash2 = coordinator._compute_input_hash()
 
         assert hash1 != hash2
+
+    def test_hash_follows_store_revision(self, mock_store):
+        coordinator = make_coordinator(mock_store)
+        hash1 = coordinator._compute_input_hash()
+
+        mock_store.snapshot.return_value = make_snapshot(revision=1)
+        hash2 = coordinator._compute_input_hash()
+
+        assert hash1 != hash2
+
+
+class TestProjectEta:
+    def test_single_pass_eta(self, mock_store):
+        from custom_components.printassist.scheduler import PrintScheduler
+        from custom_components.printassist.store import Job, Plate, Project
+
+        now = datetime(2024, 1, 15, 8, 0, 0, tzinfo=timezone.utc)
+        projects = [
+            Project(id="a", name="A", created_at="2024-01-01T00:00:00"),
+            Project(id="b", name="B", created_at="2024-01-01T00:00:00"),
+        ]
+        plates = {
+            "p1": Plate(id="p1", project_id="a", source_filename="a.3mf", plate_number=1,
+                        name="P1", gcode_path="g1", estimated_duration_seconds=3600),
+            "p2": Plate(id="p2", project_id="a", source_filename="a.3mf", plate_number=2,
+                        name="P2", gcode_path="g2", estimated_duration_seconds=1800),
+        }
+        jobs = [
+            Job(id="j1", plate_id="p1", status="queued", created_at="2024-01-01T00:00:00"),
+            Job(id="j2", plate_id="p2", status="queued", created_at="2024-01-01T00:00:00"),
+        ]
+        schedule = PrintScheduler(jobs, plates, [], current_time=now).calculate_schedule()
+
+        coordinator = make_coordinator(mock_store)
+        eta = coordinator._build_project_eta(
+            tuple(projects), [(j, plates[j.plate_id]) for j in jobs], schedule
+        )
+
+        assert eta["a"]["remaining_seconds"] == 5400
+        assert eta["a"]["completion"] == datetime(2024, 1, 15, 9, 30, 0, tzinfo=timezone.utc)
+        assert eta["b"] == {
+            "name": "B", "completion": None, "remaining_seconds": 0, "queued": 0, "scheduled": 0,
+        }
+
+
+class TestScheduleSnapshot:
+    def _schedule(self):
+        from custom_components.printassist.scheduler import PrintScheduler
+        from custom_components.printassist.store import Job, Plate
+
+        now = datetime(2024, 1, 15, 8, 0, 0, tzinfo=timezone.utc)
+        plates = {
+            "p1": Plate(id="p1", project_id="a", source_filename="a.3mf", plate_number=1,
+                        name="P1", gcode_path="g1", estimated_duration_seconds=3600,
+                        due_date="2024-01-16T00:00:00+00:00"),
+        }
+        jobs = [Job(id="j1", plate_id="p1", status="queued", created_at="2024-01-01T00:00:00")]
+        return PrintScheduler(jobs, plates, [], current_time=now).calculate_schedule()
+
+    @pytest.mark.asyncio
+    async def test_restore_serves_stale_snapshot(self, mock_store):
+        schedule = self._schedule()
+        source = make_coordinator(mock_store)
+        source._schedule_result = schedule
+        source._last_input_hash = "abc"
+        source._forecast = {"samples": 10, "jobs": {}, "projects": {}}
+
+        coordinator = make_coordinator(mock_store)
+        coordinator._schedule_store.async_load = AsyncMock(return_value=source._schedule_store_data())
+
+        assert await coordinator.async_restore_schedule()
+        assert coordinator.data["stale"] is True
+        assert coordinator.data["next_scheduled"] == schedule.jobs[0]
+        assert coordinator.data["schedule"] == [sj.to_dict() for sj in schedule.jobs]
+        assert coordinator.data["forecast"] == source._forecast
+        # A restored snapshot never stands in for a fresh computation.
+        assert coordinator._schedule_result is None
+
+    @pytest.mark.asyncio
+    async def test_restore_adopts_schedule_for_unchanged_inputs(self, mock_store):
+        schedule = self._schedule()
+        source = make_coordinator(mock_store)
+        source._schedule_result = schedule
+        source._schedule_fingerprint = source._input_fingerprint(make_snapshot(revision=7))
+        source._forecast = {"samples": 10, "jobs": {}, "projects": {}}
+
+        # A fresh process starts its revisions over, but the content is the same.
+        coordinator = make_coordinator(mock_store)
+        coordinator._schedule_store.async_load = AsyncMock(return_value=source._schedule_store_data())
+
+        assert await coordinator.async_restore_schedule()
+        assert coordinator.data["stale"] is False
+        assert coordinator._schedule_result == schedule
+        assert not coordinator._needs_recompute(coordinator._compute_input_hash())
+        assert coordinator._forecast == source._forecast
+
+    @pytest.mark.asyncio
+    async def test_restore_marks_changed_inputs_stale(self, mock_store):
+        from custom_components.printassist.store import Project
+
+        source = make_coordinator(mock_store)
+        source._schedule_result = self._schedule()
+        source._schedule_fingerprint = source._input_fingerprint(make_snapshot(projects=[
+            Project(id="a", name="A", created_at="2024-01-01T00:00:00"),
+        ]))
+
+        coordinator = make_coordinator(mock_store)
+        coordinator._schedule_store.async_load = AsyncMock(return_value=source._schedule_store_data())
+
+        assert await coordinator.async_restore_schedule()
+        assert coordinator.data["stale"] is True
+        assert coordinator._schedule_result is None
+
+    @pytest.mark.asyncio
+    async def test_restore_without_snapshot(self, mock_store):
+        coordinator = make_coordinator(mock_store)
+        coordinator._schedule_store.async_load = AsyncMock(return_value=None)
+        assert not await coordinator.async_restore_schedule()
+
+    @pytest.mark.asyncio
+    async def test_restore_ignores_corrupt_snapshot(self, mock_store):
+        coordinator = make_coordinator(mock_store)
+        coordinator._schedule_store.async_load = AsyncMock(return_value={"result": {"jobs": []}})
+        assert not await coordinator.async_restore_schedule()
+
+    @pytest.mark.asyncio
+    async def test_recompute_persists_snapshot(self, mock_store):
+        coordinator = make_coordinator(mock_store)
+        coordinator._portfolio = None
+        await coordinator._async_run_scheduler(mock_store.snapshot())
+        coordinator._schedule_store.async_delay_save.assert_called_once()
+        # The full-snapshot fingerprint is computed off the event loop.
+        coordinator.hass.async_add_executor_job.assert_awaited_once_with(
+            coordinator._input_fingerprint, mock_store.snapshot()
+        )
+        assert coordinator._schedule_store_data()["input_hash"] == coordinator._input_fingerprint(
+            mock_store.snapshot()
+        )
+
+
+class TestDebouncedScheduleRefresh:
+    @pytest_asyncio.fixture
+    async def hass(self, tmp_path):
+        from homeassistant.core import HomeAssistant
+
+        hass = HomeAssistant(str(tmp_path))
+        yield hass
+        await hass.async_stop(force=True)
+
+    def _coordinator(self, hass, mock_store, refresh):
+        from homeassistant.helpers.debounce import Debouncer
+
+        coordinator = make_coordinator(mock_store)
+        coordinator.hass = hass
+        coordinator.async_refresh = refresh
+        coordinator._schedule_refresh_requested = False
+        coordinator._schedule_refresh_waiters = []
+        coordinator._schedule_debouncer = Debouncer(
+            hass, MagicMock(), cooldown=0.05, immediate=False,
+            function=coordinator._async_debounced_refresh,
+        )
+        return coordinator
+
+    @pytest.mark.asyncio
+    async def test_requests_coalesce(self, hass, mock_store):
+        refresh = AsyncMock()
+        coordinator = self._coordinator(hass, mock_store, refresh)
+
+        for _ in range(30):
+            await coordinator.async_request_schedule_refresh()
+        assert refresh.await_count == 0
+
+        await coordinator.async_request_schedule_refresh(wait=True)
+        assert refresh.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_request_during_refresh_runs_again(self, hass, mock_store):
+        refresh_count = 0
+        late_request = None
+
+        async def refresh():
+            nonlocal refresh_count, late_request
+            refresh_count += 1
+            if refresh_count == 1:
+                late_request = hass.async_create_task(
+                    coordinator.async_request_schedule_refresh(wait=True)
+                )
+                await asyncio.sleep(0)
+
+        coordinator = self._coordinator(hass, mock_store, refresh)
+        await coordinator.async_request_schedule_refresh(wait=True)
+        await asyncio.wait_for(late_request, timeout=1)
+
+        assert refresh_count == 2
+
+
+class TestDataPayload:
+    def test_payload_is_cached_per_revision(self, mock_store, mock_printer_monitor):
+        import json
+        from custom_components.printassist.store import Project
+
+        project = Project(id="a", name="A", created_at="2024-01-01T00:00:00")
+        mock_store.revision = 1
+        mock_store.snapshot.return_value = make_snapshot(projects=[project], revision=1)
+        mock_printer_monitor.get_unknown_print_info.return_value = None
+
+        coordinator = make_coordinator(mock_store, mock_printer_monitor)
+        coordinator.data = {
+            "schedule": [], "computed_at": "2024-01-15T08:00:00+00:00",
+            "lateness_by_project": {"a": 60}, "stale": False,
+        }
+
+        first = coordinator.get_payload()
+        assert coordinator.get_payload() is first
+        assert first.revision == 1
+        decoded = json.loads(first.json)
+        assert decoded == first.data
+        assert decoded["projects"][0]["projected_lateness_seconds"] == 60
+        assert decoded["unknown_print"] is None
+
+        mock_store.revision = 2
+        second = coordinator.get_payload()
+        assert second is not first
+        assert second.revision == 2
+
+        mock_printer_monitor.get_unknown_print_info.return_value = {"task_name": "x"}
+        third = coordinator.get_payload()
+        assert third.revision == 3
+        assert third.data["unknown_print"] == {"task_name": "x"}
+        assert coordinator.get_payload() is third
+
+    def test_schedule_attributes_shared_with_payload(self, mock_store, mock_printer_monitor):
+        from custom_components.printassist.sensor import PrintAssistScheduleSensor
+
+        mock_printer_monitor.get_unknown_print_info.return_value = None
+        schedule = TestScheduleSnapshot()._schedule()
+        coordinator = make_coordinator(mock_store, mock_printer_monitor)
+        coordinator.data = coordinator._build_data(mock_store.snapshot(), schedule, None)
+        sensor = object.__new__(PrintAssistScheduleSensor)
+        sensor.coordinator = coordinator
+
+        jobs = sensor.extra_state_attributes["jobs"]
+        assert jobs == [sj.to_dict() for sj in schedule.jobs]
+        assert coordinator.get_payload().data["schedule"] is jobs
+
+        # Rebuilding data for the same schedule does not serialize it again.
+        coordinator.data = coordinator._build_data(mock_store.snapshot(), schedule, None)
+        assert sensor.extra_state_attributes["jobs"] is jobs
+
+    def test_delta_between_revisions(self, mock_store, mock_printer_monitor):
+        import json
+        from custom_components.printassist.delta import apply_delta
+        from custom_components.printassist.store import Project
+
+        projects = [Project(id="a", name="A", created_at="2024-01-01T00:00:00")]
+        mock_store.revision = 1
+        mock_store.snapshot.return_value = make_snapshot(projects=projects, revision=1)
+        mock_printer_monitor.get_unknown_print_info.return_value = None
+
+        coordinator = make_coordinator(mock_store, mock_printer_monitor)
+        coordinator.data = {"schedule": [], "computed_at": "2024-01-15T08:00:00+00:00"}
+        first = coordinator.get_payload()
+
+        for revision in range(2, 5):
+            projects = projects + [
+                Project(id=f"p{revision}", name="P", created_at="2024-01-01T00:00:00")
+            ]
+            mock_store.revision = revision
+            mock_store.snapshot.return_value = make_snapshot(projects=projects, revision=revision)
+            coordinator.get_payload()
+        current = coordinator.get_payload()
+
+        delta = coordinator.get_delta(first.revision, first.epoch)
+        assert delta["revision"] == current.revision
+        assert [p["id"] for p in delta["collections"]["projects"]["changed"]] == ["p2", "p3", "p4"]
+        assert apply_delta(first.data, delta) == current.data
+        assert json.loads(coordinator.get_delta_json(first.revision, first.epoch)) == delta
+        assert (
+            coordinator.get_delta_json(first.revision, first.epoch)
+            is coordinator.get_delta_json(first.revision, first.epoch)
+        )
+        assert coordinator.get_delta(current.revision, coordinator.epoch)["collections"] == {}
+        assert coordinator.get_delta(0, coordinator.epoch) is None
+
+    def test_delta_history_is_bounded(self, mock_store, mock_printer_monitor):
+        mock_printer_monitor.get_unknown_print_info.return_value = None
+        coordinator = make_coordinator(mock_store, mock_printer_monitor)
+        coordinator.data = {"schedule": []}
+
+        for revision in range(DELTA_HISTORY + 2):
+            mock_store.revision = revision
+            mock_store.snapshot.return_value = make_snapshot(revision=revision)
+            coordinator.get_payload()
+
+        assert coordinator.get_delta(1, coordinator.epoch) is None
+        assert coordinator.get_delta(2, coordinator.epoch) is not None
+
+    def test_restart_serves_full_payload(self, mock_hass, mock_store, mock_printer_monitor):
+        import json
+        from custom_components.printassist import ws_get_data
+        from custom_components.printassist.const import DOMAIN
+
+        mock_printer_monitor.get_unknown_print_info.return_value = None
+        mock_store.revision = 1
+        before = make_coordinator(mock_store, mock_printer_monitor)
+        before.data = {"schedule": [], "computed_at": "2024-01-15T08:00:00+00:00"}
+        held = before.get_payload()
+
+        # The new process counts revisions from 1 again, so the numbers collide.
+        after = make_coordinator(mock_store, mock_printer_monitor)
+        after.data = {"schedule": [], "computed_at": "2024-01-15T09:00:00+00:00"}
+        current = after.get_payload()
+        assert current.revision == held.revision
+        assert after.get_delta(held.revision, held.epoch) is None
+        assert after.get_delta_json(held.revision, held.epoch) is None
+
+        mock_hass.data = {DOMAIN: {"coordinator": after}}
+        connection = MagicMock()
+        ws_get_data(mock_hass, connection, {
+            "id": 1, "since_revision": held.revision, "since_epoch": held.epoch,
+        })
+        result = json.loads(connection.send_message.call_args.args[0])["result"]
+        assert result == current.data
+        assert result["epoch"] == after.epoch
@@ -0,0 +1,109 @@
+"""Tests for payload deltas."""
+
+import random
+
+import pytest
+
+import sys
+sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
+
+from custom_components.printassist.delta import apply_delta, diff_payload, merge_deltas
+
+
+def make_payload(revision, projects=(), jobs=(), schedule=(), **fields):
+    return {
+        "revision": revision,
+        "projects": [{"id": p, "name": p.upper()} for p in projects],
+        "plates": [],
+        "jobs": [{"id": j, "status": s} for j, s in jobs],
+        "schedule": [{"job_id": j, "start": t} for j, t in schedule],
+        "unavailability_windows": [],
+        "computed_at": None,
+        **fields,
+    }
+
+
+def evolve(rng, payload, revision):
+    """Random next payload: records are dropped, edited or appended, as in the store."""
+    counter = revision * 100
+    projects = [p["id"] for p in payload["projects"] if rng.random() < 0.8]
+    projects += [f"p{counter + i}" for i in range(rng.randint(0, 2))]
+    jobs = [
+        (j["id"], rng.choice(["queued", "printing", "completed"]) if rng.random() < 0.3
+         else j["status"])
+        for j in payload["jobs"] if rng.random() < 0.8
+    ]
+    jobs += [(f"j{counter + i}", "queued") for i in range(rng.randint(0, 4))]
+    schedule = [(j, rng.randint(0, 3)) for j, status in jobs if status == "queued"]
+    if rng.random() < 0.5:
+        rng.shuffle(schedule)
+    return make_payload(
+        revision, projects, jobs, schedule,
+        computed_at=rng.choice([None, "t1", "t2"]),
+        stale=rng.random() < 0.5,
+    )
+
+
+def random_history(rng, length):
+    payloads = [evolve(rng, make_payload(0), 1)]
+    for revision in range(2, length + 1):
+        payloads.append(evolve(rng, payloads[-1], revision))
+    return payloads
+
+
+class TestDiffPayload:
+    def test_unchanged_payload_has_empty_delta(self):
+        payload = make_payload(1, ["a"], [("j1", "queued")], [("j1", 0)])
+        delta = diff_payload(payload, {**payload, "revision": 2})
+        assert delta == {"base_revision": 1, "revision": 2, "collections": {}, "fields": {}}
+
+    def test_only_changed_records_are_sent(self):
+        old = make_payload(1, ["a", "b"], [("j1", "queued"), ("j2", "queued")])
+        new = make_payload(2, ["a", "c"], [("j1", "queued"), ("j2", "printing")],
+                           computed_at="t1")
+        delta = diff_payload(old, new)
+
+        assert delta["collections"]["projects"] == {
+            "changed": [{"id": "c", "name": "C"}], "removed": ["b"],
+        }
+        assert delta["collections"]["jobs"]["changed"] == [{"id": "j2", "status": "printing"}]
+        assert delta["fields"] == {"computed_at": "t1"}
+
+    def test_schedule_reorder_carries_order(self):
+        old = make_payload(1, schedule=[("j1", 0), ("j2", 1)])
+        new = make_payload(2, schedule=[("j2", 1), ("j1", 0)])
+        delta = diff_payload(old, new)
+
+        assert delta["collections"]["schedule"] == {
+            "changed": [], "removed": [], "order": ["j2", "j1"],
+        }
+        assert apply_delta(old, delta) == new
+
+
+class TestRoundTrip:
+    @pytest.mark.parametrize("seed", range(100))
+    def test_apply_diff_reproduces_payload(self, seed):
+        rng = random.Random(seed)
+        old, new = random_history(rng, 2)
+        assert apply_delta(old, diff_payload(old, new)) == new
+
+    @pytest.mark.parametrize("seed", range(100))
+    def test_merged_deltas_equal_direct_diff(self, seed):
+        rng = random.Random(seed)
+        payloads = random_history(rng, 5)
+        deltas = [diff_payload(a, b) for a, b in zip(payloads, payloads[1:])]
+
+        merged = deltas[0]
+        for delta in deltas[1:]:
+            merged = merge_deltas(merged, delta)
+
+        assert merged["base_revision"] == 1
+        assert merged["revision"] == 5
+        assert apply_delta(payloads[0], merged) == payloads[-1]
+
+    def test_non_consecutive_deltas_are_rejected(self):
+        a, b, c = make_payload(1), make_payload(2), make_payload(3)
+        with pytest.raises(ValueError):
+            merge_deltas(diff_payload(b, c), diff_payload(a, b))
+        with pytest.raises(ValueError):
+            apply_delta(a, diff_payload(b, c))
@@ -0,0 +1,61 @@
+"""Tests for PrintAssist diagnostics."""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import sys
+sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
+
+from custom_components.printassist.const import DOMAIN
+from custom_components.printassist.diagnostics import async_get_config_entry_diagnostics
+from custom_components.printassist.file_handler import FileHandler
+from custom_components.printassist.store import Plate, PrintAssistStore
+from custom_components.printassist.timing import STAGE_UPDATE, StageTimings
+
+
+@pytest.mark.asyncio
+async def test_diagnostics(mock_hass, tmp_path):
+    mock_hass.config.path = MagicMock(side_effect=lambda *args: str(tmp_path.joinpath(*args)))
+    timings = StageTimings()
+
+    with patch("custom_components.printassist.store.Store") as mock_store_class:
+        mock_store_class.return_value.async_load = AsyncMock(return_value=None)
+        mock_store_class.return_value.async_save = AsyncMock()
+        store = PrintAssistStore(mock_hass, timings)
+        await store.async_load()
+
+    project = await store.async_create_project("Project")
+    plate = Plate.create(project.id, "a.3mf", 1, "A", "gcode-a", 600)
+    plate.quantity_needed = 3
+    await store.async_add_plates([plate])
+
+    file_handler = FileHandler(mock_hass, timings)
+    (tmp_path / ".storage" / "printassist" / "gcode" / "gcode-a.gcode").write_bytes(b"G28\n" * 10)
+    (tmp_path / "www" / "printassist" / "thumbnails" / "nested").mkdir()
+    (tmp_path / "www" / "printassist" / "thumbnails" / "nested" / "t.png").write_bytes(b"PNG")
+
+    coordinator = MagicMock()
+    coordinator.timings = timings
+    coordinator.last_update_success = True
+    timings.record(STAGE_UPDATE, 0.012)
+    mock_hass.data[DOMAIN] = {
+        "coordinator": coordinator,
+        "store": store,
+        "file_handler": file_handler,
+    }
+
+    result = await async_get_config_entry_diagnostics(mock_hass, MagicMock())
+
+    collections = result["store"]["collections"]
+    assert collections["projects"]["count"] == 1
+    assert collections["plates"]["count"] == 1
+    assert collections["jobs"]["count"] == 3
+    assert collections["unavailability_windows"] == {"count": 0, "approx_bytes": sys.getsizeof([])}
+    assert result["store"]["approx_memory_bytes"] > result["store"]["serialized_bytes"] > 0
+    assert result["store"]["revision"] == store.revision
+    assert result["disk_usage"]["gcode"] == {"files": 1, "bytes": 40}
+    assert result["disk_usage"]["thumbnails"] == {"files": 1, "bytes": 3}
+    assert result["disk_usage"]["sources"] == {"files": 0, "bytes": 0}
+    assert result["last_refresh_ms"] == 12
+    assert result["last_save_ms"] is not None
+    assert result["timings"]["store_save"]["count"] == 2
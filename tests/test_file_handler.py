@@ -1,97 +1,162 @@
 """Tests for PrintAssist file handler."""
 
 import pytest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 from pathlib import Path
+import hashlib
 import io
 import zipfile
 
 import sys
 sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
 
-from custom_components.printassist.file_handler import FileHandler
+from custom_components.printassist.file_handler import (
+    GCODE_TAIL_BYTES,
+    FileHandler,
+    GcodeTimeScanner,
+    UploadTooLarge,
+    read_gcode_time,
+)
+
+
+@pytest.fixture
+def disk_file_handler(mock_hass, tmp_path):
+    mock_hass.config.path = MagicMock(side_effect=lambda *args: str(tmp_path.joinpath(*args)))
+    handler = FileHandler(mock_hass)
+    handler._parse_cache_store = MagicMock()
+    return handler
+
+
+async def chunks_of(data, size):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
 
 
 class TestGcodeTimeParsing:
-    @pytest.fixture
-    def file_handler(self, mock_hass):
-        with patch("pathlib.Path.mkdir"):
-            return FileHandler(mock_hass)
+    def parse(self, gcode):
+        return read_gcode_time(io.BytesIO(gcode.encode()))
 
-    def test_parse_bambu_time_format(self, file_handler):
+    def test_parse_bambu_time_format(self):
         gcode = "; estimated printing time (normal mode) = 2h 30m 45s\nG28\n"
-        result = file_handler._parse_time_from_gcode(gcode)
+        result = self.parse(gcode)
         assert result == 2 * 3600 + 30 * 60 + 45
 
-    def test_parse_bambu_time_with_days(self, file_handler):
+    def test_parse_bambu_time_with_days(self):
         gcode = "; estimated printing time (normal mode) = 1d 5h 30m 0s\nG28\n"
-        result = file_handler._parse_time_from_gcode(gcode)
+        result = self.parse(gcode)
         assert result == 1 * 86400 + 5 * 3600 + 30 * 60
 
-    def test_parse_time_seconds_only(self, file_handler):
+    def test_parse_time_seconds_only(self):
         gcode = "; TIME:5400\nG28\n"
-        result = file_handler._parse_time_from_gcode(gcode)
+        result = self.parse(gcode)
         assert result == 5400
 
-    def test_parse_time_estimated_time(self, file_handler):
+    def test_parse_time_estimated_time(self):
         gcode = "; estimated_time: 7200\nG28\n"
-        result = file_handler._parse_time_from_gcode(gcode)
+        result = self.parse(gcode)
         assert result == 7200
 
-    def test_parse_orcaslicer_model_time(self, file_handler):
+    def test_parse_orcaslicer_model_time(self):
         gcode = "; model printing time: 5h 53m 25s; total estimated time: 5h 59m 37s\nG28\n"
-        result = file_handler._parse_time_from_gcode(gcode)
+        result = self.parse(gcode)
         assert result == 5 * 3600 + 53 * 60 + 25
 
-    def test_parse_orcaslicer_total_time(self, file_handler):
+    def test_parse_orcaslicer_total_time(self):
         gcode = "; total estimated time: 2h 15m 30s\nG28\n"
-        result = file_handler._parse_time_from_gcode(gcode)
+        result = self.parse(gcode)
         assert result == 2 * 3600 + 15 * 60 + 30
 
-    def test_no_time_found(self, file_handler):
+    def test_no_time_found(self):
         gcode = "G28\nG1 X0 Y0\n"
-        result = file_handler._parse_time_from_gcode(gcode)
+        result = self.parse(gcode)
         assert result == 0
 
-    def test_parse_only_first_500_lines(self, file_handler):
+    def test_parse_only_first_500_lines(self):
         lines = ["; unrelated comment\n"] * 600
         lines[10] = "; TIME:3600\n"
         lines[550] = "; TIME:7200\n"
         gcode = "".join(lines)
 
-        result = file_handler._parse_time_from_gcode(gcode)
+        result = self.parse(gcode)
         assert result == 3600
 
 
+class TestStreamingTimeParsing:
+    def body(self, lines):
+        return b"".join(b"G1 X%d Y%d\n" % (i, i) for i in range(lines))
+
+    def test_header_match_stops_reading(self):
+        stream = io.BytesIO(b"; TIME:900\n" + self.body(200_000))
+        assert read_gcode_time(stream) == 900
+        assert stream.tell() < 128 * 1024
+
+    def test_estimate_in_tail(self):
+        gcode = self.body(100_000) + b"; estimated printing time (normal mode) = 1h 2m 3s\n"
+        assert read_gcode_time(io.BytesIO(gcode)) == 3723
+
+    def test_tail_beyond_window_is_ignored(self):
+        gcode = self.body(1000) + b"; TIME:60\n" + b"G1\n" * GCODE_TAIL_BYTES
+        assert read_gcode_time(io.BytesIO(gcode)) == 0
+
+    def test_unseekable_stream_uses_rolling_tail(self):
+        class Unseekable(io.BytesIO):
+            def seekable(self):
+                return False
+
+        gcode = self.body(100_000) + b"; total estimated time: 2h 0m 0s"
+        assert read_gcode_time(Unseekable(gcode)) == 7200
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+    def test_scanner_handles_chunk_boundaries(self, chunk_size):
+        gcode = b"; generated\n; model printing time: 1h 0m 0s\nG28\n"
+        scanner = GcodeTimeScanner()
+        for start in range(0, len(gcode), chunk_size):
+            scanner.feed(gcode[start:start + chunk_size])
+        assert scanner.finish() == 3600
+
+    def test_scanner_reads_last_line_without_newline(self):
+        scanner = GcodeTimeScanner()
+        scanner.feed(b"G28\n; TIME:42")
+        assert scanner.finish() == 42
+
+    def test_header_limit_matches_string_parser(self):
+        lines = [b"; unrelated comment\n"] * 600
+        lines[550] = b"; TIME:7200\n"
+        assert read_gcode_time(io.BytesIO(b"".join(lines))) == 7200  # found in the tail
+        lines.extend([b"G1\n"] * GCODE_TAIL_BYTES)
+        assert read_gcode_time(io.BytesIO(b"".join(lines))) == 0
+
+
 class TestThumbnailExtraction:
     @pytest.fixture
-    def file_handler(self, mock_hass):
-        with patch("pathlib.Path.mkdir"):
-            return FileHandler(mock_hass)
+    def file_handler(self, disk_file_handler):
+        return disk_file_handler
 
-    def test_extract_plate_thumbnail_standard_path(self, file_handler):
+    def test_extract_plate_thumbnail_standard_path(self, file_handler, tmp_path):
         buffer = io.BytesIO()
         with zipfile.ZipFile(buffer, "w") as zf:
             zf.writestr("Metadata/plate_1.png", b"PNG_DATA")
 
         buffer.seek(0)
         with zipfile.ZipFile(buffer) as zf:
-            with patch.object(Path, "write_bytes"):
-                result = file_handler._extract_plate_thumbnail(zf, 1, "test-id")
+            result = file_handler._extract_plate_thumbnail(zf, 1)
 
-        assert result == "/local/printassist/thumbnails/test-id.png"
+        digest = hashlib.sha256(b"PNG_DATA").hexdigest()
+        assert result == f"/local/printassist/thumbnails/{digest}.png"
+        assert (tmp_path / "www" / "printassist" / "thumbnails" / f"{digest}.png").exists()
 
-    def test_extract_plate_thumbnail_alt_path(self, file_handler):
+    def test_extract_plate_thumbnail_alt_path(self, file_handler, tmp_path):
         buffer = io.BytesIO()
         with zipfile.ZipFile(buffer, "w") as zf:
             zf.writestr(".thumbnails/plate_1.png", b"PNG_DATA")
 
         buffer.seek(0)
         with zipfile.ZipFile(buffer) as zf:
-            with patch.object(Path, "write_bytes"):
-                result = file_handler._extract_plate_thumbnail(zf, 1, "test-id")
+            result = file_handler._extract_plate_thumbnail(zf, 1)
 
-        assert result == "/local/printassist/thumbnails/test-id.png"
+        digest = hashlib.sha256(b"PNG_DATA").hexdigest()
+        assert result == f"/local/printassist/thumbnails/{digest}.png"
+        assert (tmp_path / "www" / "printassist" / "thumbnails" / f"{digest}.png").exists()
 
     def test_no_thumbnail_found(self, file_handler):
         buffer = io.BytesIO()
@@ -100,23 +165,21 @@ class TestThumbnailExtraction:
 
         buffer.seek(0)
         with zipfile.ZipFile(buffer) as zf:
-            result = file_handler._extract_plate_thumbnail(zf, 1, "test-id")
+            result = file_handler._extract_plate_thumbnail(zf, 1)
 
         assert result is None
 
 
 class TestFileProcessing:
     @pytest.fixture
-    def file_handler(self, mock_hass):
-        with patch("pathlib.Path.mkdir"):
-            return FileHandler(mock_hass)
+    def file_handler(self, disk_file_handler):
+        return disk_file_handler
 
     @pytest.mark.asyncio
     async def test_process_gcode(self, file_handler):
         gcode = b"; TIME:3600\nG28\n"
 
-        with patch.object(Path, "write_bytes"):
-            plates = await file_handler.process_gcode(gcode, "proj-1", "test.gcode")
+        plates = await file_handler.process_gcode(gcode, "proj-1", "test.gcode")
 
         assert len(plates) == 1
         assert plates[0].name == "test"
@@ -130,8 +193,7 @@ class TestFileProcessing:
             zf.writestr("Metadata/plate_1.png", b"PNG")
             zf.writestr("Metadata/plate_1.gcode", b"; TIME:7200\nG28\n")
 
-        with patch.object(Path, "write_bytes"):
-            plates = await file_handler.process_3mf(buffer.getvalue(), "proj-1", "test.3mf")
+        plates = await file_handler.process_3mf(buffer.getvalue(), "proj-1", "test.3mf")
 
         assert len(plates) == 1
         assert plates[0].plate_number == 1
@@ -147,24 +209,344 @@ class TestFileProcessing:
             zf.writestr("Metadata/plate_1.png", b"PNG1")
             zf.writestr("Metadata/plate_2.png", b"PNG2")
 
-        with patch.object(Path, "write_bytes"):
-            plates = await file_handler.process_3mf(buffer.getvalue(), "proj-1", "test.3mf")
+        plates = await file_handler.process_3mf(buffer.getvalue(), "proj-1", "test.3mf")
 
         assert len(plates) == 2
         plate_nums = {p.plate_number for p in plates}
         assert plate_nums == {1, 2}
 
+    @pytest.mark.asyncio
+    async def test_process_staged_3mf(self, file_handler, tmp_path):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as zf:
+            zf.writestr("Metadata/plate_1.gcode", b"; TIME:3600\nG28\n")
+        data = buffer.getvalue()
+
+        staged = await file_handler.async_stage_upload("big.3mf", chunks_of(data, 7))
+        plates = await file_handler.process_file(staged.path, "proj-1", staged.filename)
+
+        assert plates[0].estimated_duration_seconds == 3600
+        assert not staged.path.exists()
+        storage = tmp_path / ".storage" / "printassist"
+        assert (storage / "files" / f"{staged.sha256}.3mf").read_bytes() == data
+        with file_handler.open_gcode(plates[0].gcode_path) as gcode:
+            assert gcode.read() == b"; TIME:3600\nG28\n"
+
+    @pytest.mark.asyncio
+    async def test_process_staged_gcode(self, file_handler, tmp_path):
+        staged = await file_handler.async_stage_upload("part.gcode", chunks_of(b"; TIME:60\n", 4))
+        plates = await file_handler.process_file(staged.path, "proj-1", staged.filename)
+
+        assert plates[0].estimated_duration_seconds == 60
+        assert not staged.path.exists()
+        with file_handler.open_gcode(plates[0].gcode_path) as gcode:
+            assert gcode.read() == b"; TIME:60\n"
+
+    @pytest.mark.asyncio
+    async def test_process_3mf_estimate_at_end_of_gcode(self, file_handler):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr(
+                "Metadata/plate_1.gcode",
+                b"G1 X1\n" * 200_000 + b"; estimated printing time (normal mode) = 45m 0s\n",
+            )
+
+        plates = await file_handler.process_3mf(buffer.getvalue(), "proj-1", "test.3mf")
+        assert plates[0].estimated_duration_seconds == 45 * 60
+
+    @pytest.mark.asyncio
+    async def test_process_3mf_prefers_slice_info(self, file_handler):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as zf:
+            zf.writestr("Metadata/plate_1.gcode", b"; TIME:100\n")
+            zf.writestr("Metadata/plate_2.gcode", b"; TIME:200\n")
+            zf.writestr(
+                "Metadata/slice_info.config",
+                '<config><plate><metadata key="index" value="1"/>'
+                '<metadata key="prediction" value="150"/>'
+                '<metadata key="weight" value="3.5"/></plate></config>',
+            )
+
+        plates = await file_handler.process_3mf(buffer.getvalue(), "proj-1", "test.3mf")
+
+        by_number = {p.plate_number: p for p in plates}
+        assert by_number[1].estimated_duration_seconds == 150
+        assert by_number[1].filament_weight_grams == 3.5
+        assert by_number[2].estimated_duration_seconds == 200
+        assert by_number[2].filament_weight_grams is None
+        assert by_number[2].name == "Plate 2"
+
+    @pytest.mark.asyncio
+    async def test_plates_extracted_in_parallel_keep_order(self, file_handler, mock_hass):
+        import asyncio
+        import threading
+        import time
+        from custom_components.printassist.const import PLATE_EXTRACTION_WORKERS
+
+        loop = asyncio.get_running_loop()
+        mock_hass.async_add_executor_job = lambda fn, *args: loop.run_in_executor(None, fn, *args)
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+            for n in range(1, 11):
+                zf.writestr(f"Metadata/plate_{n}.gcode", f"; TIME:{n * 60}\n".encode() * 1000)
+
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+        extract = file_handler._extract_gcode
+
+        def tracked(*args, **kwargs):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            try:
+                return extract(*args, **kwargs)
+            finally:
+                with lock:
+                    active -= 1
+
+        with patch.object(file_handler, "_extract_gcode", side_effect=tracked):
+            plates = await file_handler.process_3mf(buffer.getvalue(), "proj-1", "big.3mf")
+
+        assert [p.plate_number for p in plates] == list(range(1, 11))
+        assert [p.estimated_duration_seconds for p in plates] == [n * 60 for n in range(1, 11)]
+        assert 1 < peak <= PLATE_EXTRACTION_WORKERS
+
+    @pytest.mark.asyncio
+    async def test_concurrent_files_in_one_project_keep_their_gcode(self, file_handler, tmp_path):
+        import asyncio
+
+        sources = []
+        for seconds in (600, 1200, 1800):
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, "w") as zf:
+                zf.writestr("Metadata/plate_1.gcode", f"; TIME:{seconds}\n".encode())
+            sources.append(buffer.getvalue())
+
+        results = await asyncio.gather(*(
+            file_handler.process_file(source, "proj-1", f"f{i}.3mf")
+            for i, source in enumerate(sources)
+        ))
+
+        paths = [plates[0].gcode_path for plates in results]
+        assert len(set(paths)) == 3
+        for plates, seconds in zip(results, (600, 1200, 1800)):
+            with file_handler.open_gcode(plates[0].gcode_path) as gcode:
+                assert gcode.read() == f"; TIME:{seconds}\n".encode()
+
     @pytest.mark.asyncio
     async def test_process_unsupported_file(self, file_handler):
         plates = await file_handler.process_file(b"data", "proj-1", "model.stl")
         assert plates == []
 
 
+class TestDeduplication:
+    @pytest.fixture
+    def file_handler(self, disk_file_handler):
+        return disk_file_handler
+
+    @pytest.fixture
+    def model(self):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as zf:
+            zf.writestr("Metadata/plate_1.gcode", b"; TIME:60\n")
+            zf.writestr("Metadata/plate_2.gcode", b"; TIME:60\n")
+            zf.writestr("Metadata/plate_1.png", b"PNG")
+        return buffer.getvalue()
+
+    @staticmethod
+    def stored(tmp_path, directory):
+        return sorted(p.name for p in (tmp_path / ".storage" / "printassist" / directory).iterdir())
+
+    @pytest.mark.asyncio
+    async def test_repeat_upload_skips_extraction(self, file_handler, model, tmp_path):
+        first = await file_handler.process_file(model, "proj-1", "a.3mf")
+        with patch.object(file_handler, "_extract_gcode") as extract:
+            second = await file_handler.process_file(model, "proj-2", "copy.3mf")
+        extract.assert_not_called()
+
+        digest = hashlib.sha256(model).hexdigest()
+        gcode_digest = hashlib.sha256(b"; TIME:60\n").hexdigest()
+        assert [p.gcode_path for p in first] == [gcode_digest, gcode_digest]
+        assert [(p.gcode_path, p.thumbnail_path, p.estimated_duration_seconds) for p in second] == [
+            (p.gcode_path, p.thumbnail_path, p.estimated_duration_seconds) for p in first
+        ]
+        assert {p.source_hash for p in first + second} == {digest}
+        assert second[0].project_id == "proj-2"
+        assert second[0].id != first[0].id
+        assert self.stored(tmp_path, "gcode") == [f"{gcode_digest}.gcode.gz"]
+        assert self.stored(tmp_path, "files") == [f"{digest}.3mf"]
+
+    @pytest.mark.asyncio
+    async def test_missing_gcode_invalidates_cache(self, file_handler, model):
+        plates = await file_handler.process_file(model, "proj-1", "a.3mf")
+        file_handler._gcode_file(plates[0].gcode_path).unlink()
+
+        again = await file_handler.process_file(model, "proj-1", "a.3mf")
+        assert file_handler.has_gcode(again[0].gcode_path)
+
+    @pytest.mark.asyncio
+    async def test_gcode_upload_is_stored_once(self, file_handler, tmp_path):
+        staged = await file_handler.async_stage_upload("part.gcode", chunks_of(b"; TIME:60\n", 4))
+        plates = await file_handler.process_file(staged.path, "proj-1", "part.gcode", staged.sha256)
+        await file_handler.process_file(b"; TIME:60\n", "proj-1", "again.gcode")
+
+        assert plates[0].gcode_path == plates[0].source_hash == staged.sha256
+        assert self.stored(tmp_path, "gcode") == [f"{staged.sha256}.gcode.gz"]
+        assert self.stored(tmp_path, "files") == []
+
+    @pytest.mark.asyncio
+    async def test_release_keeps_referenced_files(self, file_handler, model, tmp_path):
+        from collections import Counter
+        from custom_components.printassist.store import FileReferences
+
+        first = await file_handler.process_file(model, "proj-1", "a.3mf")
+        second = await file_handler.process_file(model, "proj-2", "a.3mf")
+
+        remaining = FileReferences(
+            gcode=Counter(p.gcode_path for p in second),
+            thumbnails=Counter(p.thumbnail_path for p in second if p.thumbnail_path),
+            sources=Counter(p.source_hash for p in second),
+        )
+        await file_handler.async_release_files(first, remaining)
+        assert len(self.stored(tmp_path, "gcode")) == 1
+        assert len(self.stored(tmp_path, "files")) == 1
+        assert len(list((tmp_path / "www" / "printassist" / "thumbnails").iterdir())) == 1
+
+        # Just written (or reused by an upload in flight): kept for the collector.
+        released = FileReferences(Counter(), Counter(), Counter())
+        await file_handler.async_release_files(second, released)
+        assert len(self.stored(tmp_path, "gcode")) == 1
+        assert first[0].source_hash in file_handler._parse_cache
+
+        TestGarbageCollection.age(*(
+            path
+            for directory in (tmp_path / ".storage" / "printassist", tmp_path / "www" / "printassist")
+            for path in directory.rglob("*") if path.is_file()
+        ))
+        await file_handler.async_release_files(second, released)
+        assert self.stored(tmp_path, "gcode") == []
+        assert self.stored(tmp_path, "files") == []
+        assert list((tmp_path / "www" / "printassist" / "thumbnails").iterdir()) == []
+        assert first[0].source_hash not in file_handler._parse_cache
+
+
+class TestCompressedGcode:
+    @pytest.mark.asyncio
+    async def test_gcode_is_stored_compressed(self, disk_file_handler, tmp_path):
+        import gzip
+
+        gcode = b"; TIME:60\n" + b"G1 X10 Y10 E0.5\n" * 10_000
+        plates = await disk_file_handler.process_file(gcode, "proj-1", "part.gcode")
+
+        stored = tmp_path / ".storage" / "printassist" / "gcode" / f"{plates[0].gcode_path}.gcode.gz"
+        assert stored.stat().st_size < len(gcode) // 10
+        assert gzip.decompress(stored.read_bytes()) == gcode
+
+        chunks = [c async for c in disk_file_handler.async_read_gcode(plates[0].gcode_path, 4096)]
+        assert max(len(c) for c in chunks) == 4096
+        assert b"".join(chunks) == gcode
+
+    @pytest.mark.asyncio
+    async def test_legacy_uncompressed_gcode_is_readable(self, disk_file_handler, tmp_path):
+        legacy = tmp_path / ".storage" / "printassist" / "gcode" / "proj-1_1.gcode"
+        legacy.write_bytes(b"G28\n")
+
+        assert disk_file_handler.has_gcode("proj-1_1")
+        assert b"".join([c async for c in disk_file_handler.async_read_gcode("proj-1_1")]) == b"G28\n"
+        with pytest.raises(FileNotFoundError):
+            disk_file_handler.open_gcode("missing")
+
+
+class TestGarbageCollection:
+    @pytest.fixture
+    def file_handler(self, disk_file_handler):
+        return disk_file_handler
+
+    @staticmethod
+    def age(*paths):
+        import os
+        import time
+
+        old = time.time() - 2 * 3600
+        for path in paths:
+            os.utime(path, (old, old))
+
+    @pytest.mark.asyncio
+    async def test_removes_only_old_unreferenced_files(self, file_handler, tmp_path):
+        from collections import Counter
+        from custom_components.printassist.store import FileReferences
+
+        model = io.BytesIO()
+        with zipfile.ZipFile(model, "w") as zf:
+            zf.writestr("Metadata/plate_1.gcode", b"; TIME:60\n")
+            zf.writestr("Metadata/plate_1.png", b"PNG")
+        kept = await file_handler.process_file(model.getvalue(), "proj-1", "kept.3mf")
+        dropped = await file_handler.process_file(b"; TIME:30\n" * 100, "proj-1", "gone.gcode")
+
+        storage = tmp_path / ".storage" / "printassist"
+        legacy_source = storage / "files" / "old.3mf"
+        legacy_source.write_bytes(b"3MF")
+        stale_upload = storage / "incoming" / "upload-x.part"
+        stale_upload.write_bytes(b"partial")
+        young_orphan = storage / "gcode" / "young.gcode"
+        young_orphan.write_bytes(b"G28\n")
+        orphan_thumbnail = tmp_path / "www" / "printassist" / "thumbnails" / "orphan.png"
+        orphan_thumbnail.write_bytes(b"PNG")
+        dropped_gcode = file_handler._gcode_file(dropped[0].gcode_path)
+
+        self.age(
+            *(p for d in ("files", "gcode", "incoming") for p in (storage / d).iterdir()
+              if p != young_orphan),
+            *(tmp_path / "www" / "printassist" / "thumbnails").iterdir(),
+        )
+        expected_bytes = sum(p.stat().st_size for p in (dropped_gcode, stale_upload, orphan_thumbnail))
+
+        references = FileReferences(
+            gcode=Counter(p.gcode_path for p in kept),
+            thumbnails=Counter(p.thumbnail_path for p in kept),
+            sources=Counter(p.source_hash for p in kept),
+            legacy_sources=Counter(["old.3mf"]),
+        )
+        with patch("custom_components.printassist.file_handler.GC_BATCH_SIZE", 1):
+            report = await file_handler.async_collect_garbage(references)
+
+        assert report.files_removed == 3
+        assert report.bytes_reclaimed == expected_bytes
+        assert report.cache_entries_pruned == 1
+        assert not dropped_gcode.exists()
+        assert not stale_upload.exists()
+        assert not orphan_thumbnail.exists()
+        assert young_orphan.exists()
+        assert legacy_source.exists()
+        assert file_handler.has_gcode(kept[0].gcode_path)
+        assert file_handler._thumbnail_file(kept[0].thumbnail_path).exists()
+        assert file_handler._source_file(kept[0].source_hash, "kept.3mf").exists()
+        assert list(file_handler._parse_cache) == [kept[0].source_hash]
+
+    @pytest.mark.asyncio
+    async def test_reused_content_is_protected_until_stored(self, file_handler):
+        from collections import Counter
+        from custom_components.printassist.store import FileReferences
+
+        first = await file_handler.process_file(b"; TIME:60\n", "proj-1", "a.gcode")
+        self.age(file_handler._gcode_file(first[0].gcode_path))
+
+        again = await file_handler.process_file(b"; TIME:60\n", "proj-1", "a.gcode")
+        report = await file_handler.async_collect_garbage(
+            FileReferences(Counter(), Counter(), Counter())
+        )
+        assert report.files_removed == 0
+        assert file_handler.has_gcode(again[0].gcode_path)
+
+
 class TestReal3MFParsing:
     @pytest.fixture
-    def file_handler(self, mock_hass):
-        with patch("pathlib.Path.mkdir"):
-            return FileHandler(mock_hass)
+    def file_handler(self, disk_file_handler):
+        return disk_file_handler
 
     @pytest.mark.asyncio
     async def test_process_real_orcaslicer_3mf(self, file_handler):
@@ -175,9 +557,41 @@ class TestReal3MFParsing:
         with open(fixture_path, "rb") as f:
             file_content = f.read()
 
-        with patch.object(Path, "write_bytes"):
-            plates = await file_handler.process_3mf(file_content, "orca-test", "sample.3mf")
+        plates = await file_handler.process_3mf(file_content, "orca-test", "sample.3mf")
 
         assert len(plates) >= 1
         assert plates[0].thumbnail_path is not None
-        assert plates[0].estimated_duration_seconds == 5 * 3600 + 53 * 60 + 25
+        # slice_info.config's prediction includes preparation time, unlike the
+        # gcode's "model printing time" of 5h 53m 25s.
+        assert plates[0].estimated_duration_seconds == 21577
+        assert plates[0].name == "FUS 2.STL"
+        assert plates[0].filament_weight_grams == 36.22
+        assert plates[0].filament_types == ["PLA-AERO"]
+        assert plates[0].printer_model == "C11"
+        assert plates[0].object_count == 1
+
+
+class TestStagedUpload:
+    @pytest.mark.asyncio
+    async def test_stage_hashes_and_sizes(self, disk_file_handler):
+        import hashlib
+
+        data = bytes(range(256)) * 100
+        staged = await disk_file_handler.async_stage_upload("a.3mf", chunks_of(data, 1000))
+
+        assert staged.size == len(data)
+        assert staged.sha256 == hashlib.sha256(data).hexdigest()
+        assert staged.path.read_bytes() == data
+
+        await disk_file_handler.async_discard_staged(staged)
+        assert not staged.path.exists()
+
+    @pytest.mark.asyncio
+    async def test_stage_rejects_oversized_upload(self, disk_file_handler, tmp_path):
+        with pytest.raises(UploadTooLarge):
+            await disk_file_handler.async_stage_upload(
+                "a.3mf", chunks_of(b"x" * 100, 10), max_size=50
+            )
+
+        incoming = tmp_path / ".storage" / "printassist" / "incoming"
+        assert list(incoming.iterdir()) == []
@@ -0,0 +1,110 @@
+"""Tests for PrintAssist Monte Carlo forecasting."""
+
+from datetime import datetime, timedelta, timezone
+
+import sys
+sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
+
+from custom_components.printassist.forecast import (
+    PRIOR_FAILURE_RATE,
+    failure_rates,
+    forecast_schedule,
+)
+from custom_components.printassist.scheduler import PrintScheduler
+from custom_components.printassist.store import Plate, Job, UnavailabilityWindow
+
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def make_plate(id: str, duration: int, project_id: str = "proj-1") -> Plate:
+    return Plate(
+        id=id,
+        project_id=project_id,
+        source_filename="test.3mf",
+        plate_number=1,
+        name=id,
+        gcode_path="g",
+        estimated_duration_seconds=duration,
+    )
+
+
+def make_job(id: str, plate_id: str, status: str = "queued") -> Job:
+    return Job(id=id, plate_id=plate_id, status=status, created_at="2024-01-01T00:00:00")
+
+
+class TestFailureRates:
+    def test_prior_dominates_without_history(self):
+        rates = failure_rates([make_job("j1", "p1", "failed")])
+        assert PRIOR_FAILURE_RATE < rates["p1"] < 0.2
+
+    def test_ignores_open_jobs(self):
+        assert failure_rates([make_job("j1", "p1"), make_job("j2", "p1", "printing")]) == {}
+
+
+class TestForecast:
+    def test_deterministic_without_noise(self):
+        now = utc(2024, 1, 15, 8, 0, 0)
+        plates = {"p1": make_plate("p1", 3600), "p2": make_plate("p2", 1800, "proj-2")}
+        jobs = [make_job("j1", "p1"), make_job("j2", "p2")]
+        schedule = PrintScheduler(jobs, plates, [], current_time=now).calculate_schedule()
+
+        result = forecast_schedule(
+            schedule,
+            {"p1": "proj-1", "p2": "proj-2"},
+            {"p1": 0.0, "p2": 0.0},
+            [],
+            samples=100,
+            duration_sigma=0.0,
+        )
+
+        assert result.jobs["j1"] == (now + timedelta(hours=1), now + timedelta(hours=1))
+        assert result.projects["proj-2"][0] == now + timedelta(hours=1, minutes=30)
+
+    def test_retry_waits_for_operator(self):
+        now = utc(2024, 1, 15, 8, 0, 0)
+        window = UnavailabilityWindow(
+            id="w1",
+            start=utc(2024, 1, 15, 8, 30, 0).isoformat(),
+            end=utc(2024, 1, 15, 17, 0, 0).isoformat(),
+        )
+        plates = {"p1": make_plate("p1", 3600)}
+        schedule = PrintScheduler(
+            [make_job("j1", "p1")], plates, [window], current_time=now
+        ).calculate_schedule()
+
+        result = forecast_schedule(
+            schedule, {"p1": "proj-1"}, {"p1": 0.5}, [window],
+            samples=2000, duration_sigma=0.0,
+        )
+
+        p50, p90 = result.jobs["j1"]
+        assert p50 <= now + timedelta(hours=2)
+        assert p90 >= utc(2024, 1, 15, 17, 0, 0)
+
+    def test_partially_scheduled_project_has_no_forecast(self):
+        now = utc(2024, 1, 15, 8, 0, 0)
+        day = 24 * 3600
+        window = UnavailabilityWindow(
+            id="w1",
+            start=(now + timedelta(days=30)).isoformat(),
+            end=(now + timedelta(days=30, minutes=30)).isoformat(),
+        )
+        plates = {f"p{i}": make_plate(f"p{i}", 3 * day) for i in range(4)}
+        plates["q"] = make_plate("q", 3 * day, "proj-2")
+        plates["q"].priority = 10
+        jobs = [make_job("jq", "q")] + [make_job(f"j{i}", f"p{i}") for i in range(4)]
+        schedule = PrintScheduler(jobs, plates, [window], current_time=now).calculate_schedule()
+        assert len(schedule.jobs) < len(jobs)
+
+        project_by_plate = {pid: plate.project_id for pid, plate in plates.items()}
+        result = forecast_schedule(
+            schedule, project_by_plate, {}, [window],
+            queued_by_project={"proj-1": 4, "proj-2": 1},
+            samples=100, duration_sigma=0.0,
+        )
+
+        assert "proj-1" not in result.projects
+        assert "proj-2" in result.projects
+        assert set(result.jobs) == {sj.job_id for sj in schedule.jobs}
@@ -230,6 +230,111 @@ class TestPrintAssistStore:
         assert completed == 1
         assert total == 3
 
+    @pytest.mark.asyncio
+    async def test_snapshot(self, store):
+        project = await store.async_create_project("Project")
+        plate = Plate.create(
+            project_id=project.id,
+            source_filename="test.3mf",
+            plate_number=1,
+            name="Test",
+            gcode_path="proj_1",
+            estimated_duration_seconds=1800,
+        )
+        await store.async_add_plates([plate])
+        await store.async_set_plate_quantity(plate.id, 3)
+
+        snapshot = store.snapshot()
+        assert snapshot.revision == store.revision
+        assert store.snapshot() is snapshot
+        assert snapshot.plates_by_id[plate.id].name == "Test"
+        assert len(snapshot.queued_jobs) == 3
+        assert snapshot.active_job is None
+        assert snapshot.progress_by_project[project.id] == (0, 3)
+        with pytest.raises(TypeError):
+            snapshot.plates_by_id["other"] = plate
+
+        await store.async_start_job(snapshot.queued_jobs[0].id)
+        await store.async_complete_job(snapshot.queued_jobs[0].id)
+        await store.async_start_job(snapshot.queued_jobs[1].id)
+
+        updated = store.snapshot()
+        assert updated is not snapshot
+        assert updated.revision > snapshot.revision
+        assert updated.active_job.id == snapshot.queued_jobs[1].id
+        assert len(updated.jobs_by_status[JOB_STATUS_COMPLETED]) == 1
+        assert updated.progress_by_project[project.id] == store.get_project_progress(project.id)
+        assert len(snapshot.queued_jobs) == 3
+
+    @pytest.mark.asyncio
+    async def test_snapshot_file_references(self, store):
+        project = await store.async_create_project("Project")
+        plates = [
+            Plate.create(
+                project_id=project.id,
+                source_filename="test.3mf",
+                plate_number=n,
+                name=f"Plate {n}",
+                gcode_path="same-gcode",
+                estimated_duration_seconds=60,
+                thumbnail_path=thumbnail,
+            )
+            for n, thumbnail in ((1, "/local/t.png"), (2, None))
+        ]
+        plates[0].source_hash = "abc"
+        await store.async_add_plates(plates)
+
+        references = store.snapshot().file_references
+        assert references.gcode == {"same-gcode": 2}
+        assert references.thumbnails == {"/local/t.png": 1}
+        assert references.sources == {"abc": 1}
+        assert references.legacy_sources == {"test.3mf": 1}
+
+        await store.async_delete_plate(plates[0].id)
+        assert "abc" not in store.snapshot().file_references.sources
+
+    @pytest.mark.asyncio
+    async def test_due_dates(self, store):
+        due = datetime(2024, 2, 1, 12, 0)
+        project = await store.async_create_project("Project", due_date=due)
+        assert store.get_project(project.id).due_date == "2024-02-01T12:00:00+00:00"
+
+        plate = Plate.create(
+            project_id=project.id,
+            source_filename="test.3mf",
+            plate_number=1,
+            name="Test",
+            gcode_path="proj_1",
+            estimated_duration_seconds=1800,
+        )
+        await store.async_add_plates([plate])
+        assert await store.async_set_plate_due_date(plate.id, due) is True
+        assert store.get_plate(plate.id).due_date == "2024-02-01T12:00:00+00:00"
+
+        assert await store.async_set_project_due_date(project.id, None) is True
+        assert store.get_project(project.id).due_date is None
+        assert await store.async_set_plate_due_date("missing", due) is False
+
+    @pytest.mark.asyncio
+    async def test_naive_due_dates_are_local_time(self, store):
+        from zoneinfo import ZoneInfo
+        from homeassistant.util import dt as dt_util
+        from custom_components.printassist.scheduler import _parse_datetime
+
+        original = dt_util.get_default_time_zone()
+        dt_util.set_default_time_zone(ZoneInfo("America/New_York"))
+        try:
+            # What cv.datetime returns for the datetime selector.
+            due = datetime(2024, 2, 1, 17, 0)
+            project = await store.async_create_project("Project", due_date=due)
+            assert await store.async_set_project_due_date(project.id, due) is True
+        finally:
+            dt_util.set_default_time_zone(original)
+
+        stored = store.get_project(project.id).due_date
+        assert stored == "2024-02-01T22:00:00+00:00"
+        assert _parse_datetime(stored) == datetime(2024, 2, 1, 22, 0, tzinfo=ZoneInfo("UTC"))
+
     @pytest.mark.asyncio
     async def test_unavailability_windows(self, store):
         start = datetime(2024, 1, 15, 22, 0)
@@ -241,3 +346,32 @@ class TestPrintAssistStore:
 
         await store.async_remove_unavailability(window.id)
         assert len(store.get_unavailability_windows()) == 0
+
+
+class TestServices:
+    @pytest_asyncio.fixture
+    async def handlers(self, mock_hass):
+        from custom_components.printassist.const import DOMAIN
+        from custom_components.printassist.services import async_setup_services
+
+        mock_hass.data[DOMAIN] = {
+            "store": MagicMock(async_set_plate_priority=AsyncMock()),
+            "coordinator": MagicMock(async_request_schedule_refresh=AsyncMock()),
+        }
+        await async_setup_services(mock_hass)
+        return {
+            c.args[1]: (c.args[2], c.args[3])
+            for c in mock_hass.services.async_register.call_args_list
+        }
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("extra,wait", [({}, False), ({"wait_for_refresh": True}, True)])
+    async def test_wait_for_refresh(self, mock_hass, handlers, extra, wait):
+        from custom_components.printassist.const import DOMAIN
+
+        handler, schema = handlers["set_plate_priority"]
+        call = MagicMock(data=schema({"plate_id": "p1", "priority": 5, **extra}))
+        await handler(call)
+
+        coordinator = mock_hass.data[DOMAIN]["coordinator"]
+        coordinator.async_request_schedule_refresh.assert_awaited_once_with(wait=wait)
@@ -0,0 +1,98 @@
+"""Tests for 3MF metadata parsing."""
+
+import io
+import json
+import zipfile
+
+import sys
+sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
+
+from custom_components.printassist.metadata import read_3mf_metadata
+
+SLICE_INFO = """<?xml version="1.0" encoding="UTF-8"?>
+<config>
+  <plate>
+    <metadata key="index" value="1"/>
+    <metadata key="printer_model_id" value="N2S"/>
+    <metadata key="prediction" value="3725"/>
+    <metadata key="weight" value="12.5"/>
+    <object identify_id="1" name="Bracket" skipped="false" />
+    <object identify_id="2" name="Bracket" skipped="false" />
+    <filament id="1" type="PLA" used_g="10.0" />
+    <filament id="2" type="PETG" used_g="2.0" />
+    <filament id="3" type="PLA" used_g="0.5" />
+  </plate>
+  <plate>
+    <metadata key="index" value="2"/>
+    <metadata key="prediction" value="0"/>
+  </plate>
+</config>
+"""
+
+
+def archive(entries):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for name, data in entries.items():
+            zf.writestr(name, data)
+    buffer.seek(0)
+    return zipfile.ZipFile(buffer)
+
+
+def test_slice_info_and_plate_json():
+    plate_json = {"bbox_objects": [{"name": "Left"}, {"name": "Right"}, {"name": "Base"}]}
+    with archive({
+        "Metadata/slice_info.config": SLICE_INFO,
+        "Metadata/plate_1.json": json.dumps(plate_json),
+        "Metadata/plate_3.json": json.dumps({"bbox_objects": [{"name": "Solo"}]}),
+    }) as zf:
+        metadata = read_3mf_metadata(zf)
+
+    first = metadata[1]
+    assert first.name == "Left"
+    assert first.object_count == 3
+    assert first.prediction_seconds == 3725
+    assert first.weight_grams == 12.5
+    assert first.filament_types == ["PLA", "PETG"]
+    assert first.printer_model == "N2S"
+
+    assert metadata[2].prediction_seconds is None
+    assert metadata[3].name == "Solo"
+    assert metadata[3].prediction_seconds is None
+
+
+def test_missing_or_broken_entries():
+    with archive({"3D/3dmodel.model": "<model/>"}) as zf:
+        assert read_3mf_metadata(zf) == {}
+
+    with archive({
+        "Metadata/slice_info.config": "<config><plate>",
+        "Metadata/plate_1.json": "{not json",
+    }) as zf:
+        assert read_3mf_metadata(zf) == {}
+
+
+def test_plate_json_with_unexpected_shapes():
+    with archive({
+        "Metadata/plate_1.json": json.dumps([{"name": "List"}]),
+        "Metadata/plate_2.json": json.dumps({"bbox_objects": "Solo"}),
+        "Metadata/plate_3.json": json.dumps({"bbox_objects": ["x", None, {"name": "Real"}]}),
+        "Metadata/plate_4.json": json.dumps(None),
+    }) as zf:
+        metadata = read_3mf_metadata(zf)
+
+    assert list(metadata) == [3]
+    assert metadata[3].name == "Real"
+    assert metadata[3].object_count == 1
+
+
+def test_non_finite_slice_info_values():
+    slice_info = SLICE_INFO.replace('value="3725"', 'value="nan"').replace('value="12.5"', 'value="inf"')
+    slice_info = slice_info.replace('key="index" value="2"', 'key="index" value="-inf"')
+    with archive({"Metadata/slice_info.config": slice_info}) as zf:
+        metadata = read_3mf_metadata(zf)
+
+    assert list(metadata) == [1]
+    assert metadata[1].prediction_seconds is None
+    assert metadata[1].weight_grams is None
+    assert metadata[1].printer_model == "N2S"
@@ -0,0 +1,137 @@
+"""Tests for PrintAssist schedule portfolio."""
+
+import asyncio
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import sys
+sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
+
+from custom_components.printassist.const import (
+    SCHEDULE_MODE_KNAPSACK,
+    SCHEDULE_MODE_PRIORITY,
+)
+from custom_components.printassist.portfolio import (
+    SchedulePortfolio,
+    ScheduleInputs,
+    evaluate_heuristic,
+)
+from custom_components.printassist.store import Plate, Job, UnavailabilityWindow
+
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def make_inputs() -> ScheduleInputs:
+    plates = {
+        f"p{hours}{suffix}": Plate(
+            id=f"p{hours}{suffix}",
+            project_id="proj-1",
+            source_filename="test.3mf",
+            plate_number=1,
+            name=f"{hours}h",
+            gcode_path="g",
+            estimated_duration_seconds=hours * 3600,
+        )
+        for hours, suffix in [(3, "a"), (2, "a"), (2, "b")]
+    }
+    jobs = [
+        Job(id=f"j-{pid}", plate_id=pid, status="queued", created_at="2024-01-01T00:00:00")
+        for pid in plates
+    ]
+    window = UnavailabilityWindow(
+        id="w1",
+        start=utc(2024, 1, 15, 12, 0, 0).isoformat(),
+        end=utc(2024, 1, 15, 13, 0, 0).isoformat(),
+    )
+    return ScheduleInputs(
+        queued_jobs=jobs,
+        plates_by_id=plates,
+        unavailability_windows=[window],
+        current_time=utc(2024, 1, 15, 8, 0, 0),
+    )
+
+
+class TestPortfolio:
+    def test_evaluate_heuristic_scores_result(self):
+        score, result = evaluate_heuristic(make_inputs(), SCHEDULE_MODE_PRIORITY)
+        assert result.mode == SCHEDULE_MODE_PRIORITY
+        assert len(result.jobs) == 3
+        assert score[:2] == (0, 0)
+        assert result.jobs[1].spans_unavailability is True
+
+    @pytest.mark.asyncio
+    async def test_portfolio_picks_best_heuristic(self):
+        portfolio = SchedulePortfolio(
+            heuristics=[SCHEDULE_MODE_PRIORITY, SCHEDULE_MODE_KNAPSACK], max_workers=2
+        )
+        try:
+            result = await portfolio.async_run(make_inputs())
+        finally:
+            await portfolio.async_shutdown()
+
+        assert result.mode == SCHEDULE_MODE_KNAPSACK
+        assert result.jobs[1].scheduled_end == utc(2024, 1, 15, 12, 0, 0)
+
+    @pytest.mark.asyncio
+    async def test_run_prepares_inputs_off_the_loop(self):
+        import threading
+
+        loop_thread = threading.get_ident()
+        threads = []
+        original = ScheduleInputs.to_worker_kwargs
+
+        def tracked(inputs):
+            threads.append(threading.get_ident())
+            return original(inputs)
+
+        portfolio = SchedulePortfolio(heuristics=[SCHEDULE_MODE_PRIORITY], max_workers=1)
+        try:
+            with patch.object(ScheduleInputs, "to_worker_kwargs", tracked), patch(
+                "custom_components.printassist.portfolio._worker_module"
+            ) as worker_module:
+                await portfolio.async_run(make_inputs())
+        finally:
+            await portfolio.async_shutdown()
+
+        assert threads and loop_thread not in threads
+        worker_module.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_workers_stop_when_idle(self):
+        portfolio = SchedulePortfolio(heuristics=[SCHEDULE_MODE_PRIORITY], max_workers=1)
+        try:
+            with patch("custom_components.printassist.portfolio.PORTFOLIO_IDLE_TIMEOUT", 0):
+                await portfolio.async_run(make_inputs())
+            assert portfolio.workers_running
+            await asyncio.sleep(0.01)
+            assert not portfolio.workers_running
+
+            result = await portfolio.async_run(make_inputs())
+            assert result.mode == SCHEDULE_MODE_PRIORITY
+            assert portfolio.workers_running
+        finally:
+            await portfolio.async_shutdown()
+        assert not portfolio.workers_running
+
+    def test_worker_does_not_import_the_package(self):
+        import subprocess
+        from pathlib import Path
+
+        from custom_components.printassist import schedule_worker
+
+        directory = Path(schedule_worker.__file__).parent
+        code = (
+            "import sys, importlib\n"
+            f"exec({schedule_worker.BOOTSTRAP!r}, "
+            f"{{'name': {schedule_worker.WORKER_PACKAGE!r}, 'path': {str(directory)!r}}})\n"
+            f"importlib.import_module('{schedule_worker.WORKER_PACKAGE}.schedule_worker')\n"
+            "print(sorted(m for m in sys.modules\n"
+            "    if m.startswith(('homeassistant', 'custom_components', 'aiohttp'))))\n"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+        assert output.strip() == "[]"
@@ -0,0 +1,95 @@
+"""Tests for payload queries."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+import sys
+sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
+
+from custom_components.printassist.query import InvalidCursor, QueryError, query_payload
+
+
+def utc(day, hour=0):
+    return datetime(2024, 1, day, hour, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def payload():
+    return {
+        "revision": 3,
+        "projects": [
+            {"id": "p1", "created_at": "2024-01-01T00:00:00+00:00"},
+            {"id": "p2", "created_at": "2024-01-05T00:00:00+00:00"},
+        ],
+        "plates": [
+            {"id": "a", "project_id": "p1"},
+            {"id": "b", "project_id": "p2"},
+        ],
+        "jobs": [
+            {"id": f"j{i}", "plate_id": "a" if i % 2 else "b",
+             "status": "completed" if i < 6 else "queued",
+             "created_at": "2024-01-01T00:00:00+00:00",
+             "started_at": f"2024-01-{i + 1:02d}T00:00:00+00:00" if i < 6 else None,
+             "ended_at": f"2024-01-{i + 1:02d}T02:00:00+00:00" if i < 6 else None}
+            for i in range(10)
+        ],
+        "schedule": [
+            {"job_id": "j6", "plate_id": "b",
+             "scheduled_start": "2024-01-10T00:00:00+00:00",
+             "scheduled_end": "2024-01-10T04:00:00+00:00"},
+            {"job_id": "j7", "plate_id": "a",
+             "scheduled_start": "2024-01-10T04:00:00+00:00",
+             "scheduled_end": "2024-01-10T08:00:00+00:00"},
+        ],
+    }
+
+
+class TestFilters:
+    def test_project_filter_follows_plates(self, payload):
+        page = query_payload(payload, "jobs", project_id="p1")
+        assert [j["id"] for j in page.items] == ["j1", "j3", "j5", "j7", "j9"]
+        assert [s["job_id"] for s in query_payload(payload, "schedule", project_id="p2").items] == ["j6"]
+        assert [p["id"] for p in query_payload(payload, "plates", project_id="p2").items] == ["b"]
+
+    def test_status_filter(self, payload):
+        page = query_payload(payload, "jobs", statuses=["queued"])
+        assert page.total == 4
+        with pytest.raises(QueryError):
+            query_payload(payload, "plates", statuses=["queued"])
+
+    def test_time_range(self, payload):
+        jobs = query_payload(payload, "jobs", statuses=["completed"], start=utc(3), end=utc(5))
+        assert [j["id"] for j in jobs.items] == ["j2", "j3"]
+
+        schedule = query_payload(payload, "schedule", start=utc(10, 5))
+        assert [s["job_id"] for s in schedule.items] == ["j7"]
+
+        projects = query_payload(payload, "projects", end=utc(2))
+        assert [p["id"] for p in projects.items] == ["p1"]
+
+        with pytest.raises(QueryError):
+            query_payload(payload, "plates", start=utc(1))
+
+
+class TestPagination:
+    def test_cursor_walks_all_matches(self, payload):
+        seen = []
+        cursor = None
+        while True:
+            page = query_payload(payload, "jobs", cursor=cursor, limit=3)
+            assert page.total == 10
+            seen += [j["id"] for j in page.items]
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        assert seen == [f"j{i}" for i in range(10)]
+
+    def test_exact_last_page_has_no_cursor(self, payload):
+        page = query_payload(payload, "jobs", cursor="j4", limit=5)
+        assert [j["id"] for j in page.items] == ["j5", "j6", "j7", "j8", "j9"]
+        assert page.next_cursor is None
+
+    def test_unknown_cursor(self, payload):
+        with pytest.raises(InvalidCursor):
+            query_payload(payload, "jobs", statuses=["queued"], cursor="j1")
@@ -7,7 +7,12 @@ import sys
 sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
 
 from custom_components.printassist.scheduler import PrintScheduler, ScheduledJob, ScheduleResult
-from custom_components.printassist.store import Plate, Job, UnavailabilityWindow
+from custom_components.printassist.store import Plate, Job, Project, UnavailabilityWindow
+from custom_components.printassist.const import (
+    SCHEDULE_MODE_DEADLINE,
+    SCHEDULE_MODE_KNAPSACK,
+    SCHEDULE_MODE_SHORTEST_FIRST,
+)
 
 
 def utc(*args) -> datetime:
@@ -15,11 +20,18 @@ def utc(*args) -> datetime:
     return datetime(*args, tzinfo=timezone.utc)
 
 
-def make_plate(id: str, name: str, duration: int, priority: int = 0) -> Plate:
+def make_plate(
+    id: str,
+    name: str,
+    duration: int,
+    priority: int = 0,
+    project_id: str = "proj-1",
+    due_date: datetime | None = None,
+) -> Plate:
     """Helper to create a test plate."""
     return Plate(
         id=id,
-        project_id="proj-1",
+        project_id=project_id,
         source_filename=f"{name}.3mf",
         plate_number=1,
         name=name,
@@ -28,6 +40,17 @@ def make_plate(id: str, name: str, duration: int, priority: int = 0) -> Plate:
         thumbnail_path=None,
         quantity_needed=1,
         priority=priority,
+        due_date=due_date.isoformat() if due_date else None,
+    )
+
+
+def make_project(id: str, due_date: datetime | None = None) -> Project:
+    """Helper to create a test project."""
+    return Project(
+        id=id,
+        name=id,
+        created_at="2024-01-01T00:00:00",
+        due_date=due_date.isoformat() if due_date else None,
     )
 
 
@@ -246,3 +269,157 @@ class TestPrintScheduler:
 
         result = scheduler.calculate_schedule()
         assert result.next_breakpoint is None
+
+
+class TestDeadlineScheduling:
+    def test_priority_mode_ignores_deadlines(self):
+        now = utc(2024, 1, 15, 8, 0, 0)
+        plates = {
+            "p1": make_plate("p1", "Important", 7200, priority=10, project_id="a"),
+            "p2": make_plate("p2", "Urgent", 1800, project_id="b"),
+        }
+        projects = {"b": make_project("b", utc(2024, 1, 15, 9, 0, 0))}
+        jobs = [make_job("j1", "p1"), make_job("j2", "p2")]
+        scheduler = PrintScheduler(jobs, plates, [], current_time=now, projects_by_id=projects)
+
+        result = scheduler.calculate_schedule()
+        assert [s.job_id for s in result.jobs] == ["j1", "j2"]
+        assert result.lateness_by_project == {"b": 5400}
+
+    def test_earliest_deadline_first(self):
+        now = utc(2024, 1, 15, 8, 0, 0)
+        plates = {
+            "p1": make_plate("p1", "Important", 7200, priority=10, project_id="a"),
+            "p2": make_plate("p2", "Urgent", 1800, project_id="b"),
+            "p3": make_plate("p3", "Later", 1800, project_id="c"),
+        }
+        projects = {
+            "b": make_project("b", utc(2024, 1, 15, 9, 0, 0)),
+            "c": make_project("c", utc(2024, 1, 20, 9, 0, 0)),
+        }
+        jobs = [make_job("j1", "p1"), make_job("j2", "p2"), make_job("j3", "p3")]
+        scheduler = PrintScheduler(
+            jobs, plates, [], current_time=now,
+            projects_by_id=projects, mode=SCHEDULE_MODE_DEADLINE,
+        )
+
+        result = scheduler.calculate_schedule()
+        assert [s.job_id for s in result.jobs] == ["j2", "j3", "j1"]
+        assert result.jobs[0].due_date == utc(2024, 1, 15, 9, 0, 0)
+        assert result.jobs[2].due_date is None
+        assert result.lateness_by_project == {"b": 0, "c": 0}
+
+    def test_plate_deadline_overrides_project(self):
+        now = utc(2024, 1, 15, 8, 0, 0)
+        plates = {
+            "p1": make_plate("p1", "A", 1800, project_id="a"),
+            "p2": make_plate("p2", "B", 1800, project_id="a", due_date=utc(2024, 1, 15, 8, 30, 0)),
+        }
+        projects = {"a": make_project("a", utc(2024, 1, 16, 0, 0, 0))}
+        jobs = [make_job("j1", "p1"), make_job("j2", "p2")]
+        scheduler = PrintScheduler(
+            jobs, plates, [], current_time=now,
+            projects_by_id=projects, mode=SCHEDULE_MODE_DEADLINE,
+        )
+
+        result = scheduler.calculate_schedule()
+        assert [s.job_id for s in result.jobs] == ["j2", "j1"]
+        assert result.lateness_by_project == {"a": 0}
+
+    def test_gap_fill_prefers_deadline_over_length(self):
+        now = utc(2024, 1, 15, 8, 0, 0)
+        window = make_window("w1", utc(2024, 1, 15, 12, 0, 0), utc(2024, 1, 15, 13, 0, 0))
+        plates = {
+            "p1": make_plate("p1", "Long", 10800, project_id="a"),
+            "p2": make_plate("p2", "Short", 3600, project_id="b"),
+        }
+        projects = {"b": make_project("b", utc(2024, 1, 15, 9, 30, 0))}
+        jobs = [make_job("j1", "p1"), make_job("j2", "p2")]
+        scheduler = PrintScheduler(
+            jobs, plates, [window], current_time=now,
+            projects_by_id=projects, mode=SCHEDULE_MODE_DEADLINE,
+        )
+
+        result = scheduler.calculate_schedule()
+        assert result.jobs[0].job_id == "j2"
+        assert result.lateness_by_project == {"b": 0}
+
+    def test_lateness_reported_for_missed_deadline(self):
+        now = utc(2024, 1, 15, 8, 0, 0)
+        plates = {
+            "p1": make_plate("p1", "A", 3600, project_id="a"),
+            "p2": make_plate("p2", "B", 3600, project_id="a"),
+        }
+        projects = {"a": make_project("a", utc(2024, 1, 15, 9, 0, 0))}
+        jobs = [make_job("j1", "p1"), make_job("j2", "p2")]
+        scheduler = PrintScheduler(
+            jobs, plates, [], current_time=now,
+            projects_by_id=projects, mode=SCHEDULE_MODE_DEADLINE,
+        )
+
+        result = scheduler.calculate_schedule()
+        assert result.lateness_by_project == {"a": 3600}
+
+    def test_lateness_past_horizon_queues_unscheduled_jobs(self):
+        now = utc(2024, 1, 15, 8, 0, 0)
+        day = 24 * 3600
+        window = make_window("w1", now + timedelta(days=30), now + timedelta(days=30, minutes=30))
+        plates = {
+            f"p{i}": make_plate(f"p{i}", f"P{i}", 3 * day, project_id="a") for i in range(5)
+        }
+        projects = {"a": make_project("a", now + timedelta(days=1))}
+        jobs = [make_job(f"j{i}", f"p{i}") for i in range(5)]
+        scheduler = PrintScheduler(
+            jobs, plates, [window], current_time=now,
+            projects_by_id=projects, mode=SCHEDULE_MODE_DEADLINE,
+        )
+
+        result = scheduler.calculate_schedule()
+        assert len(result.jobs) == 3
+        # The two jobs left over run one after the other: 9 + 3 + 3 days - 1.
+        assert result.lateness_by_project == {"a": 14 * day}
+
+
+class TestHeuristics:
+    def test_shortest_first(self):
+        plates = {
+            "p1": make_plate("p1", "Long", 7200, priority=10),
+            "p2": make_plate("p2", "Short", 1800),
+        }
+        jobs = [make_job("j1", "p1"), make_job("j2", "p2")]
+        scheduler = PrintScheduler(jobs, plates, [], mode=SCHEDULE_MODE_SHORTEST_FIRST)
+
+        result = scheduler.calculate_schedule()
+        assert [s.job_id for s in result.jobs] == ["j2", "j1"]
+        assert result.mode == SCHEDULE_MODE_SHORTEST_FIRST
+
+    def test_knapsack_fills_gap_exactly(self):
+        now = utc(2024, 1, 15, 8, 0, 0)
+        window = make_window("w1", utc(2024, 1, 15, 12, 0, 0), utc(2024, 1, 15, 13, 0, 0))
+        plates = {
+            "p1": make_plate("p1", "Three", 3 * 3600),
+            "p2": make_plate("p2", "Two", 2 * 3600),
+            "p3": make_plate("p3", "TwoB", 2 * 3600),
+        }
+        jobs = [make_job("j1", "p1"), make_job("j2", "p2"), make_job("j3", "p3")]
+
+        greedy = PrintScheduler(jobs, plates, [window], current_time=now)
+        greedy_result = greedy.calculate_schedule()
+        assert greedy_result.jobs[0].job_id == "j1"
+
+        knapsack = PrintScheduler(jobs, plates, [window], current_time=now, mode=SCHEDULE_MODE_KNAPSACK)
+        result = knapsack.calculate_schedule()
+        assert {s.job_id for s in result.jobs[:2]} == {"j2", "j3"}
+        assert result.jobs[1].scheduled_end == utc(2024, 1, 15, 12, 0, 0)
+        assert knapsack.score_schedule(result) < greedy.score_schedule(greedy_result)
+
+    def test_score_counts_idle_outside_windows(self):
+        now = utc(2024, 1, 15, 8, 0, 0)
+        window = make_window("w1", utc(2024, 1, 15, 9, 0, 0), utc(2024, 1, 15, 10, 0, 0))
+        plates = {"p1": make_plate("p1", "Long", 7200)}
+        scheduler = PrintScheduler([make_job("j1", "p1")], plates, [window], current_time=now)
+
+        result = scheduler.calculate_schedule()
+        lateness, idle, _ = scheduler.score_schedule(result)
+        assert lateness == 0
+        assert idle == 0
@@ -0,0 +1,257 @@
+"""Differential tests comparing scheduler engines against the reference greedy.
+
+Each case is generated from a seed (jobs, plates, windows, active job, project
+deadlines), so a failure is reproduced by re-running its ``seed-N`` id. Every
+engine must produce a valid schedule. Engines in ``EQUIVALENT_ENGINES`` must
+reproduce the reference ``PrintScheduler`` placement for placement; engines in
+``ENGINES`` must score equal to or better than it under
+``PrintScheduler.score_schedule``. A deliberately worse engine is run through
+the same comparison as a negative control, so a check that cannot fail is
+caught. Register a new engine in ``ENGINES`` to have it checked before it
+replaces the reference.
+"""
+
+import random
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+import pytest
+
+import sys
+sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
+
+from custom_components.printassist.const import SCHEDULE_HEURISTICS, SCHEDULE_MODE_PRIORITY
+from custom_components.printassist.portfolio import (
+    ScheduleInputs,
+    _worker_module,
+    evaluate_heuristic,
+)
+from custom_components.printassist.scheduler import (
+    SCHEDULE_HORIZON_DAYS,
+    PrintScheduler,
+    ScheduleResult,
+)
+from custom_components.printassist.store import Job, Plate, Project, UnavailabilityWindow
+
+CASES = 200
+BASE_TIME = datetime(2024, 1, 15, 0, 0, tzinfo=timezone.utc)
+
+
+def gen_inputs(seed: int) -> ScheduleInputs:
+    """Random but reproducible scheduler inputs, biased towards edge cases."""
+    rng = random.Random(seed)
+    now = BASE_TIME + timedelta(minutes=rng.randrange(0, 24 * 60, 15))
+
+    projects = {}
+    for index in range(rng.randint(1, 4)):
+        due = None
+        if rng.random() < 0.5:
+            due = (now + timedelta(hours=rng.uniform(-2, 72))).isoformat()
+        projects[f"proj-{index}"] = Project(
+            id=f"proj-{index}", name=f"P{index}", created_at=now.isoformat(), due_date=due
+        )
+
+    plates = {}
+    for index in range(rng.randint(1, 8)):
+        seconds = rng.choice([
+            rng.randint(60, 1800),
+            rng.randint(1800, 4 * 3600),
+            rng.randint(4 * 3600, 30 * 3600),
+        ])
+        plate_due = None
+        if rng.random() < 0.15:
+            plate_due = (now + timedelta(hours=rng.uniform(0, 48))).isoformat()
+        plates[f"plate-{index}"] = Plate(
+            id=f"plate-{index}",
+            project_id=rng.choice(list(projects)),
+            source_filename=f"f{index}.3mf",
+            plate_number=index + 1,
+            name=f"Plate {index}",
+            gcode_path=f"g{index}",
+            estimated_duration_seconds=seconds,
+            priority=rng.choice([-5, 0, 0, 3, 10]),
+            due_date=plate_due,
+        )
+
+    jobs = [
+        Job(
+            id=f"job-{index}",
+            plate_id=rng.choice(list(plates)),
+            status="queued",
+            created_at=now.isoformat(),
+        )
+        for index in range(rng.randint(0, 25))
+    ]
+
+    windows = []
+    cursor = now - timedelta(hours=rng.uniform(0, 12))
+    for index in range(rng.randint(0, 12)):
+        start = cursor + timedelta(minutes=rng.uniform(0, 16 * 60))
+        end = start + timedelta(minutes=rng.choice([
+            rng.uniform(5, 60), rng.uniform(60, 180), rng.uniform(180, 14 * 60),
+        ]))
+        windows.append(UnavailabilityWindow(id=f"w{index}", start=start.isoformat(), end=end.isoformat()))
+        cursor = start if rng.random() < 0.2 else end  # occasionally overlap windows
+
+    active_job_end = None
+    if rng.random() < 0.3:
+        active_job_end = now + timedelta(minutes=rng.uniform(1, 600))
+
+    return ScheduleInputs(
+        queued_jobs=jobs,
+        plates_by_id=plates,
+        unavailability_windows=windows,
+        current_time=now,
+        active_job_end=active_job_end,
+        projects_by_id=projects,
+    )
+
+
+def reference_scheduler(inputs: ScheduleInputs) -> PrintScheduler:
+    return PrintScheduler(
+        queued_jobs=inputs.queued_jobs,
+        plates_by_id=inputs.plates_by_id,
+        unavailability_windows=inputs.unavailability_windows,
+        current_time=inputs.current_time,
+        active_job_end=inputs.active_job_end,
+        projects_by_id=inputs.projects_by_id,
+        mode=SCHEDULE_MODE_PRIORITY,
+    )
+
+
+def portfolio_engine(inputs: ScheduleInputs) -> ScheduleResult:
+    """In-process equivalent of SchedulePortfolio.async_run."""
+    outcomes = [evaluate_heuristic(inputs, mode) for mode in SCHEDULE_HEURISTICS]
+    return min(outcomes, key=lambda o: o[0])[1]
+
+
+def priority_engine(inputs: ScheduleInputs) -> ScheduleResult:
+    return evaluate_heuristic(inputs, SCHEDULE_MODE_PRIORITY)[1]
+
+
+def worker_priority_engine(inputs: ScheduleInputs) -> ScheduleResult:
+    """The priority heuristic through the worker's plain-data round trip."""
+    evaluate = _worker_module().evaluate
+    _, result = evaluate(inputs.to_worker_kwargs(), SCHEDULE_MODE_PRIORITY)
+    return ScheduleResult.from_dict(result)
+
+
+def inverted_priority_engine(inputs: ScheduleInputs) -> ScheduleResult:
+    """Negative control: the reference greedy fed negated plate priorities."""
+    plates = {k: replace(p, priority=-p.priority) for k, p in inputs.plates_by_id.items()}
+    return reference_scheduler(replace(inputs, plates_by_id=plates)).calculate_schedule()
+
+
+ENGINES: dict[str, Callable[[ScheduleInputs], ScheduleResult]] = {
+    "portfolio": portfolio_engine,
+}
+
+EQUIVALENT_ENGINES: dict[str, Callable[[ScheduleInputs], ScheduleResult]] = {
+    "priority": priority_engine,
+    "worker_priority": worker_priority_engine,
+}
+
+
+def placements(result: ScheduleResult) -> list[tuple]:
+    return [
+        (sj.job_id, sj.plate_id, sj.scheduled_start, sj.scheduled_end, sj.spans_unavailability)
+        for sj in result.jobs
+    ]
+
+
+def scores_no_worse(inputs: ScheduleInputs, engine: Callable[[ScheduleInputs], ScheduleResult]) -> bool:
+    reference = reference_scheduler(inputs)
+    expected = reference.calculate_schedule()
+    return reference.score_schedule(engine(inputs)) <= reference.score_schedule(expected)
+
+
+def assert_valid_schedule(inputs: ScheduleInputs, result: ScheduleResult) -> None:
+    now = inputs.current_time
+    windows = []
+    for w in inputs.unavailability_windows:
+        start = datetime.fromisoformat(w.start)
+        end = datetime.fromisoformat(w.end)
+        if end > now:
+            windows.append((max(start, now), end))
+
+    queued = {j.id: j for j in inputs.queued_jobs}
+    seen = set()
+    cursor = max(now, inputs.active_job_end or now)
+    horizon = now + timedelta(days=SCHEDULE_HORIZON_DAYS)
+    for sj in result.jobs:
+        assert sj.job_id in queued, f"unknown job {sj.job_id}"
+        assert sj.job_id not in seen, f"job {sj.job_id} scheduled twice"
+        seen.add(sj.job_id)
+
+        plate = inputs.plates_by_id[queued[sj.job_id].plate_id]
+        assert sj.plate_id == plate.id
+        assert sj.estimated_duration_seconds == plate.estimated_duration_seconds
+        assert sj.scheduled_end - sj.scheduled_start == timedelta(seconds=plate.estimated_duration_seconds)
+
+        assert sj.scheduled_start >= cursor, f"{sj.job_id} overlaps the previous job"
+        if sj.scheduled_start >= horizon:
+            # Past the horizon only the tail after the last window is drained.
+            assert all(e <= sj.scheduled_start for _, e in windows)
+        assert not any(s <= sj.scheduled_start < e for s, e in windows), (
+            f"{sj.job_id} starts while the operator is unavailable"
+        )
+        overlaps = any(s < sj.scheduled_end and sj.scheduled_start < e for s, e in windows)
+        assert sj.spans_unavailability == overlaps, f"{sj.job_id} spans flag is wrong"
+        cursor = sj.scheduled_end
+
+    if not windows:
+        assert seen == set(queued), "every job fits when there are no windows"
+
+
+@pytest.mark.parametrize("seed", range(CASES), ids=lambda s: f"seed-{s}")
+def test_reference_schedule_is_valid(seed):
+    inputs = gen_inputs(seed)
+    result = reference_scheduler(inputs).calculate_schedule()
+    assert_valid_schedule(inputs, result)
+
+
+@pytest.mark.parametrize("mode", SCHEDULE_HEURISTICS)
+@pytest.mark.parametrize("seed", range(0, CASES, 4), ids=lambda s: f"seed-{s}")
+def test_heuristic_schedule_is_valid(seed, mode):
+    inputs = gen_inputs(seed)
+    _, result = evaluate_heuristic(inputs, mode)
+    assert_valid_schedule(inputs, result)
+
+
+@pytest.mark.parametrize("engine", list(ENGINES))
+@pytest.mark.parametrize("seed", range(CASES), ids=lambda s: f"seed-{s}")
+def test_engine_matches_or_beats_reference(seed, engine):
+    inputs = gen_inputs(seed)
+    assert_valid_schedule(inputs, ENGINES[engine](inputs))
+    assert scores_no_worse(inputs, ENGINES[engine])
+
+
+@pytest.mark.parametrize("engine", list(EQUIVALENT_ENGINES))
+@pytest.mark.parametrize("seed", range(CASES), ids=lambda s: f"seed-{s}")
+def test_engine_reproduces_reference(seed, engine):
+    inputs = gen_inputs(seed)
+    expected = reference_scheduler(inputs).calculate_schedule()
+
+    result = EQUIVALENT_ENGINES[engine](inputs)
+
+    assert placements(result) == placements(expected)
+    assert result.lateness_by_project == expected.lateness_by_project
+    assert result.next_breakpoint == expected.next_breakpoint
+
+
+def test_comparison_rejects_worse_engine():
+    rejected = [
+        seed for seed in range(CASES)
+        if not scores_no_worse(gen_inputs(seed), inverted_priority_engine)
+    ]
+    assert rejected, "score comparison accepted an engine that ignores priorities"
+
+
+def test_placement_check_rejects_other_heuristic():
+    differs = [
+        seed for seed in range(CASES)
+        if placements(inverted_priority_engine(gen_inputs(seed)))
+        != placements(reference_scheduler(gen_inputs(seed)).calculate_schedule())
+    ]
+    assert differs
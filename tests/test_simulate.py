@@ -0,0 +1,33 @@
+"""Smoke tests for the print farm simulator."""
+
+import sys
+sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
+
+from benchmarks.simulate import NullStore, SimulationStore, WorkloadConfig, run
+from custom_components.printassist.const import SCHEDULE_MODE_PRIORITY, SCHEDULE_MODE_PORTFOLIO
+
+
+class TestSimulation:
+    def test_policies_share_workload(self):
+        config = WorkloadConfig(days=5, projects_per_day=2.0)
+        reports = run([SCHEDULE_MODE_PRIORITY, SCHEDULE_MODE_PORTFOLIO], config, seed=3)
+
+        assert [r.policy for r in reports] == [SCHEDULE_MODE_PRIORITY, SCHEDULE_MODE_PORTFOLIO]
+        for report in reports:
+            assert report.completed_jobs > 0
+            assert report.scheduler_calls > 0
+            assert report.latency_to_start_p90_hours >= report.latency_to_start_p50_hours
+            assert 0 <= report.idle_hours_available <= report.idle_hours_with_work
+
+    def test_deterministic_for_seed(self):
+        config = WorkloadConfig(days=3)
+        first = run([SCHEDULE_MODE_PRIORITY], config, seed=7)[0]
+        second = run([SCHEDULE_MODE_PRIORITY], config, seed=7)[0]
+        assert first.completed_jobs == second.completed_jobs
+        assert first.idle_hours_with_work == second.idle_hours_with_work
+        assert first.idle_hours_available == second.idle_hours_available
+
+    def test_store_uses_real_constructor(self):
+        store = SimulationStore()
+        assert isinstance(store._store, NullStore)
+        assert store.revision == 0
@@ -0,0 +1,43 @@
+"""Tests for PrintAssist stage timings."""
+
+import pytest
+
+import sys
+sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
+
+from custom_components.printassist.timing import TIMING_WINDOW, StageTimings
+
+
+class TestStageTimings:
+    def test_summary_percentiles(self):
+        timings = StageTimings()
+        for ms in range(1, 101):
+            timings.record("update", ms / 1000)
+
+        summary = timings.summary()["update"]
+        assert summary["count"] == 100
+        assert summary["p50_ms"] == 51
+        assert summary["p95_ms"] == 96
+        assert summary["max_ms"] == 100
+        assert summary["last_ms"] == 100
+
+    def test_window_is_bounded(self):
+        timings = StageTimings()
+        timings.record("save", 5.0)
+        for _ in range(TIMING_WINDOW):
+            timings.record("save", 0.001)
+
+        summary = timings.summary()["save"]
+        assert summary["count"] == TIMING_WINDOW + 1
+        assert summary["p95_ms"] == 1
+        assert summary["max_ms"] == 5000
+
+    def test_measure_records_on_error(self):
+        timings = StageTimings()
+        with pytest.raises(ValueError):
+            with timings.measure("scheduler"):
+                raise ValueError
+
+        assert timings.summary()["scheduler"]["count"] == 1
+        assert timings.last("scheduler") >= 0
+        assert timings.last("missing") is None
@@ -0,0 +1,220 @@
+"""Tests for resumable upload sessions."""
+
+import asyncio
+import hashlib
+from unittest.mock import patch
+
+import pytest
+
+import sys
+sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
+
+from custom_components.printassist.file_handler import UploadTooLarge
+from custom_components.printassist.uploads import (
+    OffsetMismatch,
+    UnknownSession,
+    UploadSessionError,
+    UploadSessionManager,
+)
+
+
+async def chunks_of(data, size):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def interrupted(data, fail_after):
+    yield data[:fail_after]
+    raise ConnectionResetError
+
+
+@pytest.fixture
+def sessions(mock_hass, tmp_path):
+    return UploadSessionManager(mock_hass, tmp_path, max_size=1000)
+
+
+@pytest.mark.asyncio
+async def test_chunked_upload_and_finalize(sessions):
+    data = bytes(range(200)) * 3
+    session = await sessions.async_create("part.3mf", len(data))
+
+    offset = 0
+    for start in range(0, len(data), 250):
+        offset = await sessions.async_append(
+            session.id, offset, chunks_of(data[start:start + 250], 100)
+        )
+    assert offset == len(data)
+
+    staged = await sessions.async_finalize(session.id, hashlib.sha256(data).hexdigest())
+    assert staged.filename == "part.3mf"
+    assert staged.size == len(data)
+    assert staged.path.read_bytes() == data
+    with pytest.raises(UnknownSession):
+        sessions.get(session.id)
+
+
+@pytest.mark.asyncio
+async def test_resume_after_interrupted_chunk(sessions):
+    data = b"0123456789" * 10
+    session = await sessions.async_create("part.gcode")
+
+    with pytest.raises(ConnectionResetError):
+        await sessions.async_append(session.id, 0, interrupted(data, 30))
+    assert sessions.get(session.id).offset == 30
+
+    with pytest.raises(OffsetMismatch) as err:
+        await sessions.async_append(session.id, 0, chunks_of(data, 10))
+    assert err.value.expected == 30
+
+    await sessions.async_append(session.id, 30, chunks_of(data[30:], 10))
+    staged = await sessions.async_finalize(session.id)
+    assert staged.path.read_bytes() == data
+    assert staged.sha256 == hashlib.sha256(data).hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_finalize_checks_size_and_checksum(sessions):
+    session = await sessions.async_create("part.3mf", 10)
+    await sessions.async_append(session.id, 0, chunks_of(b"12345", 5))
+    with pytest.raises(UploadSessionError):
+        await sessions.async_finalize(session.id)
+
+    await sessions.async_append(session.id, 5, chunks_of(b"67890", 5))
+    with pytest.raises(UploadSessionError):
+        await sessions.async_finalize(session.id, "0" * 64)
+    assert (await sessions.async_finalize(session.id)).size == 10
+
+
+@pytest.mark.asyncio
+async def test_requests_queued_behind_finalize(sessions):
+    session = await sessions.async_create("part.gcode")
+    await sessions.async_append(session.id, 0, chunks_of(b"12345", 5))
+
+    async with session.lock:
+        finalize = asyncio.create_task(sessions.async_finalize(session.id))
+        append = asyncio.create_task(sessions.async_append(session.id, 5, chunks_of(b"678", 3)))
+        abort = asyncio.create_task(sessions.async_abort(session.id))
+        await asyncio.sleep(0)
+
+    staged = await finalize
+    with pytest.raises(UnknownSession):
+        await append
+    await abort
+    # The handed-off file is neither extended nor deleted.
+    assert staged.path.read_bytes() == b"12345"
+
+
+@pytest.mark.asyncio
+async def test_size_limits(sessions):
+    with pytest.raises(UploadTooLarge):
+        await sessions.async_create("big.3mf", 5000)
+
+    session = await sessions.async_create("part.3mf", 10)
+    with pytest.raises(UploadTooLarge):
+        await sessions.async_append(session.id, 0, chunks_of(b"x" * 20, 5))
+    assert sessions.get(session.id).offset == 10
+
+
+@pytest.mark.asyncio
+async def test_idle_sessions_expire(sessions, tmp_path):
+    session = await sessions.async_create("part.3mf")
+    assert session.path.exists()
+
+    with patch("custom_components.printassist.uploads.time.monotonic",
+               return_value=session.last_activity + 2 * 3600):
+        await sessions.async_expire()
+
+    assert not session.path.exists()
+    with pytest.raises(UnknownSession):
+        sessions.get(session.id)
+
+
+class FakeField:
+    def __init__(self, name, data, filename=None):
+        self.name = name
+        self.filename = filename
+        self._data = data
+
+    async def read(self):
+        return self._data
+
+    async def read_chunk(self, size):
+        chunk, self._data = self._data[:size], self._data[size:]
+        return chunk
+
+
+class FakeReader:
+    def __init__(self, fields):
+        self._fields = iter(fields)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._fields)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+
+@pytest.mark.asyncio
+async def test_bulk_upload_saves_once_and_reports_per_file(mock_hass, tmp_path):
+    import io
+    import json
+    import zipfile
+    from unittest.mock import AsyncMock, MagicMock
+
+    from custom_components.printassist import PrintAssistBulkUploadView
+    from custom_components.printassist.const import DOMAIN
+    from custom_components.printassist.file_handler import FileHandler
+
+    mock_hass.config.path = MagicMock(side_effect=lambda *args: str(tmp_path.joinpath(*args)))
+    file_handler = FileHandler(mock_hass)
+    file_handler._parse_cache_store = MagicMock()
+    store = MagicMock()
+    store.async_add_plates = AsyncMock()
+    coordinator = MagicMock()
+    coordinator.async_request_schedule_refresh = AsyncMock()
+    mock_hass.data = {DOMAIN: {
+        "store": store, "file_handler": file_handler, "coordinator": coordinator,
+    }}
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("Metadata/plate_1.gcode", b"; TIME:60\n")
+        zf.writestr("Metadata/plate_2.gcode", b"; TIME:120\n")
+
+    request = MagicMock()
+    request.app = {"hass": mock_hass}
+    request.multipart = AsyncMock(return_value=FakeReader([
+        FakeField("project_id", b"proj-1"),
+        FakeField("file", buffer.getvalue(), "a.3mf"),
+        FakeField("file", b"; TIME:30\n", "b.gcode"),
+        FakeField("file", b"not a model", "c.stl"),
+    ]))
+
+    response = await PrintAssistBulkUploadView().post(request)
+    body = json.loads(response.body)
+
+    assert response.status == 200
+    assert [len(f["plates"]) for f in body["files"]] == [2, 1, 0]
+    assert body["files"][2]["error"] == "No plates found in file"
+    store.async_add_plates.assert_awaited_once()
+    assert len(store.async_add_plates.call_args.args[0]) == 3
+    coordinator.async_request_schedule_refresh.assert_awaited_once_with(wait=True)
+    assert list((tmp_path / ".storage" / "printassist" / "incoming").iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_session_view_before_setup(mock_hass):
+    from unittest.mock import MagicMock
+
+    from custom_components.printassist import PrintAssistUploadSessionView
+
+    mock_hass.data = {}
+    request = MagicMock()
+    request.app = {"hass": mock_hass}
+    view = PrintAssistUploadSessionView()
+    for method in (view.get, view.put, view.post, view.delete):
+        response = await method(request, "abc")
+        assert response.status == 500
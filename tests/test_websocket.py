@@ -0,0 +1,139 @@
+"""Tests for the PrintAssist websocket commands."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import sys
+sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
+
+from custom_components.printassist import ws_get_data, ws_query, ws_subscribe
+from custom_components.printassist.const import DOMAIN, SIGNAL_UNLOAD
+from custom_components.printassist.coordinator import DataPayload
+
+
+def make_payload(revision, epoch="boot"):
+    data = {"epoch": epoch, "revision": revision, "projects": []}
+    return DataPayload(epoch, revision, data, json.dumps(data).encode())
+
+
+def test_subscribe_sends_snapshot_then_deltas(mock_hass):
+    coordinator = MagicMock()
+    coordinator.get_payload.return_value = make_payload(1)
+    listeners = []
+    unsub = MagicMock()
+    coordinator.async_add_listener.side_effect = lambda cb: listeners.append(cb) or unsub
+    mock_hass.data = {DOMAIN: {"coordinator": coordinator}}
+    connection = MagicMock()
+    connection.subscriptions = {}
+
+    ws_subscribe(mock_hass, connection, {"id": 5, "type": "printassist/subscribe"})
+
+    assert 5 in connection.subscriptions
+    connection.send_result.assert_called_once_with(5)
+    snapshot = json.loads(connection.send_message.call_args.args[0])
+    assert snapshot == {
+        "id": 5, "type": "event",
+        "event": {"type": "snapshot", "data": {"epoch": "boot", "revision": 1, "projects": []}},
+    }
+
+    connection.send_message.reset_mock()
+    listeners[0]()
+    connection.send_message.assert_not_called()
+
+    coordinator.get_payload.return_value = make_payload(2)
+    coordinator.get_delta_json.return_value = b'{"base_revision":1,"revision":2}'
+    listeners[0]()
+    coordinator.get_delta_json.assert_called_once_with(1, "boot")
+    event = json.loads(connection.send_message.call_args.args[0])["event"]
+    assert event == {"type": "delta", "delta": {"base_revision": 1, "revision": 2}}
+
+    coordinator.get_payload.return_value = make_payload(9)
+    coordinator.get_delta_json.return_value = None
+    listeners[0]()
+    coordinator.get_delta_json.assert_called_with(2, "boot")
+    event = json.loads(connection.send_message.call_args.args[0])["event"]
+    assert event["type"] == "snapshot"
+    assert event["data"]["revision"] == 9
+
+    connection.subscriptions.pop(5)()
+    unsub.assert_called_once()
+
+
+def test_query_returns_page_with_revision(mock_hass):
+    coordinator = MagicMock()
+    data = {"revision": 4, "jobs": [
+        {"id": "j1", "plate_id": "a", "status": "queued"},
+        {"id": "j2", "plate_id": "a", "status": "completed"},
+    ]}
+    coordinator.get_payload.return_value = DataPayload("boot", 4, data, b"")
+    mock_hass.data = {DOMAIN: {"coordinator": coordinator}}
+    connection = MagicMock()
+
+    ws_query(mock_hass, connection, {"id": 7, "collection": "jobs", "status": ["queued"], "limit": 10})
+    connection.send_result.assert_called_once_with(
+        7, {"revision": 4, "items": [data["jobs"][0]], "next_cursor": None, "total": 1}
+    )
+
+    ws_query(mock_hass, connection, {"id": 8, "collection": "jobs", "cursor": "zz", "limit": 10})
+    assert connection.send_error.call_args.args[:2] == (8, "invalid_cursor")
+
+
+def test_get_data_since_revision(mock_hass):
+    coordinator = MagicMock()
+    coordinator.get_payload.return_value = make_payload(3)
+    coordinator.get_delta_json.side_effect = (
+        lambda since, epoch: b'{"base_revision":2,"revision":3}' if since == 2 else None
+    )
+    mock_hass.data = {DOMAIN: {"coordinator": coordinator}}
+    connection = MagicMock()
+
+    def result(**kwargs):
+        ws_get_data(mock_hass, connection, {"id": 1, **kwargs})
+        return json.loads(connection.send_message.call_args.args[0])["result"]
+
+    full = {"epoch": "boot", "revision": 3, "projects": []}
+    assert result() == full
+    assert result(since_revision=3, since_epoch="boot") == {"revision": 3, "unchanged": True}
+    assert result(since_revision=2, since_epoch="boot") == {
+        "revision": 3, "delta": {"base_revision": 2, "revision": 3},
+    }
+    assert result(since_revision=1, since_epoch="boot") == full
+    # Without an epoch the revision cannot be trusted.
+    assert result(since_revision=3) == full
+
+
+
+def test_subscription_ends_on_unload(mock_hass):
+    coordinator = MagicMock()
+    coordinator.get_payload.return_value = make_payload(1)
+    unsub_listener = MagicMock()
+    coordinator.async_add_listener.return_value = unsub_listener
+    mock_hass.data = {DOMAIN: {"coordinator": coordinator}}
+    connection = MagicMock()
+    connection.subscriptions = {}
+    unsub_unload = MagicMock()
+
+    with patch(
+        "custom_components.printassist.async_dispatcher_connect", return_value=unsub_unload
+    ) as connect:
+        ws_subscribe(mock_hass, connection, {"id": 5, "type": "printassist/subscribe"})
+    assert connect.call_args.args[1] == SIGNAL_UNLOAD
+    end = connect.call_args.args[2]
+
+    end()
+    assert 5 not in connection.subscriptions
+    unsub_listener.assert_called_once()
+    unsub_unload.assert_called_once()
+    event = json.loads(connection.send_message.call_args.args[0])
+    assert event == {"id": 5, "type": "event", "event": {"type": "end"}}
+
+    # A later unsubscribe or repeated signal is a no-op.
+    end()
+    unsub_listener.assert_called_once()
+
+
+def test_subscribe_before_setup(mock_hass):
+    mock_hass.data = {}
+    connection = MagicMock()
+    ws_subscribe(mock_hass, connection, {"id": 5, "type": "printassist/subscribe"})
+    assert connection.send_error.call_args.args[:2] == (5, "not_found")